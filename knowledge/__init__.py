@@ -0,0 +1,65 @@
+"""Compiled knowledge base over the scraped e& portal data.
+
+Build it from the JSON files under ``scrapping/`` with::
+
+    python -m knowledge build
+"""
+
+from .bm25 import BM25Index
+from .boilerplate import BoilerplateFilter, remove_boilerplate
+from .chunker import Chunk, iter_chunks
+from .dedupe import deduplicate, iter_deduplicate
+from .dense import DenseIndex
+from .embcache import CachedEmbedder, EmbeddingCache
+from .embeddings import HashingEmbedder, load_embedder
+from .hybrid import HybridRetriever, PairReranker, reciprocal_rank_fusion
+from .quantize import ProductQuantizer, ScalarQuantizer
+from .packed import MappedBM25Index, pack_bm25
+from .query import PlanIndex
+from .segments import SegmentedIndex
+from .snapshot import SnapshotManager, publish
+from .sources import SOURCES, Plan, Price, Service, Text, ZoneCountry, ZonePrice, clean_text, load_source
+from .store import DEFAULT_DB, KnowledgeBase, build
+from .text import normalize_arabic, tokenize
+from .zones import ZoneIndex
+
+__all__ = [
+    "BM25Index",
+    "BoilerplateFilter",
+    "remove_boilerplate",
+    "Chunk",
+    "iter_chunks",
+    "deduplicate",
+    "iter_deduplicate",
+    "DenseIndex",
+    "CachedEmbedder",
+    "EmbeddingCache",
+    "HashingEmbedder",
+    "load_embedder",
+    "HybridRetriever",
+    "PairReranker",
+    "reciprocal_rank_fusion",
+    "ProductQuantizer",
+    "ScalarQuantizer",
+    "MappedBM25Index",
+    "pack_bm25",
+    "PlanIndex",
+    "SegmentedIndex",
+    "SnapshotManager",
+    "publish",
+    "SOURCES",
+    "Plan",
+    "Price",
+    "Service",
+    "Text",
+    "ZoneCountry",
+    "ZonePrice",
+    "clean_text",
+    "load_source",
+    "DEFAULT_DB",
+    "KnowledgeBase",
+    "build",
+    "normalize_arabic",
+    "tokenize",
+    "ZoneIndex",
+]
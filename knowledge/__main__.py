@@ -0,0 +1,316 @@
+"""Command line entry point: ``python -m knowledge <command>``."""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+from .bm25 import build_from_chunks, build_from_knowledge_base
+from .boilerplate import print_report, remove_boilerplate
+from .chunker import MAX_TOKENS, chunk_source, iter_chunks
+from .dedupe import THRESHOLD, iter_deduplicate
+from .dedupe import print_report as print_dedupe_report
+from .dense import DEFAULT_VECTORS_DIR, DenseIndex
+from .embcache import CachedEmbedder
+from .embeddings import load_embedder
+from .hybrid import FUSION_WEIGHT, CrossEncoderReranker, HybridRetriever, PairReranker
+from .query import PlanIndex
+from .segments import DEFAULT_SEGMENTS_DIR, SegmentedIndex
+from .snapshot import DEFAULT_SNAPSHOTS_DIR, current_version, publish, set_current, versions
+from .sources import SCRAPPING_DIR, clean_text
+from .store import DEFAULT_DB, KnowledgeBase, build
+from .units import parse_data_mb
+from .zones import ZoneIndex
+
+
+def _data_mb(text):
+    """Command line data size: "20GB", "500MB" or a bare number of GB."""
+    if text is None:
+        return None
+    mb = parse_data_mb(text)
+    return mb if mb is not None else float(text) * 1024
+
+
+def _print_table(columns, rows) -> None:
+    print("  ".join(f"{c:<14}" for c in columns))
+    for row in rows:
+        print("  ".join(f"{'' if row.get(c) is None else row.get(c)!s:<14.14}" for c in columns))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build and inspect the e& knowledge base")
+    parser.add_argument("--db", default=DEFAULT_DB, help="knowledge base file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="compile every scraped JSON file into the knowledge base")
+    commands.add_parser("stats", help="show what the knowledge base holds")
+
+    query = commands.add_parser("query", help="filter and rank plans")
+    query.add_argument("--family", default=None, help="plan family, Arabic or English (e.g. Hekaya)")
+    query.add_argument("--min-price", type=float, default=None)
+    query.add_argument("--max-price", type=float, default=None)
+    query.add_argument("--min-data", default=None, help="e.g. 20GB or 500MB")
+    query.add_argument("--max-data", default=None)
+    query.add_argument("--min-minutes", type=float, default=None)
+    query.add_argument("--validity-days", type=int, default=None, help="e.g. 30 for monthly plans")
+    query.add_argument("--sort", default="price_egp", help="column to rank by (e.g. price_per_gb)")
+    query.add_argument("--desc", action="store_true", help="highest first")
+    query.add_argument("--limit", type=int, default=10)
+
+    compare = commands.add_parser("compare", help="compare plans or plan families side by side")
+    compare.add_argument("names", nargs="+", help="plan or family names (e.g. Hekaya Emerald)")
+
+    boilerplate = commands.add_parser("boilerplate", help="report the menus/footers removed from page dumps")
+    boilerplate.add_argument("file", nargs="?", default="FayrouzMohamed/etisalat_scraped_data.json",
+                             help="page dump relative to scrapping/")
+    boilerplate.add_argument("--pages", type=int, default=10, help="pages to list")
+
+    chunks = commands.add_parser("chunks", help="stream every scraped file through the chunker")
+    chunks.add_argument("sources", nargs="*", help="files relative to scrapping/ (default: all)")
+    chunks.add_argument("--max-tokens", type=int, default=MAX_TOKENS)
+    chunks.add_argument("--show", type=int, default=0, help="print the first N chunks")
+
+    dedupe = commands.add_parser("dedupe", help="cluster near-duplicate chunks with MinHash/LSH")
+    dedupe.add_argument("--threshold", type=float, default=THRESHOLD, help="estimated Jaccard similarity")
+    dedupe.add_argument("--clusters", type=int, default=10, help="clusters to list")
+
+    search = commands.add_parser("search", help="full-text BM25 search over all scraped text")
+    search.add_argument("query")
+    search.add_argument("-k", type=int, default=5, help="number of results")
+    search.add_argument("--chunks", action="store_true", help="search chunks instead of knowledge base texts")
+
+    embed = commands.add_parser("embed", help="embed the deduplicated chunks into a memory-mapped dense index")
+    embed.add_argument("--model", default="hash", help='"hash" or a sentence-transformers model name')
+    embed.add_argument("--dtype", default="float32", choices=["float32", "float16"])
+    embed.add_argument("--out", default=DEFAULT_VECTORS_DIR, help="index directory")
+    embed.add_argument("--no-cache", action="store_true", help="re-embed every chunk instead of reusing knowledge/embcache/")
+
+    dense = commands.add_parser("dense", help="dense (embedding) search; several queries are scored in one batch")
+    dense.add_argument("queries", nargs="+")
+    dense.add_argument("-k", type=int, default=5, help="results per query")
+    dense.add_argument("--index", default=DEFAULT_VECTORS_DIR, help="index directory")
+    dense.add_argument("--rerank", type=int, default=0, help="rescore this many quantized candidates exactly")
+
+    quantize = commands.add_parser("quantize", help="compress the dense index to int8 or product-quantized codes")
+    quantize.add_argument("--kind", default="int8", choices=["int8", "pq"])
+    quantize.add_argument("--m", type=int, default=0, help="PQ sub-spaces (default dim/4, 16x smaller)")
+    quantize.add_argument("--drop-float", action="store_true", help="delete the float rows (no exact rerank)")
+    quantize.add_argument("--index", default=DEFAULT_VECTORS_DIR, help="index directory")
+
+    hybrid = commands.add_parser("hybrid", help="BM25 + dense candidates, rank fusion and a budgeted rerank")
+    hybrid.add_argument("query")
+    hybrid.add_argument("-k", type=int, default=5)
+    hybrid.add_argument("--index", default=DEFAULT_VECTORS_DIR, help="index directory")
+    hybrid.add_argument("--no-rerank", action="store_true", help="stop after rank fusion")
+    hybrid.add_argument("--cross-encoder", help="sentence-transformers cross-encoder to rerank with")
+    hybrid.add_argument("--fusion-weight", type=float, default=FUSION_WEIGHT,
+                        help="weight of the fused position next to the 0-1 reranker score")
+
+    segments = commands.add_parser("segments", help="incremental segment index: build, update changed files, search")
+    segments.add_argument("action", choices=["build", "update", "search", "info"])
+    segments.add_argument("args", nargs="*", help="files relative to scrapping/ (update) or the query (search)")
+    segments.add_argument("-k", type=int, default=5)
+    segments.add_argument("--dir", default=DEFAULT_SEGMENTS_DIR, help="segments directory")
+
+    snapshot = commands.add_parser("snapshot", help="publish, list or roll back versioned knowledge snapshots")
+    snapshot.add_argument("action", choices=["publish", "list", "rollback"])
+    snapshot.add_argument("version", nargs="?", help="version to roll back to (default: the previous one)")
+    snapshot.add_argument("--dir", default=DEFAULT_SNAPSHOTS_DIR, help="snapshots directory")
+
+    call = commands.add_parser("call", help="international call price for a country")
+    call.add_argument("country", help="country name in Arabic, English or Franco (e.g. Germany, ألمانيا)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        counts = build(args.db)
+        for table, count in counts.items():
+            print(f"{table:<16} {count:>6}")
+        print(f"built {args.db} in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    if args.command == "query":
+        ranges = {}
+        if args.min_price is not None or args.max_price is not None:
+            ranges["price_egp"] = (args.min_price, args.max_price)
+        if args.min_data is not None or args.max_data is not None:
+            ranges["data_mb"] = (_data_mb(args.min_data), _data_mb(args.max_data))
+        if args.min_minutes is not None:
+            ranges["minutes_count"] = (args.min_minutes, None)
+        if args.validity_days is not None:
+            ranges["validity_days"] = (args.validity_days, args.validity_days)
+        plans = PlanIndex.load(args.db).top_k(args.sort, args.limit, descending=args.desc,
+                                              family=args.family, **ranges)
+        _print_table(["name", "family", "price_egp", "data_mb", "validity_days", "price_per_gb"], plans)
+        return 0 if plans else 1
+
+    if args.command == "compare":
+        table = PlanIndex.load(args.db).compare(args.names)
+        _print_table(table["columns"], table["rows"])
+        for name in table["missing"]:
+            print(f"❌ no plan or family named {name!r}")
+        return 0 if not table["missing"] else 1
+
+    if args.command == "boilerplate":
+        with open(os.path.join(SCRAPPING_DIR, args.file), "r", encoding="utf-8") as f:
+            _, report = remove_boilerplate(json.load(f))
+        print_report(report, args.pages)
+        return 0
+
+    if args.command == "chunks":
+        count = tokens = largest = 0
+        per_source = {}
+        for chunk in iter_chunks(args.sources or None, args.max_tokens):
+            if count < args.show:
+                print(f"--- {chunk.source} {chunk.url} [{chunk.section}] ({chunk.tokens} tokens)")
+                print(chunk.text)
+            count += 1
+            tokens += chunk.tokens
+            largest = max(largest, chunk.tokens)
+            per_source[chunk.source] = per_source.get(chunk.source, 0) + 1
+        for source, n in sorted(per_source.items(), key=lambda item: -item[1]):
+            print(f"{n:>6}  {source}")
+        print(f"{count} chunks, {tokens:,} tokens (avg {tokens / max(count, 1):.0f}, max {largest})")
+        return 0 if count else 1
+
+    if args.command == "dedupe":
+        report = {}
+        for _ in iter_deduplicate(iter_chunks(), args.threshold, report=report):
+            pass
+        print_dedupe_report(report, args.clusters)
+        return 0
+
+    if args.command == "search":
+        if args.chunks:
+            index = build_from_chunks(iter_deduplicate(iter_chunks()))
+        else:
+            index = build_from_knowledge_base(KnowledgeBase(args.db))
+        results = index.search(args.query, args.k)
+        for r in results:
+            where = f"{r['url']} [{r['section']}]" if args.chunks else r["path"]
+            print(f"{r['score']:>7.3f}  {r['source']} {where}")
+            print(f"         {clean_text(r['text'])[:160]}")
+        return 0 if results else 1
+
+    if args.command == "embed":
+        start = time.perf_counter()
+        embedder = load_embedder(args.model)
+        if not args.no_cache:
+            embedder = CachedEmbedder(embedder)
+        index = DenseIndex.build(iter_deduplicate(iter_chunks()), embedder, args.out, args.dtype)
+        print(f"embedded {len(index)} chunks with {index.info['model_id']} "
+              f"({index.info['dim']}d {args.dtype}) into {args.out} in {time.perf_counter() - start:.2f}s")
+        if not args.no_cache:
+            print(f"   cache: {embedder.cache.hits} hits, {embedder.cache.misses} embedded, "
+                  f"{len(embedder.cache)} rows in {embedder.cache.path}")
+        return 0
+
+    if args.command == "dense":
+        index = DenseIndex.open(args.index)
+        start = time.perf_counter()
+        batches = index.search_batch(args.queries, args.k, args.rerank)
+        elapsed = (time.perf_counter() - start) * 1000
+        for query, results in zip(args.queries, batches):
+            print(f"🔎 {query}")
+            for r in results:
+                print(f"{r['score']:>7.3f}  {r['source']} {r['url']} [{r['section']}]")
+                print(f"         {clean_text(r['text'])[:160]}")
+        print(f"{len(args.queries)} queries over {len(index)} chunks in {elapsed:.1f} ms")
+        return 0
+
+    if args.command == "quantize":
+        index = DenseIndex.open(args.index)
+        options = {"m": args.m} if args.kind == "pq" else {}
+        start = time.perf_counter()
+        index = index.quantize(args.kind, **options)
+        sizes = index.size_bytes()
+        print(f"{args.kind}: {sizes['vectors.bin']:,} -> {sizes['codes.bin']:,} bytes "
+              f"({sizes['vectors.bin'] / sizes['codes.bin']:.1f}x smaller) in {time.perf_counter() - start:.2f}s")
+        # Recall against the exact float search, using a sample of the indexed chunks as queries
+        sample = [index.doc(row)["text"] for row in range(0, len(index), max(1, len(index) // 100))]
+        queries = index.embedder.embed(sample)
+        for rerank in (0, 50):
+            label = f"rerank {rerank}" if rerank else "codes only"
+            print(f"   recall@10 ({label}): {index.recall(queries, 10, rerank):.3f}")
+        if args.drop_float:
+            index.quantize(args.kind, keep_float=False, **options)
+            print("   float rows deleted")
+        return 0
+
+    if args.command == "hybrid":
+        reranker = CrossEncoderReranker(args.cross_encoder) if args.cross_encoder else PairReranker()
+        reranker.fusion_weight = args.fusion_weight
+        retriever = HybridRetriever.from_dense(DenseIndex.open(args.index), reranker=reranker)
+        result = retriever.search(args.query, args.k, rerank=not args.no_rerank)
+        for r in result["hits"]:
+            score = f"{r['rerank']:>7.3f}" if "rerank" in r else f"{r['fused']:>7.4f}"
+            print(f"{score}  bm25 #{r['lexical_rank'] or '-'} dense #{r['dense_rank'] or '-'}  "
+                  f"{r['source']} {r['url']} [{r['section']}]")
+            print(f"         {clean_text(r['text'])[:160]}")
+        stages = ", ".join(f"{stage} {ms:.1f} ms" for stage, ms in result["timings"].items())
+        print(f"{stages} ({result['reranked']} reranked)")
+        return 0
+
+    if args.command == "segments":
+        if args.action == "build":
+            shutil.rmtree(args.dir, ignore_errors=True)
+        index = SegmentedIndex.open(args.dir)
+        start = time.perf_counter()
+        if args.action == "build":
+            print(index.update(iter_deduplicate(iter_chunks())))
+        elif args.action == "update":
+            for source in args.args:
+                found = os.path.exists(os.path.join(SCRAPPING_DIR, source))
+                chunks = iter_deduplicate(chunk_source(source)) if found else []
+                print(f"{source}: {index.update(chunks, [source])}")
+            merged = index.merge_pending()
+            print(f"{merged} merges, {len(index)} live rows in {(time.perf_counter() - start) * 1000:.0f} ms")
+        elif args.action == "search":
+            query = " ".join(args.args)
+            for r in index.search(query, args.k):
+                print(f"{r['fused']:>7.4f}  {r['segment']}:{r['row']}  {r['source']} {r['url']} [{r['section']}]")
+                print(f"         {clean_text(r['text'])[:160]}")
+            print(f"{len(index)} live rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for segment in index.info():
+            print(f"   {segment['name']}  {segment['rows']:>6} rows  {segment['deleted']:>5} deleted  tier {segment['tier']}")
+        return 0
+
+    if args.command == "snapshot":
+        if args.action == "publish":
+            start = time.perf_counter()
+            version = publish(args.dir)
+            print(f"published {version} in {time.perf_counter() - start:.2f}s; running servers pick it up on reload")
+        elif args.action == "rollback":
+            available = versions(args.dir)
+            live = current_version(args.dir)
+            older = [v for v in available if v < (live or "")]
+            target = args.version or (older[-1] if older else None)
+            if target is None:
+                print("❌ no older snapshot to roll back to")
+                return 1
+            set_current(target, args.dir)
+            print(f"CURRENT -> {target}")
+        live = current_version(args.dir)
+        for version in versions(args.dir):
+            print(f"{'*' if version == live else ' '} {version}")
+        return 0
+
+    if args.command == "call":
+        found = ZoneIndex.load(args.db).lookup(args.country)
+        for entry in found:
+            print(f"{entry['country']}: {entry['zone']}, {entry['price_per_minute']} {entry['currency']}/min")
+        if not found:
+            print(f"❌ no zone found for {args.country!r}")
+        return 0 if found else 1
+
+    kb = KnowledgeBase(args.db)
+    print(f"{len(kb.plans())} plans in {len(kb.families())} families, "
+          f"{len(kb.services())} services, {len(kb.prices())} prices, {len(kb.texts())} texts")
+    for family in kb.families():
+        print(f"  {family}: {len(kb.plans(family))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
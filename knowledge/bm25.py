@@ -0,0 +1,186 @@
+"""In-process BM25 inverted index over the scraped page corpus.
+
+Postings are kept per term as two ``array('I')`` columns - document ids
+and term frequencies - instead of Python lists of tuples, so the index
+stays compact as the corpus grows from the 60 pages of
+``etisalat_scraped_data.json`` to the whole portal. Documents can be added
+at any time (new pages from a crawl are appended, ids only grow, so
+postings stay sorted), and ``search`` scores only the postings of the
+query terms::
+
+    index = BM25Index()
+    index.add("باقات الداتا المدفوعة مقدما ...", url="https://...")
+    index.search("باقة داتا شهر", k=5)
+
+``save``/``load`` write the whole index to one binary file. An index can
+also be one segment of a larger corpus (see ``segments.py``): ``search``
+then takes the corpus-wide ``CorpusStats`` so scores are comparable across
+segments, and the ids of tombstoned documents to skip.
+"""
+
+import heapq
+import json
+import math
+import struct
+from array import array
+from typing import Any, Container, Dict, Iterable, List, Optional, Tuple
+
+from .text import tokenize
+
+_MAGIC = b"BM25IDX1"
+
+
+class BM25Index:
+    """Inverted index with BM25 (Okapi) scoring and incremental adds."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # term -> (doc ids, term frequencies)
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.doc_lengths = array("I")
+        self.docs: List[Dict[str, Any]] = []
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, text: str, **meta: Any) -> int:
+        """Index one document; ``meta`` (url, source, section...) is returned by search."""
+        doc_id = len(self.docs)
+        terms = tokenize(text)
+        counts: Dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, count in counts.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array("I"), array("I"))
+            posting[0].append(doc_id)
+            posting[1].append(count)
+        self.doc_lengths.append(len(terms))
+        self.total_length += len(terms)
+        meta.setdefault("text", text)
+        self.docs.append(meta)
+        return doc_id
+
+    def add_many(self, documents: Iterable[Dict[str, Any]], text_key: str = "text") -> None:
+        for document in documents:
+            meta = dict(document)
+            self.add(meta.pop(text_key), **meta)
+
+    @property
+    def average(self) -> float:
+        return self.total_length / len(self.docs) if self.docs else 1.0
+
+    def df(self, term: str) -> int:
+        posting = self.postings.get(term)
+        return len(posting[0]) if posting else 0
+
+    def idf(self, term: str) -> float:
+        df = self.df(term)
+        n = len(self.docs)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 10, exclude: Container[int] = (),
+               stats: Optional["CorpusStats"] = None) -> List[Dict[str, Any]]:
+        """Top ``k`` documents for ``query`` as metadata dicts with a ``score``.
+
+        Equal scores are returned by ascending id.
+
+        ``exclude`` holds ids not to return (tombstones); ``stats`` replaces
+        this index's own document count, average length and idf.
+        """
+        if not self.docs:
+            return []
+        stats = stats or self
+        average = stats.average or 1.0
+        k1, b = self.k1, self.b
+        lengths = self.doc_lengths
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            idf = stats.idf(term)
+            for doc_id, tf in zip(*posting):
+                if doc_id in exclude:
+                    continue
+                norm = k1 * (1 - b + b * lengths[doc_id] / average)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [dict(self.docs[doc_id], id=doc_id, score=round(score, 4)) for doc_id, score in best]
+
+    # -- persistence ----------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Write the index as a JSON header followed by the raw posting arrays."""
+        terms = list(self.postings)
+        header = json.dumps({
+            "k1": self.k1,
+            "b": self.b,
+            "docs": self.docs,
+            "terms": terms,
+            "sizes": [len(self.postings[t][0]) for t in terms],
+        }, ensure_ascii=False).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(_MAGIC + struct.pack("<Q", len(header)) + header)
+            self.doc_lengths.tofile(f)
+            for term in terms:
+                ids, freqs = self.postings[term]
+                ids.tofile(f)
+                freqs.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a BM25 index")
+            (size,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(size).decode("utf-8"))
+            index = cls(header["k1"], header["b"])
+            index.docs = header["docs"]
+            index.doc_lengths.fromfile(f, len(index.docs))
+            index.total_length = sum(index.doc_lengths)
+            for term, count in zip(header["terms"], header["sizes"]):
+                ids, freqs = array("I"), array("I")
+                ids.fromfile(f, count)
+                freqs.fromfile(f, count)
+                index.postings[term] = (ids, freqs)
+        return index
+
+
+class CorpusStats:
+    """Document count, average length and document frequencies summed over several indexes.
+
+    Tombstoned documents still count until their segment is merged away,
+    as in Lucene; the skew is bounded by the merge policy.
+    """
+
+    def __init__(self, indexes: Iterable[BM25Index]):
+        self.indexes = list(indexes)
+        self.n = sum(len(index) for index in self.indexes)
+        total = sum(index.total_length for index in self.indexes)
+        self.average = total / self.n if self.n else 1.0
+
+    def idf(self, term: str) -> float:
+        df = sum(index.df(term) for index in self.indexes)
+        return math.log(1 + (self.n - df + 0.5) / (df + 0.5))
+
+
+def build_from_knowledge_base(kb: Any, sources: Optional[Iterable[str]] = None) -> BM25Index:
+    """Index every text record of a ``KnowledgeBase`` (optionally only some sources)."""
+    index = BM25Index()
+    wanted = set(sources) if sources else None
+    for row in kb.texts():
+        if wanted is None or row["source"] in wanted:
+            index.add(row["text"], source=row["source"], path=row["path"])
+    return index
+
+
+def build_from_chunks(chunks: Iterable[Any]) -> BM25Index:
+    """Index a stream of ``chunker.Chunk`` objects, keeping source/url/section/tokens as metadata."""
+    index = BM25Index()
+    for chunk in chunks:
+        index.add(chunk.text, **chunk.meta())
+    return index
@@ -0,0 +1,138 @@
+"""Corpus-level removal of navigation, footer and carousel boilerplate.
+
+Every page in ``etisalat_scraped_data.json`` starts with the same mega-menu
+("ConsumerBusiness / Stores / عربي / Plans / eHome ...") and ends with the
+same footer, so most of its text is repeated on every other page. Rather
+than hard-coding those menus, ``BoilerplateFilter`` learns them from the
+corpus: it hashes every run of ``shingle`` consecutive lines of every page
+and marks a run as boilerplate when it occurs on at least ``min_fraction``
+of the pages. A line is removed when it is covered by a boilerplate run, so
+a short line such as "Features" or "3" is only dropped when it sits inside
+a repeated block, not because it is common on its own::
+
+    pages, report = remove_boilerplate(json.load(f))
+    print_report(report)
+"""
+
+import zlib
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from .text import clean_text
+
+SHINGLE_LINES = 4
+MIN_FRACTION = 0.2
+MIN_PAGES = 3
+
+
+def _lines(text: str) -> List[str]:
+    return [line for line in (clean_text(raw) for raw in (text or "").splitlines()) if line]
+
+
+def _shingles(lines: List[str], size: int) -> List[int]:
+    """Hash of every window of ``size`` consecutive lines (one per start line)."""
+    if len(lines) < size:
+        return [zlib.crc32("\n".join(lines).encode("utf-8"))] if lines else []
+    return [zlib.crc32("\n".join(lines[i:i + size]).encode("utf-8")) for i in range(len(lines) - size + 1)]
+
+
+class BoilerplateFilter:
+    """Learns repeated line blocks from a corpus and strips them from pages."""
+
+    def __init__(self, shingle: int = SHINGLE_LINES, min_fraction: float = MIN_FRACTION,
+                 min_pages: int = MIN_PAGES):
+        self.shingle = shingle
+        self.min_fraction = min_fraction
+        self.min_pages = min_pages
+        self.boilerplate: Set[int] = set()
+        self.pages = 0
+
+    def fit(self, texts: Iterable[str]) -> "BoilerplateFilter":
+        """Count on how many pages each shingle occurs and keep the frequent ones."""
+        page_counts: Dict[int, int] = {}
+        self.pages = 0
+        for text in texts:
+            self.pages += 1
+            for shingle in set(_shingles(_lines(text), self.shingle)):
+                page_counts[shingle] = page_counts.get(shingle, 0) + 1
+        threshold = max(self.min_pages, self.min_fraction * self.pages)
+        self.boilerplate = {shingle for shingle, count in page_counts.items() if count >= threshold}
+        return self
+
+    def strip_lines(self, text: str) -> Tuple[List[str], List[str]]:
+        """(kept lines, removed lines) of one page."""
+        lines = _lines(text)
+        removed = [False] * len(lines)
+        for start, shingle in enumerate(_shingles(lines, self.shingle)):
+            if shingle in self.boilerplate:
+                for i in range(start, min(start + self.shingle, len(lines))):
+                    removed[i] = True
+        kept = [line for line, gone in zip(lines, removed) if not gone]
+        dropped = [line for line, gone in zip(lines, removed) if gone]
+        return kept, dropped
+
+    def strip(self, text: str) -> str:
+        """Page text without boilerplate, one line per kept line."""
+        return "\n".join(self.strip_lines(text)[0])
+
+
+def remove_boilerplate(pages: List[Dict[str, Any]], text_key: str = "content",
+                       **options: Any) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Strip boilerplate from scraped ``{"url", "content"}`` pages.
+
+    Returns the cleaned pages (copies, same keys) and a report with the
+    characters and lines removed overall and per page, plus the most
+    frequently removed lines.
+    """
+    texts = [page.get(text_key) or "" for page in pages]
+    boilerplate = BoilerplateFilter(**options).fit(texts)
+
+    cleaned, per_page = [], []
+    removed_lines: Dict[str, int] = {}
+    before_chars = after_chars = before_lines = after_lines = 0
+    for page, text in zip(pages, texts):
+        kept, dropped = boilerplate.strip_lines(text)
+        page = dict(page)
+        page[text_key] = "\n".join(kept)
+        cleaned.append(page)
+
+        original_chars = len(clean_text(text))
+        kept_chars = len(clean_text(page[text_key]))
+        before_chars += original_chars
+        after_chars += kept_chars
+        before_lines += len(kept) + len(dropped)
+        after_lines += len(kept)
+        for line in dropped:
+            removed_lines[line] = removed_lines.get(line, 0) + 1
+        per_page.append({
+            "url": page.get("url", ""),
+            "chars_before": original_chars,
+            "chars_after": kept_chars,
+            "lines_removed": len(dropped),
+        })
+
+    report = {
+        "pages": len(pages),
+        "boilerplate_shingles": len(boilerplate.boilerplate),
+        "chars_before": before_chars,
+        "chars_after": after_chars,
+        "lines_before": before_lines,
+        "lines_after": after_lines,
+        "removed_ratio": round(1 - after_chars / before_chars, 4) if before_chars else 0.0,
+        "top_removed": sorted(removed_lines.items(), key=lambda item: -item[1])[:20],
+        "per_page": per_page,
+    }
+    return cleaned, report
+
+
+def print_report(report: Dict[str, Any], pages: int = 10) -> None:
+    print(f"📄 {report['pages']} pages, {report['boilerplate_shingles']} boilerplate blocks")
+    print(f"   chars: {report['chars_before']:,} -> {report['chars_after']:,} "
+          f"({report['removed_ratio']:.1%} removed)")
+    print(f"   lines: {report['lines_before']:,} -> {report['lines_after']:,}")
+    print("   most removed lines:")
+    for line, count in report["top_removed"][:10]:
+        print(f"     {count:>4}x  {line[:70]}")
+    worst = sorted(report["per_page"], key=lambda page: page["chars_after"] - page["chars_before"])
+    print(f"   pages with most removed ({pages}):")
+    for page in worst[:pages]:
+        print(f"     {page['chars_before']:>6} -> {page['chars_after']:>6}  {page['url']}")
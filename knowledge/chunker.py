@@ -0,0 +1,262 @@
+"""Streaming, structure-aware chunking of pages and scraped records.
+
+Retrieval works on passages, not on whole files: a page dump is one long
+string per URL and the structured outputs nest lists inside dicts
+(``service_features``, ``full_content``, ``pricing_details``...). Every
+function here is a generator that yields ``Chunk`` objects as it goes, so a
+crawl of any size can be indexed while holding one page (or one JSON file)
+at a time::
+
+    for chunk in iter_chunks():
+        index.add(chunk.text, **chunk.meta())
+
+Chunks follow the structure of their input:
+
+* HTML pages are split per ``<section>`` (``for_features_and_terms``,
+  ``for_table``...), labelled with the section id or heading,
+* JSON records are split per top-level key, and every dict inside a list
+  (a plan card, a service row, an offer) becomes its own chunk,
+* plain page text is packed line by line, starting a new chunk at short
+  heading-like lines when the current one is already half full.
+
+Anything longer than ``max_tokens`` is packed line by line (and a single
+over-long line word by word), never cut mid-word.
+"""
+
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .boilerplate import remove_boilerplate
+from .sources import SCRAPPING_DIR, SOURCES, scraped_pages
+from .text import clean_text
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:  # only needed for chunk_html
+    BeautifulSoup = None
+
+MAX_TOKENS = 200
+
+_TOKENS = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = (".", "!", "?", ":", "؟", "،", "…")
+
+
+@dataclass
+class Chunk:
+    source: str
+    url: str
+    section: str
+    text: str
+    tokens: int
+    # source/url/section of near-duplicates merged into this chunk (see dedupe.py)
+    duplicates: List[Dict[str, str]] = field(default_factory=list)
+
+    def meta(self) -> Dict[str, Any]:
+        """Everything but the text, for index metadata."""
+        data = asdict(self)
+        del data["text"]
+        return data
+
+
+def count_tokens(text: str) -> int:
+    """Words plus punctuation marks - a cheap, tokenizer-free size estimate."""
+    return len(_TOKENS.findall(text))
+
+
+def _split_line(line: str, max_tokens: int) -> Iterator[str]:
+    """Break a single over-long line into pieces of at most ``max_tokens``."""
+    words, size = [], 0
+    for word in line.split():
+        cost = count_tokens(word)
+        if words and size + cost > max_tokens:
+            yield " ".join(words)
+            words, size = [], 0
+        words.append(word)
+        size += cost
+    if words:
+        yield " ".join(words)
+
+
+def _is_heading(line: str) -> bool:
+    return len(line.split()) <= 5 and not line.endswith(_SENTENCE_END) and not line[:1].isdigit()
+
+
+def pack_lines(lines: Iterable[str], max_tokens: int = MAX_TOKENS,
+               break_at_headings: bool = False) -> Iterator[Tuple[str, str, int]]:
+    """Group lines into (heading, text, tokens) pieces of at most ``max_tokens``.
+
+    ``heading`` is the last heading-like line seen before the piece started.
+    """
+    buffer: List[str] = []
+    size = 0
+    heading = current = ""
+    for line in lines:
+        line = clean_text(line)
+        if not line:
+            continue
+        starts_section = break_at_headings and _is_heading(line) and size >= max_tokens // 2
+        for piece in _split_line(line, max_tokens):
+            cost = count_tokens(piece)
+            if buffer and (size + cost > max_tokens or starts_section):
+                yield current, "\n".join(buffer), size
+                buffer, size = [], 0
+            starts_section = False
+            if not buffer:
+                current = piece if _is_heading(piece) else heading
+            if _is_heading(piece):
+                heading = piece
+            buffer.append(piece)
+            size += cost
+    if buffer:
+        yield current, "\n".join(buffer), size
+
+
+# -- plain text and HTML pages -------------------------------------------------
+
+def chunk_text(text: str, url: str = "", source: str = "",
+               max_tokens: int = MAX_TOKENS) -> Iterator[Chunk]:
+    """Chunks of a plain-text page, one line per scraped line."""
+    for heading, piece, tokens in pack_lines(text.splitlines(), max_tokens, break_at_headings=True):
+        yield Chunk(source, url, heading, piece, tokens)
+
+
+def _top_sections(soup: Any) -> List[Any]:
+    return [s for s in soup.find_all("section") if s.find_parent("section") is None]
+
+
+def chunk_html(html: Any, url: str = "", source: str = "", max_tokens: int = MAX_TOKENS) -> Iterator[Chunk]:
+    """Chunks of an HTML page, one or more per top-level ``<section>``.
+
+    Navigation and footer markup live outside the sections and are skipped;
+    a page without sections falls back to its ``<main>``/``<body>`` text.
+    """
+    if BeautifulSoup is None:
+        raise ImportError("chunk_html needs BeautifulSoup: pip install beautifulsoup4")
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    sections = _top_sections(soup)
+    if not sections:
+        root = soup.find("main") or soup.body or soup
+        yield from chunk_text(root.get_text("\n", strip=True), url, source, max_tokens)
+        return
+    for position, section in enumerate(sections):
+        heading = section.find(["h1", "h2", "h3", "h4", "h5", "h6"])
+        label = section.get("id") or (clean_text(heading.get_text()) if heading else f"section {position + 1}")
+        for _, piece, tokens in pack_lines(section.get_text("\n", strip=True).splitlines(), max_tokens):
+            yield Chunk(source, url, label, piece, tokens)
+
+
+def chunk_pages(pages: Iterable[Tuple[str, Any]], source: str = "",
+                max_tokens: int = MAX_TOKENS) -> Iterator[Chunk]:
+    """Chunks of a stream of ``(url, html bytes or str)`` pages, e.g. archived crawl snapshots."""
+    for url, html in pages:
+        yield from chunk_html(html, url, source, max_tokens)
+
+
+# -- structured JSON records ---------------------------------------------------
+
+def _is_scalar(value: Any) -> bool:
+    return not isinstance(value, (dict, list))
+
+
+def _render(value: Any) -> Iterator[str]:
+    """``key: value`` lines of a JSON value, nested keys joined with " - "."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            key = clean_text(key).rstrip(":")
+            if _is_scalar(item):
+                text = clean_text(item)
+                if text and text != "-":
+                    yield f"{key}: {text}" if key else text
+            else:
+                for line in _render(item):
+                    if not key:
+                        yield line
+                    else:
+                        yield f"{key} - {line}" if ":" in line else f"{key}: {line}"
+    elif isinstance(value, list):
+        for item in value:
+            yield from _render(item)
+    else:
+        text = clean_text(value)
+        if text and text != "-":
+            yield text
+
+
+def _card_title(card: Dict[str, Any]) -> str:
+    for key, value in card.items():
+        if _is_scalar(value) and ("name" in key.lower() or key in ("title", "section_title", "speed")):
+            return clean_text(value)
+    return ""
+
+
+def _page_url(data: Dict[str, Any]) -> str:
+    """The page URL of a record, also when it sits one level down (``page_info.url``)."""
+    for candidate in [data] + [v for v in data.values() if isinstance(v, dict)]:
+        url = candidate.get("url") or candidate.get("page_url")
+        if isinstance(url, str) and url:
+            return clean_text(url)
+    return ""
+
+
+def chunk_record(data: Any, source: str = "", url: str = "", section: str = "",
+                 max_tokens: int = MAX_TOKENS) -> Iterator[Chunk]:
+    """Chunks of a scraped JSON document, following its nesting.
+
+    Scalars under one dict are kept together; each dict in a list is a
+    card of its own (nested details included, as long as it fits in
+    ``max_tokens``), labelled by its name/title field when it has one.
+    """
+    if isinstance(data, dict):
+        url = url or _page_url(data)
+        scalars = {k: v for k, v in data.items() if _is_scalar(v)}
+        if scalars:
+            for _, piece, tokens in pack_lines(_render(scalars), max_tokens):
+                yield Chunk(source, url, section or "/", piece, tokens)
+        for key, value in data.items():
+            if not _is_scalar(value):
+                yield from chunk_record(value, source, url, f"{section}/{key}", max_tokens)
+    elif isinstance(data, list):
+        if all(_is_scalar(item) for item in data):
+            for _, piece, tokens in pack_lines(_render(data), max_tokens):
+                yield Chunk(source, url, section, piece, tokens)
+            return
+        for position, item in enumerate(data):
+            if isinstance(item, dict) and count_tokens("\n".join(_render(item))) <= max_tokens:
+                title = _card_title(item)
+                label = f"{section}/{title or position}"
+                for _, piece, tokens in pack_lines(_render(item), max_tokens):
+                    yield Chunk(source, url, label, piece, tokens)
+            else:
+                yield from chunk_record(item, source, url, f"{section}/{position}", max_tokens)
+    else:
+        for _, piece, tokens in pack_lines(_render(data), max_tokens):
+            yield Chunk(source, url, section, piece, tokens)
+
+
+# -- the whole scraped corpus --------------------------------------------------
+
+def chunk_source(source: str, max_tokens: int = MAX_TOKENS) -> Iterator[Chunk]:
+    """Chunks of one file registered in ``SOURCES`` (relative to scrapping/)."""
+    with open(os.path.join(SCRAPPING_DIR, source), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if SOURCES.get(source) is scraped_pages:
+        pages, _ = remove_boilerplate(data)
+        del data
+        for page in pages:
+            yield from chunk_text(page.get("content", ""), page.get("url", ""), source, max_tokens)
+    else:
+        yield from chunk_record(data, source, max_tokens=max_tokens)
+
+
+def iter_chunks(sources: Optional[Iterable[str]] = None, max_tokens: int = MAX_TOKENS) -> Iterator[Chunk]:
+    """Chunks of every scraped file, one file in memory at a time."""
+    for source in sources or SOURCES:
+        if not os.path.exists(os.path.join(SCRAPPING_DIR, source)):
+            print(f"⚠️ skipping missing {source}")
+            continue
+        yield from chunk_source(source, max_tokens)
@@ -0,0 +1,238 @@
+"""English names for the destinations listed on the international calls page.
+
+The portal only lists Arabic names; these let customers ask in English.
+Franco-Arabic spellings ("almanya", "el saudia") are matched separately by
+transliteration in ``zones.py``.
+"""
+
+ENGLISH_NAMES = {
+    # Zone 1
+    "جيبوتي": ["Djibouti"],
+    "جزر فيرجن الأمريكية": ["US Virgin Islands", "United States Virgin Islands"],
+    "قطر": ["Qatar"],
+    "العراق": ["Iraq"],
+    "سلطنة عمان": ["Oman"],
+    "الإمارات العربية المتحدة": ["United Arab Emirates", "UAE", "Emirates", "Dubai", "Abu Dhabi"],
+    "بورتوريكو": ["Puerto Rico"],
+    "غوام": ["Guam"],
+    "أمريكا الشمالية": ["North America"],
+    "ليبيا": ["Libya"],
+    "فلسطين": ["Palestine"],
+    "السودان": ["Sudan"],
+    "اليمن": ["Yemen"],
+    "الكويت": ["Kuwait"],
+    "البحرين": ["Bahrain"],
+    "الولايات المتحدة": ["United States", "USA", "US", "America"],
+    "الأردن": ["Jordan"],
+    "سوريا": ["Syria"],
+    "المملكة العربية السعودية": ["Saudi Arabia", "KSA", "Saudi"],
+    "ألاسكا": ["Alaska"],
+    "لبنان": ["Lebanon"],
+    "هاواي": ["Hawaii"],
+    # Zone 2
+    "برمودا": ["Bermuda"],
+    "دومينيكيا": ["Dominican Republic"],
+    "هولندا": ["Netherlands", "Holland"],
+    "أوكرانيا": ["Ukraine"],
+    "ليتوانيا": ["Lithuania"],
+    "جزر البهاما": ["Bahamas"],
+    "أيسلندا": ["Iceland"],
+    "البرتغال": ["Portugal"],
+    "كازاخستان": ["Kazakhstan"],
+    "إيطاليا": ["Italy"],
+    "النمسا": ["Austria"],
+    "أنتيغوا": ["Antigua"],
+    "كندا": ["Canada"],
+    "فرنسا": ["France"],
+    "جامايكا": ["Jamaica"],
+    "ألمانيا": ["Germany"],
+    "موناكو": ["Monaco"],
+    "جورجيا": ["Georgia"],
+    "سان مارينو": ["San Marino"],
+    "التشيكي": ["Czech Republic", "Czechia"],
+    "ليختنشتاين": ["Liechtenstein"],
+    "بولندا": ["Poland"],
+    "غرينادا": ["Grenada"],
+    "جزر العذراء البريطانيه": ["British Virgin Islands"],
+    "أيرلندا": ["Ireland"],
+    "هنغاريا": ["Hungary"],
+    "أندورا": ["Andorra"],
+    "قيرغيزستان": ["Kyrgyzstan"],
+    "إستونيا": ["Estonia"],
+    "جزر فارو": ["Faroe Islands"],
+    "جبل طارق": ["Gibraltar"],
+    "تركيا": ["Turkey", "Turkiye"],
+    "أرمينيا": ["Armenia"],
+    "أنتيغوا وبربودا": ["Antigua and Barbuda"],
+    "رومانيا": ["Romania"],
+    "إسبانيا": ["Spain"],
+    "المملكة المتحدة": ["United Kingdom", "UK", "Britain", "England"],
+    "لوكسمبورغ": ["Luxembourg"],
+    "الدنمارك": ["Denmark"],
+    "النرويج": ["Norway"],
+    "سلوفاكيا": ["Slovakia"],
+    "ترينيداد وتوباجو": ["Trinidad and Tobago"],
+    "دومينيكا": ["Dominica"],
+    "السويد": ["Sweden"],
+    "اليونان": ["Greece"],
+    "قبرص": ["Cyprus"],
+    "بربادوس": ["Barbados"],
+    "روسيا": ["Russia"],
+    "مولدوفا": ["Moldova"],
+    # Zone 3
+    "إريتريا": ["Eritrea"],
+    "مارشال": ["Marshall Islands"],
+    "سنغافورة": ["Singapore"],
+    "كمبوديا": ["Cambodia"],
+    "السنغال": ["Senegal"],
+    "أوغندا": ["Uganda"],
+    "جوادلوب": ["Guadeloupe"],
+    "بوتسوانا": ["Botswana"],
+    "أذربيجان": ["Azerbaijan"],
+    "البرازيل": ["Brazil"],
+    "توجو": ["Togo"],
+    "أروبا": ["Aruba"],
+    "ميانمار": ["Myanmar", "Burma"],
+    "الرأس الأخضر": ["Cape Verde"],
+    "موزمبيق": ["Mozambique"],
+    "تركمانستان": ["Turkmenistan"],
+    "بريطاني": ["British"],
+    "ناميبيا": ["Namibia"],
+    "ماكاو": ["Macau", "Macao"],
+    "طاجيكستان": ["Tajikistan"],
+    "غانا": ["Ghana"],
+    "سانت لويس مارتن": ["Saint Martin"],
+    "أنغولا": ["Angola"],
+    "إندونيسيا": ["Indonesia"],
+    "الأرجنتين": ["Argentina"],
+    "جنوب أفريقيا": ["South Africa"],
+    "سانت لويس كيتس": ["Saint Kitts", "Saint Kitts and Nevis"],
+    "بوتان": ["Bhutan"],
+    "فيلبين": ["Philippines"],
+    "ساموا الأمريكية": ["American Samoa"],
+    "كوستا ريكا": ["Costa Rica"],
+    "نيجيريا": ["Nigeria"],
+    "أفغانستان": ["Afghanistan"],
+    "بيرو": ["Peru"],
+    "فيتنام": ["Vietnam"],
+    "غينيا الفرنسية": ["French Guiana"],
+    "الهند": ["India"],
+    "أستراليا": ["Australia"],
+    "موريشيوس": ["Mauritius"],
+    "كاليدونياالجديدة": ["New Caledonia"],
+    "نيوزيلندا": ["New Zealand"],
+    "غيانا": ["Guyana"],
+    "رواندا": ["Rwanda"],
+    "بنجلاديش": ["Bangladesh"],
+    "الأرض الخضراء": ["Greenland"],
+    "روسيا الهاتف الثابت": ["Russia landline", "Russia fixed line"],
+    "بنين": ["Benin"],
+    "أنغيلا": ["Anguilla"],
+    "نيكاراغوا": ["Nicaragua"],
+    "هايتي": ["Haiti"],
+    "الصين": ["China"],
+    "سيريلانكا": ["Sri Lanka"],
+    "بولينيزيا الفرنسية": ["French Polynesia"],
+    "جزر الهند الغربية": ["West Indies"],
+    "سانت لويس فنسنت": ["Saint Vincent", "Saint Vincent and the Grenadines"],
+    "جزر تركس وكايكوس": ["Turks and Caicos Islands"],
+    "بالاو": ["Palau"],
+    "السلفادور": ["El Salvador"],
+    "سورينام": ["Suriname"],
+    "بوليفيا": ["Bolivia"],
+    "ساموا الغربية": ["Samoa", "Western Samoa"],
+    "أثيوبيا": ["Ethiopia"],
+    "إسرائيل": ["Israel"],
+    "إيران": ["Iran"],
+    "لاوس": ["Laos"],
+    "بنما": ["Panama"],
+    "نيبال": ["Nepal"],
+    "سانت لويس لوسيا": ["Saint Lucia"],
+    "كولومبيا": ["Colombia"],
+    "غواتيمالا": ["Guatemala"],
+    "تايلاند": ["Thailand"],
+    "هونج كونج": ["Hong Kong"],
+    "جزيرة كايمان.": ["Cayman Islands"],
+    "كينيا": ["Kenya"],
+    "تنزانيا": ["Tanzania"],
+    "اليابان": ["Japan"],
+    "كوريا الجنوبية": ["South Korea", "Korea"],
+    "شيلي": ["Chile"],
+    "باكستان": ["Pakistan"],
+    "أوزبكستان": ["Uzbekistan"],
+    "هندوراس": ["Honduras"],
+    "المكسيك": ["Mexico"],
+    "فيجي": ["Fiji"],
+    "توغو": ["Togo"],
+    "منغوليا": ["Mongolia"],
+    "بروناي": ["Brunei"],
+    "أوروغواي": ["Uruguay"],
+    "كوت ديفوار/ ساحل العاج": ["Ivory Coast", "Cote d'Ivoire"],
+    # HTR 1
+    "بلغاريا": ["Bulgaria"],
+    "مالطا": ["Malta"],
+    "ليسوتو": ["Lesotho"],
+    "بوركينا فاسو": ["Burkina Faso"],
+    "زامبيا": ["Zambia"],
+    "مقدونيا": ["Macedonia", "North Macedonia"],
+    "صربيا": ["Serbia"],
+    "سلوفينيا": ["Slovenia"],
+    "بيلاروسيا": ["Belarus"],
+    "الجابون": ["Gabon"],
+    "جزر القمر": ["Comoros"],
+    "موريتانيا": ["Mauritania"],
+    "لاتفيا": ["Latvia"],
+    "مايوت": ["Mayotte"],
+    "واليس وفوتونا": ["Wallis and Futuna"],
+    "ألبانيا": ["Albania"],
+    "ملاوي": ["Malawi"],
+    "غينيا بيساو": ["Guinea-Bissau"],
+    "كوسوفو": ["Kosovo"],
+    "سيشيل": ["Seychelles"],
+    "مالي": ["Mali"],
+    "بلجيكا": ["Belgium"],
+    "الصومال": ["Somalia"],
+    "جنوب السودان": ["South Sudan"],
+    "تشاد": ["Chad"],
+    "البوسنة والهرسك": ["Bosnia and Herzegovina", "Bosnia"],
+    "كرواتيا": ["Croatia"],
+    "غامبيا": ["Gambia"],
+    "غينيا كوناكري": ["Guinea Conakry"],
+    "سانت لويس بيير": ["Saint Pierre", "Saint Pierre and Miquelon"],
+    "زيمبابوي": ["Zimbabwe"],
+    "الكونغو": ["Congo", "Republic of the Congo"],
+    "سويسرا": ["Switzerland"],
+    "ليبيريا": ["Liberia"],
+    "الكاميرون": ["Cameroon"],
+    "سيرا ليون": ["Sierra Leone"],
+    "غينيا الإستوائية": ["Equatorial Guinea"],
+    "أفريقيا الوسطى": ["Central African Republic"],
+    "كوريا الشمالية": ["North Korea"],
+    "فنلندا": ["Finland"],
+    "غينيا": ["Guinea"],
+    "المغرب": ["Morocco"],
+    "مدغشقر": ["Madagascar"],
+    "الكونغو (زائير)": ["DR Congo", "Democratic Republic of the Congo", "Zaire"],
+    "بوروندي": ["Burundi"],
+    # HTR 2
+    "تونغا": ["Tonga"],
+    "توكيلاو": ["Tokelau"],
+    "جزر كوك": ["Cook Islands"],
+    "جزر اسينشن": ["Ascension Island"],
+    "ساو تومي": ["Sao Tome", "Sao Tome and Principe"],
+    "كيريباتي": ["Kiribati"],
+    "جزر سليمان": ["Solomon Islands"],
+    "سانت لويس هيلينا": ["Saint Helena"],
+    "فانواتو": ["Vanuatu"],
+    "جزر فوكلاند": ["Falkland Islands"],
+    "بابوا غينيا الجديدة": ["Papua New Guinea"],
+    "دييغو جارسيا": ["Diego Garcia"],
+    "كوبا": ["Cuba"],
+    "توفالو": ["Tuvalu"],
+    "تونس": ["Tunisia"],
+    "ناورو": ["Nauru"],
+    "الجزائر": ["Algeria"],
+    "جزر نيوي": ["Niue"],
+    "جزر المالديف": ["Maldives"],
+    "جزيرة نورفولك": ["Norfolk Island"],
+}
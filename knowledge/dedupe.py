@@ -0,0 +1,224 @@
+"""Near-duplicate chunk clustering with MinHash and LSH banding.
+
+The same text reaches the corpus several times: the English and Arabic
+index pages, slick carousel clones in the Hekaya and El Kart pages, and
+``akwa_full_page.json`` next to the El Kart notebook output. Comparing
+every chunk with every other one is quadratic, so each chunk is reduced to
+a MinHash signature of its word shingles and the signature is cut into
+``bands`` bands of ``rows`` values. Only chunks that share a whole band
+become candidate pairs; a pair is merged when its signatures agree on at
+least ``threshold`` of their values (an estimate of the Jaccard similarity
+of the shingle sets)::
+
+    unique, report = deduplicate(iter_chunks())
+
+Each cluster keeps one canonical chunk, the longest, and records where the
+others came from in its ``duplicates`` list.
+
+``iter_deduplicate`` does the same pass without holding the corpus: only
+canonical chunks are indexed, a chunk matching one is folded into it and
+dropped, and a canonical chunk is yielded once ``window`` more chunks
+have gone by. Memory is one signature per cluster plus the chunks still
+inside the window::
+
+    report = {}
+    DenseIndex.build(iter_deduplicate(iter_chunks(), report=report), embedder)
+"""
+
+import random
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .text import tokenize
+
+NUM_PERM = 64
+BANDS = 16
+THRESHOLD = 0.8
+WINDOW = 512
+SHINGLE_WORDS = 3
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> Set[int]:
+    """Hashes of the ``size``-word shingles of the normalised text."""
+    words = tokenize(text, stem=False)
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """``num_perm`` universal hash functions ``(a * x + b) mod p``."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, hashes: Set[int]) -> Tuple[int, ...]:
+        if not hashes:
+            return tuple(_MAX_HASH for _ in self.params)
+        return tuple(min((a * x + b) % _PRIME for x in hashes) & _MAX_HASH for a, b in self.params)
+
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+class LSHIndex:
+    """Banded signatures: ids sharing any band bucket are candidate duplicates."""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+    def add(self, item_id: int, signature: Tuple[int, ...]) -> Set[int]:
+        """Insert a signature and return the ids already sharing a bucket with it."""
+        candidates: Set[int] = set()
+        for band in range(self.bands):
+            key = (band, signature[band * self.rows:(band + 1) * self.rows])
+            bucket = self.buckets.setdefault(key, [])
+            candidates.update(bucket)
+            bucket.append(item_id)
+        return candidates
+
+
+def _find(parents: List[int], i: int) -> int:
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def cluster(texts: Iterable[str], threshold: float = THRESHOLD, num_perm: int = NUM_PERM,
+            bands: int = BANDS) -> List[List[int]]:
+    """Groups of indices of near-duplicate texts (singletons included), in input order."""
+    hasher = MinHasher(num_perm)
+    lsh = LSHIndex(num_perm, bands)
+    signatures: List[Tuple[int, ...]] = []
+    parents: List[int] = []
+    for i, text in enumerate(texts):
+        signature = hasher.signature(shingles(text))
+        signatures.append(signature)
+        parents.append(i)
+        for j in lsh.add(i, signature):
+            if similarity(signature, signatures[j]) >= threshold:
+                parents[_find(parents, i)] = _find(parents, j)
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(parents)):
+        groups.setdefault(_find(parents, i), []).append(i)
+    return sorted(groups.values(), key=lambda group: group[0])
+
+
+def _reference(chunk: Any) -> Dict[str, str]:
+    return {"source": chunk.source, "url": chunk.url, "section": chunk.section}
+
+
+def _label(chunk: Any) -> str:
+    return f"{chunk.source} {chunk.url} [{chunk.section}]"
+
+
+def iter_deduplicate(chunks: Iterable[Any], threshold: float = THRESHOLD, window: Optional[int] = WINDOW,
+                     report: Optional[Dict[str, Any]] = None, num_perm: int = NUM_PERM,
+                     bands: int = BANDS) -> Iterator[Any]:
+    """Yield one chunk per near-duplicate cluster while reading ``chunks``.
+
+    Each chunk is compared with the signatures of the chunks read so far
+    and joins the cluster of any match. While a cluster's canonical chunk
+    is still held, the longer chunk (the earlier one on a tie) stays
+    canonical and the other becomes a ``duplicates`` back-reference; held
+    clusters bridged by a chunk are merged. A canonical chunk is held
+    until ``window`` more chunks were read, then yielded; clusters come out
+    in the order of their first chunk. Copies turning up after that are
+    dropped and only counted in ``report``. ``window=None`` holds every
+    cluster to the end.
+
+    ``report`` (a dict) is filled in as the stream is consumed and is
+    complete once it is exhausted.
+    """
+    report = {} if report is None else report
+    report.update(chunks_before=0, chunks_after=0, tokens_before=0, tokens_after=0, clusters=[])
+    hasher = MinHasher(num_perm)
+    lsh = LSHIndex(num_perm, bands)
+    signatures: List[Tuple[int, ...]] = []
+    owners: List[int] = []  # position -> cluster id (the position of the cluster's first chunk)
+    held: "OrderedDict[int, Any]" = OrderedDict()  # cluster id -> canonical chunk not yielded yet
+    merged: Dict[int, Dict[str, Any]] = {}  # cluster id -> report entry, for clusters with copies
+    labels: Dict[int, str] = {}  # cluster id -> canonical label, for yielded clusters
+
+    def owner(position: int) -> int:
+        while owners[position] != position:
+            owners[position] = owners[owners[position]]
+            position = owners[position]
+        return position
+
+    def fold(cluster_id: int, chunk: Any) -> None:
+        """Merge ``chunk`` (with its own back-references) into a held cluster."""
+        canonical = held[cluster_id]
+        if chunk.tokens > canonical.tokens:
+            canonical, chunk = chunk, canonical
+            held[cluster_id] = canonical
+        canonical.duplicates = canonical.duplicates + [_reference(chunk)] + chunk.duplicates
+        chunk.duplicates = []
+
+    def release(cluster_id: int, chunk: Any) -> Any:
+        report["chunks_after"] += 1
+        report["tokens_after"] += chunk.tokens
+        labels[cluster_id] = _label(chunk)
+        if chunk.duplicates:
+            merged[cluster_id] = {"canonical": labels[cluster_id], "copies": len(chunk.duplicates)}
+        return chunk
+
+    for position, chunk in enumerate(chunks):
+        report["chunks_before"] += 1
+        report["tokens_before"] += chunk.tokens
+        signature = hasher.signature(shingles(chunk.text))
+        found = sorted({owner(other) for other in lsh.add(position, signature)
+                        if similarity(signature, signatures[other]) >= threshold})
+        signatures.append(signature)
+        owners.append(found[0] if found else position)
+        if not found:
+            held[position] = chunk
+        elif found[0] in held:
+            fold(found[0], chunk)
+            for other in found[1:]:
+                if other in held:
+                    owners[other] = found[0]
+                    fold(found[0], held.pop(other))
+        else:
+            entry = merged.setdefault(found[0], {"canonical": labels[found[0]], "copies": 0})
+            entry["copies"] += 1
+        while window is not None and held and next(iter(held)) <= position - window:
+            yield release(*held.popitem(last=False))
+    while held:
+        yield release(*held.popitem(last=False))
+    report["clusters"] = sorted(merged.values(), key=lambda cluster: -cluster["copies"])
+
+
+def deduplicate(chunks: Iterable[Any], threshold: float = THRESHOLD,
+                **options: Any) -> Tuple[List[Any], Dict[str, Any]]:
+    """``iter_deduplicate`` with every cluster held to the end.
+
+    The canonical chunk is the longest of its cluster (the first one on a
+    tie); the others are listed in its ``duplicates`` as source/url/section
+    back-references. Returns the canonical chunks, in the order of their
+    clusters' first chunks, and a report of what was merged.
+    """
+    options.setdefault("window", None)
+    report: Dict[str, Any] = {}
+    unique = list(iter_deduplicate(chunks, threshold, report=report, **options))
+    return unique, report
+
+
+def print_report(report: Dict[str, Any], clusters: int = 10) -> None:
+    print(f"🧹 {report['chunks_before']} chunks -> {report['chunks_after']} "
+          f"({report['chunks_before'] - report['chunks_after']} near-duplicates merged)")
+    print(f"   tokens: {report['tokens_before']:,} -> {report['tokens_after']:,}")
+    for found in report["clusters"][:clusters]:
+        print(f"   {found['copies']:>3} copies of {found['canonical'][:110]}")
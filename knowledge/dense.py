@@ -0,0 +1,255 @@
+"""Dense (embedding) retrieval over a memory-mapped vector matrix.
+
+``DenseIndex.build`` streams chunks through an embedder and appends their
+vectors, batch by batch, to one contiguous row-major file
+(``vectors.bin``, float32 or float16). Next to it are ``index.json``
+(model id, dimension, dtype, row count), ``docs.jsonl`` (one metadata line
+per row) and ``docs.offsets`` (the byte offset of every line).
+``DenseIndex.open`` maps all of them instead of reading them, so a worker
+starts instantly whatever the corpus size, only touches the pages a query
+needs, and several processes share those pages through the OS page cache.
+float16 halves the file but every scan pays for the upcast, so float32 is
+the default; for smaller indexes use ``quantize`` (int8 or product
+quantization, see ``quantize.py``), which scans compact codes and
+optionally reranks the best candidates with the exact float rows.
+
+Scoring is one matrix product for a whole batch of queries - cosine, since
+all rows are L2-normalised - done in row blocks so float16 files are
+upcast a block at a time, followed by ``argpartition`` top-k::
+
+    DenseIndex.build(iter_chunks(), load_embedder("hash"), "knowledge/vectors")
+    index = DenseIndex.open("knowledge/vectors")
+    index.search_batch(["باقات الداتا", "wifi calling"], k=5)
+"""
+
+import json
+import mmap
+import os
+import shutil
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .embeddings import load_embedder, np, require_numpy
+from .quantize import QUANTIZERS, load_quantizer
+
+DEFAULT_VECTORS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vectors")
+BLOCK_ROWS = 65536
+
+
+def top_k(scores: Any, k: int) -> Any:
+    """Column indices of the ``k`` highest scores of every row, best first."""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+class DenseIndex:
+    """A memory-mapped matrix of normalised embeddings plus row metadata."""
+
+    def __init__(self, path: str, vectors: Any, docs: Any, offsets: Any, info: Dict[str, Any],
+                 embedder: Any = None, codes: Any = None, quantizer: Any = None):
+        self.path = path
+        self.vectors = vectors  # None once the float rows were dropped after quantizing
+        self.codes = codes
+        self.quantizer = quantizer
+        self.info = info
+        self._docs = docs
+        self._offsets = offsets
+        self._embedder = embedder
+
+    def __len__(self) -> int:
+        return self.info["rows"]
+
+    def doc(self, row: int) -> Dict[str, Any]:
+        """Metadata and text of one row, parsed from the mapped ``docs.jsonl``."""
+        start = int(self._offsets[row])
+        end = int(self._offsets[row + 1]) if row + 1 < len(self) else len(self._docs)
+        return json.loads(self._docs[start:end])
+
+    @property
+    def embedder(self) -> Any:
+        if self._embedder is None:
+            self._embedder = load_embedder(self.info["model_id"])
+        return self._embedder
+
+    # -- building -------------------------------------------------------------
+
+    @classmethod
+    def build(cls, chunks: Iterable[Any], embedder: Any, path: str = DEFAULT_VECTORS_DIR,
+              dtype: str = "float32", batch_size: int = 256) -> "DenseIndex":
+        """Embed a stream of chunks into a new index directory.
+
+        Only ``batch_size`` chunks are held at a time. The directory is
+        written under a temporary name and renamed into place at the end.
+        """
+        require_numpy()
+        tmp = path + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        rows = 0
+        with open(os.path.join(tmp, "vectors.bin"), "wb") as vectors, \
+                open(os.path.join(tmp, "docs.jsonl"), "wb") as docs, \
+                open(os.path.join(tmp, "docs.offsets"), "wb") as offsets:
+            batch: List[Any] = []
+
+            def flush() -> None:
+                embedder.embed([chunk.text for chunk in batch]).astype(dtype).tofile(vectors)
+                starts = []
+                for chunk in batch:
+                    starts.append(docs.tell())
+                    line = json.dumps(dict(chunk.meta(), text=chunk.text), ensure_ascii=False)
+                    docs.write(line.encode("utf-8") + b"\n")
+                np.asarray(starts, dtype=np.uint64).tofile(offsets)
+                batch.clear()
+
+            for chunk in chunks:
+                batch.append(chunk)
+                rows += 1
+                if len(batch) == batch_size:
+                    flush()
+            if batch:
+                flush()
+        info = {"model_id": embedder.model_id, "dim": embedder.dim, "dtype": dtype, "rows": rows}
+        with open(os.path.join(tmp, "index.json"), "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(tmp, path)
+        return cls.open(path, embedder)
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_VECTORS_DIR, embedder: Any = None) -> "DenseIndex":
+        """Map an index directory; the embedder is loaded lazily from its model id."""
+        require_numpy()
+        with open(os.path.join(path, "index.json"), "r", encoding="utf-8") as f:
+            info = json.load(f)
+        if embedder is not None and embedder.model_id != info["model_id"]:
+            raise ValueError(f"{path} was built with {info['model_id']}, not {embedder.model_id}")
+        if not info["rows"]:
+            return cls(path, np.zeros((0, info["dim"]), dtype=info["dtype"]), b"", [], info, embedder)
+        vectors = codes = quantizer = None
+        if info.get("float", True):
+            vectors = np.memmap(os.path.join(path, "vectors.bin"), dtype=info["dtype"], mode="r",
+                                shape=(info["rows"], info["dim"]))
+        if info.get("quantizer"):
+            with np.load(os.path.join(path, "quantizer.npz")) as params:
+                quantizer = load_quantizer(info["quantizer"], dict(params))
+            codes = np.memmap(os.path.join(path, "codes.bin"), dtype=quantizer.code_dtype, mode="r",
+                              shape=(info["rows"], info["code_size"]))
+        offsets = np.memmap(os.path.join(path, "docs.offsets"), dtype=np.uint64, mode="r")
+        with open(os.path.join(path, "docs.jsonl"), "rb") as f:
+            docs = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(path, vectors, docs, offsets, info, embedder, codes, quantizer)
+
+    def _write_info(self) -> None:
+        tmp = os.path.join(self.path, "index.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.info, f)
+        os.replace(tmp, os.path.join(self.path, "index.json"))
+
+    def quantize(self, kind: str = "int8", keep_float: bool = True, **options: Any) -> "DenseIndex":
+        """Train a quantizer on the float rows and write ``codes.bin`` next to them.
+
+        ``options`` go to the quantizer (``m`` sub-spaces for ``"pq"``).
+        With ``keep_float=False`` the float rows are deleted and searches
+        can no longer rerank exactly. Returns the reopened index.
+        """
+        if self.vectors is None:
+            raise ValueError(f"{self.path} has no float rows left to quantize")
+        quantizer = QUANTIZERS[kind](**options).fit(self.vectors)
+        tmp = os.path.join(self.path, "codes.bin.tmp")
+        with open(tmp, "wb") as f:
+            for start in range(0, len(self), BLOCK_ROWS):
+                quantizer.encode(self.vectors[start:start + BLOCK_ROWS]).tofile(f)
+        os.replace(tmp, os.path.join(self.path, "codes.bin"))
+        np.savez(os.path.join(self.path, "quantizer.npz"), **quantizer.params())
+        self.info.update(quantizer=kind, code_size=quantizer.code_size(self.info["dim"]), float=keep_float)
+        self._write_info()
+        if not keep_float:
+            os.remove(os.path.join(self.path, "vectors.bin"))
+        return DenseIndex.open(self.path, self._embedder)
+
+    def close(self) -> None:
+        """Unmap the docs file; the vector maps go with the last reference to them."""
+        if isinstance(self._docs, mmap.mmap):
+            self._docs.close()
+        self.vectors = self.codes = None
+
+    def size_bytes(self) -> Dict[str, int]:
+        """Bytes of the float matrix and of the codes a scan reads."""
+        sizes = {}
+        for name in ("vectors.bin", "codes.bin"):
+            full = os.path.join(self.path, name)
+            if os.path.exists(full):
+                sizes[name] = os.path.getsize(full)
+        return sizes
+
+    # -- search ---------------------------------------------------------------
+
+    def scores(self, queries: Any, exact: bool = False) -> Any:
+        """Cosine similarity of every row with every query vector, shape (queries, rows).
+
+        Scans the quantized codes when there are any, unless ``exact``.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        out = np.empty((queries.shape[0], len(self)), dtype=np.float32)
+        use_codes = self.codes is not None and (not exact or self.vectors is None)
+        prepared = self.quantizer.prepare(queries) if use_codes else None
+        for start in range(0, len(self), BLOCK_ROWS):
+            if use_codes:
+                block_scores = self.quantizer.scores(prepared, self.codes[start:start + BLOCK_ROWS])
+            else:
+                block_scores = queries @ np.asarray(self.vectors[start:start + BLOCK_ROWS], dtype=np.float32).T
+            out[:, start:start + block_scores.shape[1]] = block_scores
+        return out
+
+    def _rerank(self, queries: Any, candidates: Any, k: int) -> Tuple[Any, Any]:
+        """Exact scores of each query's candidate rows; returns (rows, scores), best first."""
+        rows, scores = [], []
+        for query, row in zip(queries, candidates):
+            order = np.sort(row)  # sorted reads touch the mapped file front to back
+            exact = np.asarray(self.vectors[order], dtype=np.float32) @ query
+            best = np.argsort(-exact, kind="stable")[:k]
+            rows.append(order[best])
+            scores.append(exact[best])
+        return rows, scores
+
+    def search_vectors(self, queries: Any, k: int = 10, rerank: int = 0) -> List[List[Dict[str, Any]]]:
+        """Top ``k`` rows per query vector.
+
+        With quantized codes and ``rerank > k``, the ``rerank`` best rows by
+        approximate score are rescored with their exact float vectors.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        scores = self.scores(queries)
+        if rerank > k and self.codes is not None and self.vectors is not None:
+            rows, row_scores = self._rerank(queries, top_k(scores, rerank), k)
+        else:
+            rows = top_k(scores, k)
+            row_scores = [s[r] for s, r in zip(scores, rows)]
+        return [
+            [dict(self.doc(int(i)), id=int(i), score=round(float(score), 4)) for i, score in zip(row, values)]
+            for row, values in zip(rows, row_scores)
+        ]
+
+    def search_batch(self, queries: List[str], k: int = 10, rerank: int = 0) -> List[List[Dict[str, Any]]]:
+        """Top ``k`` chunks for each query, embedded and scored together."""
+        if not queries or not len(self):
+            return [[] for _ in queries]
+        return self.search_vectors(self.embedder.embed(queries), k, rerank)
+
+    def search(self, query: str, k: int = 10, rerank: int = 0) -> List[Dict[str, Any]]:
+        return self.search_batch([query], k, rerank)[0]
+
+    def recall(self, queries: Any, k: int = 10, rerank: int = 0) -> float:
+        """Share of the exact top-``k`` rows the quantized search also returns."""
+        if self.vectors is None:
+            raise ValueError("Recall needs the float rows (quantize with keep_float=True)")
+        queries = np.asarray(queries, dtype=np.float32)
+        truth = top_k(self.scores(queries, exact=True), k)
+        found = self.search_vectors(queries, k, rerank)
+        hits = sum(len(set(map(int, row)) & {r["id"] for r in results}) for row, results in zip(truth, found))
+        return hits / truth.size if truth.size else 1.0
+
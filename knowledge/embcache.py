@@ -0,0 +1,136 @@
+"""On-disk embedding cache keyed by (model id, normalised chunk hash).
+
+A scrape usually changes a handful of pages, so most chunks of a rebuild
+were already embedded last time. The cache keeps, per model, two
+append-only files in ``knowledge/embcache/<model id>/``:
+
+* ``keys.bin`` - one 16-byte BLAKE2b digest of the normalised chunk text
+  per row,
+* ``vectors.bin`` - the matching float32 rows, ``dim`` values each.
+
+Opening the cache reads ``keys.bin`` into a ``digest -> row`` dict (16 bytes
+a chunk) and maps ``vectors.bin``. Lookups and fills are batched: ``embed``
+looks a whole batch up, sends only the misses to the model and appends
+them, so a rebuild costs one model call per new or changed chunk::
+
+    embedder = CachedEmbedder(load_embedder("hash"))
+    DenseIndex.build(chunks, embedder)
+    embedder.cache.hits, embedder.cache.misses
+
+Rows are appended vectors first, keys second; a key only counts once its
+vector is complete, so an interrupted run leaves at most a torn tail that
+the next open truncates.
+"""
+
+import hashlib
+import os
+import re
+import unicodedata
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .embeddings import np, require_numpy
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "embcache")
+KEY_BYTES = 16
+
+
+def chunk_key(text: str) -> bytes:
+    """Digest of the text after NFC normalisation and whitespace collapsing."""
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+class EmbeddingCache:
+    """Append-only ``(digest, vector)`` rows for one embedding model."""
+
+    def __init__(self, model_id: str, dim: int, root: str = DEFAULT_CACHE_DIR):
+        require_numpy()
+        self.model_id = model_id
+        self.dim = dim
+        self.path = os.path.join(root, re.sub(r"[^\w.-]+", "_", model_id))
+        os.makedirs(self.path, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._keys_path = os.path.join(self.path, "keys.bin")
+        self._vectors_path = os.path.join(self.path, "vectors.bin")
+        self.rows: Dict[bytes, int] = {}
+        self._load()
+        self._mapped: Any = None
+
+    def _load(self) -> None:
+        row_bytes = self.dim * 4
+        keys = open(self._keys_path, "rb").read() if os.path.exists(self._keys_path) else b""
+        vector_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+        count = min(len(keys) // KEY_BYTES, vector_rows)
+        # Drop a torn tail left by an interrupted append
+        for name, size in ((self._keys_path, count * KEY_BYTES), (self._vectors_path, count * row_bytes)):
+            if os.path.exists(name) and os.path.getsize(name) != size:
+                with open(name, "r+b") as f:
+                    f.truncate(size)
+        self.rows = {keys[i * KEY_BYTES:(i + 1) * KEY_BYTES]: i for i in range(count)}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _vectors(self) -> Any:
+        """The mapped vector file, remapped when rows were appended since."""
+        if self._mapped is None or len(self._mapped) < len(self.rows):
+            self._mapped = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(len(self.rows), self.dim))
+        return self._mapped
+
+    def lookup(self, keys: Sequence[bytes]) -> Tuple[Any, List[int]]:
+        """Vectors for ``keys`` (zero rows where missing) and the positions of the misses."""
+        out = np.zeros((len(keys), self.dim), dtype=np.float32)
+        found, rows, missing = [], [], []
+        for i, key in enumerate(keys):
+            row = self.rows.get(key)
+            if row is None:
+                missing.append(i)
+            else:
+                found.append(i)
+                rows.append(row)
+        if rows:
+            order = np.argsort(rows)  # read the mapped file front to back
+            out[np.asarray(found)[order]] = self._vectors()[np.asarray(rows)[order]]
+        return out, missing
+
+    def fill(self, keys: Sequence[bytes], vectors: Any) -> None:
+        """Append the rows of keys not cached yet (duplicates in the batch are stored once)."""
+        new: Dict[bytes, int] = {}
+        for i, key in enumerate(keys):
+            if key not in self.rows and key not in new:
+                new[key] = i
+        if not new:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with open(self._vectors_path, "ab") as f:
+            vectors[list(new.values())].tofile(f)
+        with open(self._keys_path, "ab") as f:
+            f.write(b"".join(new))
+        for key in new:
+            self.rows[key] = len(self.rows)
+
+    def embed(self, texts: Sequence[str], embedder: Any) -> Any:
+        """Embed ``texts``, calling ``embedder`` only for the ones not in the cache."""
+        keys = [chunk_key(text) for text in texts]
+        vectors, missing = self.lookup(keys)
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            computed = embedder.embed([texts[i] for i in missing])
+            vectors[missing] = computed
+            self.fill([keys[i] for i in missing], computed)
+        return vectors
+
+
+class CachedEmbedder:
+    """An embedder wrapped with an ``EmbeddingCache``; same ``model_id``, ``dim`` and ``embed``."""
+
+    def __init__(self, embedder: Any, root: str = DEFAULT_CACHE_DIR):
+        self.embedder = embedder
+        self.model_id = embedder.model_id
+        self.dim = embedder.dim
+        self.cache = EmbeddingCache(embedder.model_id, embedder.dim, root)
+
+    def embed(self, texts: Sequence[str]) -> Any:
+        return self.cache.embed(texts, self.embedder)
@@ -0,0 +1,105 @@
+"""Text embedders for the dense retriever.
+
+An embedder is any object with a ``model_id`` string, a ``dim`` and an
+``embed(texts) -> float32 array of shape (len(texts), dim)`` method
+returning L2-normalised rows. Two are provided:
+
+* ``HashingEmbedder`` - no model download and no dependency beyond NumPy.
+  It hashes the character 3-5-grams and words of the Arabic-normalised
+  text into ``dim`` signed buckets. It captures spelling variants and shared
+  stems ("باقات" / "باقة", "wifi" / "wi-fi"), not paraphrases,
+* ``SentenceTransformerEmbedder`` - any ``sentence-transformers`` model
+  (e.g. ``paraphrase-multilingual-MiniLM-L12-v2``) when that package is
+  installed.
+
+``load_embedder("hash")`` or ``load_embedder("<model name>")`` picks one.
+"""
+
+import math
+import zlib
+from collections import Counter
+from typing import Any, Dict, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # only needed for dense retrieval
+    np = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+from .text import normalize_arabic
+from .units import normalize_digits
+
+HASH_DIM = 384
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise ImportError("Dense retrieval needs NumPy: pip install numpy")
+
+
+class HashingEmbedder:
+    """Signed feature hashing of words and their character n-grams, sublinear word tf."""
+
+    def __init__(self, dim: int = HASH_DIM, ngrams: Sequence[int] = (3, 4, 5)):
+        require_numpy()
+        self.dim = dim
+        self.ngrams = tuple(ngrams)
+        self.model_id = f"hash-char{''.join(map(str, self.ngrams))}-{dim}"
+        # word -> (buckets, signs) of the word and its n-grams; the portal's vocabulary is small
+        self._words: Dict[str, Tuple[Any, Any]] = {}
+
+    def _hash_word(self, word: str) -> Tuple[Any, Any]:
+        padded = f"<{word}>"
+        features = [f"w:{word}"]
+        for n in self.ngrams:
+            features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        hashes = np.array([zlib.crc32(feature.encode("utf-8")) for feature in features], dtype=np.uint32)
+        signs = np.where(hashes & 0x80000000, 1.0, -1.0)
+        return (hashes % self.dim).astype(np.intp), signs
+
+    def embed(self, texts: Sequence[str]) -> Any:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = Counter(normalize_arabic(normalize_digits(text)).lower().split())
+            if not counts:
+                continue
+            indices, weights = [], []
+            for word, count in counts.items():
+                hashed = self._words.get(word)
+                if hashed is None:
+                    hashed = self._words[word] = self._hash_word(word)
+                indices.append(hashed[0])
+                weights.append(hashed[1] * (1.0 + math.log(count)))
+            matrix[row] = np.bincount(np.concatenate(indices), np.concatenate(weights), minlength=self.dim)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class SentenceTransformerEmbedder:
+    """Wrapper around a ``sentence-transformers`` model."""
+
+    def __init__(self, name: str, batch_size: int = 64):
+        require_numpy()
+        if SentenceTransformer is None:
+            raise ImportError(f"{name} needs sentence-transformers: pip install sentence-transformers")
+        self.model = SentenceTransformer(name, device="cpu")
+        self.model_id = name
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.batch_size = batch_size
+
+    def embed(self, texts: Sequence[str]) -> Any:
+        vectors = self.model.encode(list(texts), batch_size=self.batch_size, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def load_embedder(name: str = "hash") -> Any:
+    """``"hash"`` (or ``"hash-<dim>"``) for the built-in embedder, else a sentence-transformers model."""
+    if name == "hash" or name.startswith("hash-"):
+        dim = int(name.rsplit("-", 1)[1]) if name.rsplit("-", 1)[-1].isdigit() else HASH_DIM
+        return HashingEmbedder(dim)
+    return SentenceTransformerEmbedder(name)
@@ -0,0 +1,201 @@
+"""Hybrid retrieval cascade: BM25 + dense candidates, rank fusion, rerank.
+
+Exact tokens ("ترافلر 450", "1919", "7070") are what BM25 is good at;
+paraphrases and spelling variants are what the dense index is good at.
+``HybridRetriever`` runs three stages, each with a latency budget:
+
+1. candidate generation - the top ``candidates`` of the BM25 index and of
+   the dense index (both built over the same chunk rows, so row ids agree),
+2. reciprocal-rank fusion - ``sum(1 / (rrf_k + rank))`` over both lists,
+   which needs no score calibration between the two retrievers,
+3. rerank - an optional query/chunk pair scorer applied to the fused top
+   ``rerank_top`` only, in small batches, stopping when its budget is spent
+   or when the earlier stages already used up theirs.
+
+Reranker scores are not on a common scale (the pair scorer gives 0-4, a
+cross-encoder unbounded logits), so each reranker maps its scores to 0-1
+with ``normalize`` before its ``fusion_weight`` times the fused position
+is added. Rows the reranker did not reach keep their fused order below
+the reranked ones, so a slow reranker can only delay the answer by its
+own budget::
+
+    retriever = HybridRetriever.from_dense(DenseIndex.open())
+    result = retriever.search("سعر ترافلر 450", k=5)
+    result["hits"], result["timings"]
+"""
+
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .bm25 import BM25Index
+from .text import tokenize
+
+try:
+    from sentence_transformers import CrossEncoder
+except ImportError:
+    CrossEncoder = None
+
+RRF_K = 60
+CANDIDATES = 50
+RERANK_TOP = 20
+RERANK_BATCH = 5
+BUDGET_MS = {"lexical": 20.0, "dense": 30.0, "rerank": 25.0}
+# Bonus for the fused position (1 for the top candidate, falling linearly) added to the
+# normalised reranker score; rerankers may override it with their own ``fusion_weight``
+FUSION_WEIGHT = 0.75
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = RRF_K) -> List[tuple]:
+    """``(row, fused score)`` pairs, best first, from several ranked row lists."""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused.items(), key=lambda item: -item[1])
+
+
+class PairReranker:
+    """Cheap query/chunk pair scorer in the spirit of a cross-encoder.
+
+    It looks at the query and the chunk together: the share of query terms
+    present, exact numbers ("450", "1919"), the longest run of query terms
+    appearing in order, terms found in the chunk's section label, and how
+    dense the matches are (a short chunk about the query beats a long page
+    that mentions it once). Coverage, numbers and density count up to 1
+    each, the run and the section up to 0.5, so scores lie in 0-4.
+    """
+
+    MAX_SCORE = 4.0
+    fusion_weight = FUSION_WEIGHT
+
+    def normalize(self, scores: Sequence[float]) -> List[float]:
+        return [score / self.MAX_SCORE for score in scores]
+
+    def score(self, query: str, docs: Sequence[Dict[str, Any]]) -> List[float]:
+        terms = tokenize(query)
+        if not terms:
+            return [0.0] * len(docs)
+        query_terms = set(terms)
+        numbers = {t for t in query_terms if t.isdigit()}
+        scores = []
+        for doc in docs:
+            section = tokenize(doc.get("section", "") or "")
+            words = section + tokenize(doc["text"])
+            present = set(words)
+            coverage = sum(1 for t in terms if t in present) / len(terms)
+            number_hits = sum(1 for n in numbers if n in present) / len(numbers) if numbers else 0.0
+            section_hits = sum(1 for t in terms if t in section) / len(terms)
+            density = sum(1 for w in words if w in query_terms) / len(words) if words else 0.0
+            scores.append(coverage + number_hits + 0.5 * self._run(terms, words) / len(terms)
+                          + 0.5 * section_hits + density)
+        return scores
+
+    @staticmethod
+    def _run(terms: List[str], words: List[str]) -> int:
+        """Length of the longest run of consecutive query terms found consecutively in the chunk."""
+        positions: Dict[str, List[int]] = {}
+        for i, word in enumerate(words):
+            positions.setdefault(word, []).append(i)
+        best = 0
+        for start in range(len(terms)):
+            for pos in positions.get(terms[start], []):
+                length = 1
+                while (start + length < len(terms) and pos + length < len(words)
+                       and words[pos + length] == terms[start + length]):
+                    length += 1
+                best = max(best, length)
+        return best
+
+
+class CrossEncoderReranker:
+    """A ``sentence-transformers`` cross-encoder (e.g. a multilingual MS MARCO model).
+
+    Its scores are logits; ``normalize`` squashes them with a sigmoid.
+    """
+
+    def __init__(self, name: str, fusion_weight: float = FUSION_WEIGHT):
+        if CrossEncoder is None:
+            raise ImportError(f"{name} needs sentence-transformers: pip install sentence-transformers")
+        self.model = CrossEncoder(name, device="cpu")
+        self.fusion_weight = fusion_weight
+
+    def normalize(self, scores: Sequence[float]) -> List[float]:
+        return [1 / (1 + math.exp(-min(max(score, -50.0), 50.0))) for score in scores]
+
+    def score(self, query: str, docs: Sequence[Dict[str, Any]]) -> List[float]:
+        return [float(s) for s in self.model.predict([(query, doc["text"]) for doc in docs])]
+
+
+class HybridRetriever:
+    """Lexical + dense candidates, reciprocal-rank fusion and a budgeted rerank.
+
+    ``lexical`` is a ``BM25Index`` or a ``MappedBM25Index`` over the rows of ``dense``.
+    A ``reranker`` has ``score``, ``normalize`` (scores to 0-1) and ``fusion_weight``.
+    """
+
+    def __init__(self, lexical: Any, dense: Any, reranker: Any = None,
+                 budgets: Optional[Dict[str, float]] = None, candidates: int = CANDIDATES,
+                 rerank_top: int = RERANK_TOP, rrf_k: int = RRF_K):
+        if len(lexical) != len(dense):
+            raise ValueError(f"Lexical ({len(lexical)}) and dense ({len(dense)}) indexes cover different rows")
+        self.lexical = lexical
+        self.dense = dense
+        self.reranker = reranker
+        self.budgets = dict(BUDGET_MS, **(budgets or {}))
+        self.candidates = candidates
+        self.rerank_top = rerank_top
+        self.rrf_k = rrf_k
+
+    @classmethod
+    def from_dense(cls, dense: Any, **options: Any) -> "HybridRetriever":
+        """Build the BM25 side from the dense index's own rows so the row ids line up."""
+        lexical = BM25Index()
+        for row in range(len(dense)):
+            lexical.add(dense.doc(row)["text"])
+        return cls(lexical, dense, **options)
+
+    def search(self, query: str, k: int = 5, rerank: Optional[bool] = None,
+               clock: Callable[[], float] = time.perf_counter) -> Dict[str, Any]:
+        """Top ``k`` chunks for a query.
+
+        Returns ``{"hits": [...], "timings": {stage: ms}, "reranked": n}``;
+        each hit carries its fused score, its BM25/dense ranks and, when
+        reranked, the normalised reranker score plus its weighted fused position.
+        """
+        timings: Dict[str, float] = {}
+        start = clock()
+        lexical = [hit["id"] for hit in self.lexical.search(query, self.candidates)]
+        timings["lexical"] = (clock() - start) * 1000
+
+        start = clock()
+        dense = [hit["id"] for hit in self.dense.search(query, self.candidates)]
+        timings["dense"] = (clock() - start) * 1000
+
+        start = clock()
+        fused = reciprocal_rank_fusion([lexical, dense], self.rrf_k)
+        timings["fusion"] = (clock() - start) * 1000
+
+        lexical_rank = {row: rank + 1 for rank, row in enumerate(lexical)}
+        dense_rank = {row: rank + 1 for rank, row in enumerate(dense)}
+        pool = fused[:max(k, self.rerank_top)]
+        hits = [dict(self.dense.doc(row), id=row, fused=round(score, 5),
+                     lexical_rank=lexical_rank.get(row), dense_rank=dense_rank.get(row))
+                for row, score in pool]
+
+        reranked = 0
+        use_reranker = self.reranker is not None if rerank is None else rerank and self.reranker is not None
+        spent = timings["lexical"] + timings["dense"]
+        if use_reranker and spent <= self.budgets["lexical"] + self.budgets["dense"]:
+            start = clock()
+            top = hits[:self.rerank_top]
+            while reranked < len(top) and (clock() - start) * 1000 < self.budgets["rerank"]:
+                batch = top[reranked:reranked + RERANK_BATCH]
+                scores = self.reranker.normalize(self.reranker.score(query, batch))
+                for position, (hit, score) in enumerate(zip(batch, scores), reranked):
+                    hit["rerank"] = round(score + self.reranker.fusion_weight * (1 - position / len(top)), 4)
+                reranked += len(batch)
+            head = sorted(hits[:reranked], key=lambda hit: -hit["rerank"])
+            hits = head + hits[reranked:]
+            timings["rerank"] = (clock() - start) * 1000
+        return {"hits": hits[:k], "timings": {s: round(ms, 3) for s, ms in timings.items()}, "reranked": reranked}
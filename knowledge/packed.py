@@ -0,0 +1,203 @@
+"""Read-only, page-aligned index files that worker processes map instead of load.
+
+With several server workers, every structure loaded into Python objects
+is paid once per worker. The dense index and the knowledge base are
+already plain files: ``vectors.bin`` / ``docs.jsonl`` are mapped, and
+SQLite reads ``knowledge.db`` through ``mmap`` (see ``KnowledgeBase``).
+The one structure still rebuilt in every worker was the BM25 index: its
+postings, doc lengths and dictionary.
+
+A pack file holds named arrays, each starting on a page boundary::
+
+    magic "KBPACK01" | header length | JSON header (sections, metadata)
+    padding to 4096
+    section 0 ... padding ... section 1 ... padding ...
+
+``open_pack`` maps the file once and returns zero-copy NumPy views of the
+sections, so the OS page cache keeps a single copy for all workers and
+opening costs no more than parsing the small header. ``MappedBM25Index``
+is the BM25 index in this format: terms sorted as UTF-8 bytes and looked
+up by binary search, postings as flat ``uint32`` arrays addressed by
+per-term start offsets, and scoring vectorised over the mapped postings.
+Snapshots (``snapshot.py``) and segments (``segments.py``) store their
+lexical index this way::
+
+    pack_bm25(index, "knowledge/snapshots/v000003/lexical.pack")
+    lexical = MappedBM25Index("knowledge/snapshots/v000003/lexical.pack")
+    lexical.search("سوبر سلفني", k=5)
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Any, Container, Dict, List, Optional, Tuple
+
+from .bm25 import BM25Index
+from .embeddings import np, require_numpy
+from .text import tokenize
+
+PAGE = 4096
+_MAGIC = b"KBPACK01"
+
+
+def _pad(f: Any) -> int:
+    """Pad the file to the next page boundary and return the new offset."""
+    offset = f.tell()
+    if offset % PAGE:
+        f.write(b"\0" * (PAGE - offset % PAGE))
+    return f.tell()
+
+
+def write_pack(path: str, arrays: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> None:
+    """Write ``arrays`` page-aligned after a JSON header; replaced atomically."""
+    require_numpy()
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    # Offsets depend on the header size, so lay the sections out against a header of fixed page count
+    sections: Dict[str, List[Any]] = {}
+    header_pages = 1
+    while True:
+        offset = header_pages * PAGE
+        for name, array in arrays.items():
+            sections[name] = [offset, array.dtype.str, list(array.shape)]
+            offset += -(-array.nbytes // PAGE) * PAGE
+        header = json.dumps({"sections": sections, "meta": meta or {}}, ensure_ascii=False).encode("utf-8")
+        if len(_MAGIC) + 8 + len(header) <= header_pages * PAGE:
+            break
+        header_pages += 1
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC + struct.pack("<Q", len(header)) + header)
+        for name, array in arrays.items():
+            if _pad(f) != sections[name][0]:
+                raise AssertionError(f"section {name} misaligned")
+            array.tofile(f)
+        _pad(f)
+    os.replace(tmp, path)
+
+
+def open_pack(path: str) -> Tuple[Dict[str, Any], Dict[str, Any], mmap.mmap]:
+    """Map a pack file: (zero-copy arrays by name, metadata, the mapping)."""
+    require_numpy()
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:len(_MAGIC)] != _MAGIC:
+        mapped.close()
+        raise ValueError(f"{path} is not a pack file")
+    (size,) = struct.unpack("<Q", mapped[len(_MAGIC):len(_MAGIC) + 8])
+    header = json.loads(mapped[len(_MAGIC) + 8:len(_MAGIC) + 8 + size].decode("utf-8"))
+    arrays = {}
+    for name, (offset, dtype, shape) in header["sections"].items():
+        count = int(np.prod(shape)) if shape else 1
+        arrays[name] = np.frombuffer(mapped, dtype=np.dtype(dtype), count=count, offset=offset).reshape(shape)
+    return arrays, header["meta"], mapped
+
+
+def pack_bm25(index: BM25Index, path: str) -> None:
+    """Write a ``BM25Index`` as a pack file (row ids are kept; document metadata is not)."""
+    terms = sorted(index.postings, key=lambda term: term.encode("utf-8"))
+    encoded = [term.encode("utf-8") for term in terms]
+    term_offsets = np.zeros(len(terms) + 1, dtype=np.uint64)
+    term_offsets[1:] = np.cumsum([len(term) for term in encoded], dtype=np.uint64)
+    starts = np.zeros(len(terms) + 1, dtype=np.uint64)
+    starts[1:] = np.cumsum([len(index.postings[term][0]) for term in terms], dtype=np.uint64)
+    ids = np.concatenate([np.frombuffer(index.postings[t][0], dtype=np.uint32) for t in terms] or [np.zeros(0, np.uint32)])
+    tfs = np.concatenate([np.frombuffer(index.postings[t][1], dtype=np.uint32) for t in terms] or [np.zeros(0, np.uint32)])
+    write_pack(path, {
+        "lengths": np.frombuffer(index.doc_lengths, dtype=np.uint32),
+        "terms": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "term_offsets": term_offsets,
+        "starts": starts,
+        "ids": ids,
+        "tfs": tfs,
+    }, {"k1": index.k1, "b": index.b, "docs": len(index), "total_length": index.total_length})
+
+
+class MappedBM25Index:
+    """BM25 over a mapped pack file; same ``search``/``idf``/``df`` as ``BM25Index``.
+
+    Hits carry only ``id`` and ``score``: the row metadata lives in the
+    dense index's ``docs.jsonl``, which uses the same row ids.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        arrays, meta, self._mapped = open_pack(path)
+        self.k1 = meta["k1"]
+        self.b = meta["b"]
+        self.total_length = meta["total_length"]
+        self._n = meta["docs"]
+        self.lengths = arrays["lengths"]
+        self._terms = arrays["terms"]
+        self._term_offsets = arrays["term_offsets"]
+        self._starts = arrays["starts"]
+        self._ids = arrays["ids"]
+        self._tfs = arrays["tfs"]
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def average(self) -> float:
+        return self.total_length / self._n if self._n else 1.0
+
+    def _term(self, i: int) -> bytes:
+        return self._terms[int(self._term_offsets[i]):int(self._term_offsets[i + 1])].tobytes()
+
+    def _lookup(self, term: str) -> Optional[int]:
+        key = term.encode("utf-8")
+        low, high = 0, len(self._term_offsets) - 1
+        while low < high:
+            mid = (low + high) // 2
+            if self._term(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low if low < len(self._term_offsets) - 1 and self._term(low) == key else None
+
+    def _posting(self, term: str) -> Optional[Tuple[Any, Any]]:
+        i = self._lookup(term)
+        if i is None:
+            return None
+        start, end = int(self._starts[i]), int(self._starts[i + 1])
+        return self._ids[start:end], self._tfs[start:end]
+
+    def df(self, term: str) -> int:
+        i = self._lookup(term)
+        return 0 if i is None else int(self._starts[i + 1] - self._starts[i])
+
+    def idf(self, term: str) -> float:
+        df = self.df(term)
+        return float(np.log(1 + (self._n - df + 0.5) / (df + 0.5)))
+
+    def search(self, query: str, k: int = 10, exclude: Container[int] = (),
+               stats: Optional[Any] = None) -> List[Dict[str, Any]]:
+        if not self._n:
+            return []
+        stats = stats or self
+        average = stats.average or 1.0
+        k1, b = self.k1, self.b
+        scores = np.zeros(self._n, dtype=np.float64)  # same precision as BM25Index, so ties agree
+        for term in set(tokenize(query)):
+            posting = self._posting(term)
+            if posting is None:
+                continue
+            ids, tfs = posting[0], posting[1].astype(np.float64)
+            norm = k1 * (1 - b + b * self.lengths[ids] / average)
+            scores[ids] += stats.idf(term) * tfs * (k1 + 1) / (tfs + norm)  # ids are unique within a posting
+        if exclude:
+            scores[np.fromiter(exclude, dtype=np.int64)] = 0.0
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > k:
+            # Keep every row tying with the k-th score, then break ties by id like BM25Index
+            kth = np.partition(-scores[matched], k - 1)[k - 1]
+            matched = matched[-scores[matched] <= kth]
+        best = matched[np.lexsort((matched, -scores[matched]))][:k]
+        return [{"id": int(i), "score": round(float(scores[i]), 4)} for i in best]
+
+    def close(self) -> None:
+        self.lengths = self._terms = self._term_offsets = self._starts = self._ids = self._tfs = None
+        try:
+            self._mapped.close()
+        except BufferError:  # a view handed out by search is still alive; the GC unmaps it later
+            pass
@@ -0,0 +1,153 @@
+"""Compressed codes for the dense index: int8 scalar and product quantization.
+
+A float32 row of the dense index costs ``4 * dim`` bytes in every worker
+that scans it. Both quantizers here store a row in far fewer bytes and
+score queries against the codes directly (asymmetric distance: the query
+stays float32, only the corpus is compressed):
+
+* ``ScalarQuantizer`` - one signed byte per dimension with a per-dimension
+  scale (4x smaller). A query is scored as ``codes @ (query * scale)``.
+* ``ProductQuantizer`` - the vector is cut into ``m`` sub-vectors and each
+  is replaced by the id of its nearest of 256 k-means centroids, so a row is
+  ``m`` bytes (16x smaller for 384d with ``m=96``). A query becomes an
+  ``(m, 256)`` table of sub-vector dot products, and a row's score is the
+  sum of ``m`` table lookups.
+
+``DenseIndex.quantize`` writes the codes next to ``vectors.bin``. The
+float rows are then only read to rerank the best candidates exactly
+(``rerank`` in ``DenseIndex.search``).
+"""
+
+from typing import Any, Dict
+
+from .embeddings import np, require_numpy
+
+PQ_CENTROIDS = 256
+PQ_ITERATIONS = 12
+PQ_TRAIN_ROWS = 8192
+PQ_BATCH = 1024
+
+
+class ScalarQuantizer:
+    """Symmetric per-dimension int8 quantization."""
+
+    kind = "int8"
+    code_dtype = "int8"
+
+    def __init__(self, scale: Any = None):
+        require_numpy()
+        self.scale = scale
+
+    def fit(self, vectors: Any) -> "ScalarQuantizer":
+        peak = np.abs(np.asarray(vectors, dtype=np.float32)).max(axis=0)
+        peak[peak == 0] = 1.0
+        self.scale = (peak / 127.0).astype(np.float32)
+        return self
+
+    def code_size(self, dim: int) -> int:
+        return dim
+
+    def encode(self, vectors: Any) -> Any:
+        codes = np.rint(np.asarray(vectors, dtype=np.float32) / self.scale)
+        return np.clip(codes, -127, 127).astype(np.int8)
+
+    def decode(self, codes: Any) -> Any:
+        return codes.astype(np.float32) * self.scale
+
+    def prepare(self, queries: Any) -> Any:
+        """Per-query state reused for every block of codes."""
+        return (np.asarray(queries, dtype=np.float32) * self.scale).T
+
+    def scores(self, prepared: Any, codes: Any) -> Any:
+        """Approximate dot products, shape (queries, rows of ``codes``)."""
+        return (codes.astype(np.float32) @ prepared).T
+
+    def params(self) -> Dict[str, Any]:
+        return {"scale": self.scale}
+
+
+class ProductQuantizer:
+    """``m`` sub-spaces with up to 256 k-means centroids each, one byte per sub-space."""
+
+    kind = "pq"
+    code_dtype = "uint8"
+
+    def __init__(self, m: int = 0, centroids: Any = None):
+        require_numpy()
+        self.m = m if centroids is None else centroids.shape[0]
+        self.centroids = centroids  # (m, ksub, dsub)
+
+    def code_size(self, dim: int) -> int:
+        return self.m
+
+    def _split(self, vectors: Any) -> Any:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return vectors.reshape(len(vectors), self.m, -1)
+
+    def _assign(self, parts: Any) -> Any:
+        # argmin ||x - c||^2 == argmax (x.c - |c|^2 / 2), one batched matmul over the sub-spaces
+        dots = np.matmul(parts.transpose(1, 0, 2), self.centroids.transpose(0, 2, 1))
+        dots -= 0.5 * (self.centroids ** 2).sum(axis=2)[:, None, :]
+        return dots.argmax(axis=2).T.astype(np.uint8)
+
+    def fit(self, vectors: Any, iterations: int = PQ_ITERATIONS, seed: int = 0) -> "ProductQuantizer":
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1]
+        if not self.m:
+            self.m = max(1, dim // 4)
+        if dim % self.m:
+            raise ValueError(f"dim {dim} is not divisible by m={self.m}")
+        rng = np.random.default_rng(seed)
+        if len(vectors) > PQ_TRAIN_ROWS:
+            vectors = vectors[rng.choice(len(vectors), PQ_TRAIN_ROWS, replace=False)]
+        parts = self._split(vectors)
+        ksub = min(PQ_CENTROIDS, len(vectors))
+        self.centroids = parts[rng.choice(len(vectors), ksub, replace=False)].transpose(1, 0, 2).copy()
+        dsub = parts.shape[2]
+        # sub-space s, centroid c -> flat slot s * ksub + c, so one bincount updates every sub-space
+        offsets = (np.arange(self.m) * ksub)[None, :]
+        for _ in range(iterations):
+            slots = (self.encode(vectors).astype(np.intp) + offsets).ravel()
+            counts = np.bincount(slots, minlength=self.m * ksub).reshape(self.m, ksub)
+            for d in range(dsub):
+                sums = np.bincount(slots, parts[:, :, d].ravel(), minlength=self.m * ksub).reshape(self.m, ksub)
+                filled = counts > 0
+                self.centroids[:, :, d][filled] = sums[filled] / counts[filled]
+        return self
+
+    def encode(self, vectors: Any, batch: int = PQ_BATCH) -> Any:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return np.concatenate([self._assign(self._split(vectors[i:i + batch]))
+                               for i in range(0, len(vectors), batch)] or [np.zeros((0, self.m), np.uint8)])
+
+    def decode(self, codes: Any) -> Any:
+        parts = self.centroids[np.arange(self.m)[None, :], codes.astype(np.intp)]
+        return parts.reshape(len(codes), -1)
+
+    def prepare(self, queries: Any) -> Any:
+        """Queries plus their flattened (m * ksub) tables of sub-vector dot products."""
+        queries = np.asarray(queries, dtype=np.float32)
+        tables = np.matmul(self._split(queries).transpose(1, 0, 2), self.centroids.transpose(0, 2, 1))
+        return queries, tables.transpose(1, 0, 2).reshape(len(queries), -1)
+
+    def scores(self, prepared: Any, codes: Any) -> Any:
+        queries, tables = prepared
+        if len(queries) > self.centroids.shape[2]:
+            # Many queries: decoding the block once and multiplying is cheaper than per-query lookups
+            return queries @ self.decode(codes).T
+        slots = codes.astype(np.intp) + (np.arange(self.m) * self.centroids.shape[1])[None, :]
+        return np.stack([table[slots].sum(axis=1) for table in tables])
+
+    def params(self) -> Dict[str, Any]:
+        return {"centroids": self.centroids}
+
+
+QUANTIZERS = {"int8": ScalarQuantizer, "pq": ProductQuantizer}
+
+
+def load_quantizer(kind: str, params: Dict[str, Any]) -> Any:
+    if kind == "int8":
+        return ScalarQuantizer(params["scale"])
+    if kind == "pq":
+        return ProductQuantizer(centroids=params["centroids"])
+    raise ValueError(f"Unknown quantizer {kind!r}")
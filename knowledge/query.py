@@ -0,0 +1,172 @@
+"""Exact plan filtering, ranking and comparison over presorted columns.
+
+Questions such as "cheapest monthly plan with at least 20 GB" or "compare
+Hekaya vs Emerald" have exact answers in the knowledge base. ``PlanIndex``
+loads the plans once and keeps, for every numeric column, the row ids
+sorted by value. A range filter is a ``bisect`` on the narrowest column
+followed by a check of the remaining conditions on that slice, and top-k
+rankings walk a presorted column until ``k`` rows pass the filters::
+
+    index = PlanIndex.load()
+    index.filter(data_mb=(20 * 1024, None), validity_days=(30, 30))
+    index.top_k("price_per_gb", 5, price_egp=(None, 300))
+    index.compare(["Hekaya", "Emerald"])
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .sources import clean_text
+from .store import DEFAULT_DB, KnowledgeBase
+
+NUMERIC_COLUMNS = ["price_egp", "data_mb", "minutes_count", "units_count", "validity_days", "price_per_gb"]
+
+# English / Franco names customers use for the Arabic plan families
+FAMILY_ALIASES = {
+    "hekaya": "حكاية",
+    "hekaia": "حكاية",
+    "emerald": "Emerald",
+    "demagh tanya": "دماغ تانية",
+    "demagh": "دماغ تانية",
+    "traveler": "ترافلر",
+    "traveller": "ترافلر",
+    "akwa kart": "اقوي كارت",
+    "el kart": "اقوي كارت",
+    "dsl": "eHome DSL",
+    "ehome": "eHome DSL",
+    "data packages": "باقات الداتا",
+}
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+class PlanIndex:
+    """All plans plus one sorted index per numeric column."""
+
+    def __init__(self, plans: List[Dict[str, Any]]):
+        self.plans = plans
+        for plan in plans:
+            if plan.get("price_egp") and plan.get("data_mb"):
+                plan["price_per_gb"] = round(plan["price_egp"] / (plan["data_mb"] / 1024), 4)
+            else:
+                plan["price_per_gb"] = None
+
+        # column -> (sorted values, row ids in the same order); rows without a value are left out
+        self.columns: Dict[str, Tuple[List[float], List[int]]] = {}
+        for column in NUMERIC_COLUMNS:
+            pairs = sorted((plan[column], i) for i, plan in enumerate(plans) if plan.get(column) is not None)
+            self.columns[column] = ([v for v, _ in pairs], [i for _, i in pairs])
+
+        self.by_family: Dict[str, List[int]] = {}
+        self.by_name: Dict[str, int] = {}
+        for i, plan in enumerate(plans):
+            self.by_family.setdefault(plan["family"], []).append(i)
+            self.by_name.setdefault(plan["name"].lower(), i)
+
+    @classmethod
+    def load(cls, db_path: str = DEFAULT_DB) -> "PlanIndex":
+        return cls(KnowledgeBase(db_path).plans())
+
+    # -- filtering ------------------------------------------------------------
+
+    def _slice(self, column: str, bounds: Range) -> List[int]:
+        values, rows = self.columns[column]
+        low, high = bounds
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return rows[start:end]
+
+    def _check_columns(self, columns: Iterable[str]) -> None:
+        unknown = [column for column in columns if column not in self.columns]
+        if unknown:
+            raise KeyError(f"Unknown columns: {', '.join(unknown)}")
+
+    def _matches(self, plan: Dict[str, Any], family: Optional[str], ranges: Dict[str, Range]) -> bool:
+        if family is not None and plan["family"] != family:
+            return False
+        for column, (low, high) in ranges.items():
+            value = plan.get(column)
+            if value is None or (low is not None and value < low) or (high is not None and value > high):
+                return False
+        return True
+
+    def resolve_family(self, name: str) -> Optional[str]:
+        """Family for an Arabic or English name ("Hekaya" -> "حكاية")."""
+        if name in self.by_family:
+            return name
+        key = clean_text(name).lower()
+        family = FAMILY_ALIASES.get(key)
+        if family in self.by_family:
+            return family
+        for existing in self.by_family:
+            if existing.lower() == key:
+                return existing
+        return None
+
+    def filter(self, family: Optional[str] = None, **ranges: Range) -> List[Dict[str, Any]]:
+        """Plans whose columns fall in every ``column=(low, high)`` range.
+
+        ``None`` leaves a bound open. Results come back in the order of the
+        narrowest column used.
+        """
+        self._check_columns(ranges)
+        if family is not None:
+            family = self.resolve_family(family) or family
+
+        if ranges:
+            # Start from the narrowest slice; the other ranges are checked per row
+            candidates = min((self._slice(c, b) for c, b in ranges.items()), key=len)
+        elif family is not None:
+            candidates = self.by_family.get(family, [])
+        else:
+            candidates = range(len(self.plans))
+        return [self.plans[i] for i in candidates if self._matches(self.plans[i], family, ranges)]
+
+    def top_k(self, column: str, k: int = 5, descending: bool = False,
+              family: Optional[str] = None, **ranges: Range) -> List[Dict[str, Any]]:
+        """The ``k`` plans with the lowest (or highest) ``column`` that pass the filters."""
+        self._check_columns([column, *ranges])
+        if family is not None:
+            family = self.resolve_family(family) or family
+        _, rows = self.columns[column]
+        found = []
+        for i in (reversed(rows) if descending else rows):
+            if self._matches(self.plans[i], family, ranges):
+                found.append(self.plans[i])
+                if len(found) == k:
+                    break
+        return found
+
+    def cheapest(self, **filters: Any) -> Optional[Dict[str, Any]]:
+        found = self.top_k("price_egp", 1, **filters)
+        return found[0] if found else None
+
+    # -- comparison -----------------------------------------------------------
+
+    def find(self, name: str) -> List[Dict[str, Any]]:
+        """Plans for a plan name or a family name."""
+        i = self.by_name.get(clean_text(name).lower())
+        if i is not None:
+            return [self.plans[i]]
+        family = self.resolve_family(name)
+        return [self.plans[i] for i in self.by_family.get(family, [])] if family else []
+
+    def compare(self, names: Iterable[str],
+                columns: Iterable[str] = ("price_egp", "data_mb", "minutes_count", "units_count",
+                                          "validity_days", "price_per_gb")) -> Dict[str, Any]:
+        """Side-by-side table of plans or whole families.
+
+        Returns ``{"columns": [...], "rows": [...], "missing": [...]}``; each
+        row holds the plan name, family and the requested columns.
+        """
+        columns = list(columns)
+        rows, missing = [], []
+        for name in names:
+            plans = self.find(name)
+            if not plans:
+                missing.append(name)
+            for plan in plans:
+                row = {"name": plan["name"], "family": plan["family"]}
+                row.update({column: plan.get(column) for column in columns})
+                rows.append(row)
+        return {"columns": ["name", "family"] + columns, "rows": rows, "missing": missing}
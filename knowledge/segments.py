@@ -0,0 +1,327 @@
+"""Incremental lexical + dense indexes made of immutable segments.
+
+Rebuilding the whole index because ``e&_international_calls.json``
+changed costs as much as the corpus is large. Here the index is a list of
+segments under ``knowledge/segments/``. Each segment is a directory holding
+a ``DenseIndex`` (vectors, docs) and a packed BM25 index (``lexical.pack``) over
+the same rows, and is never modified once written. ``manifest.json`` lists
+the live segments and, per segment, the tombstoned rows.
+
+``update(chunks)`` takes the new chunks of one or more sources:
+
+* rows of those sources whose text is unchanged are kept as they are,
+* rows whose text disappeared are tombstoned,
+* new or edited chunks go into one small fresh segment (embedded through
+  the embedding cache, so only they reach the model).
+
+The cost of an update therefore follows the size of the change, not of
+the corpus. Every update adds a segment, so a merger compacts them under a
+tiered policy: once ``MERGE_FACTOR`` segments share a size tier (sizes
+within a factor ``MERGE_FACTOR`` of each other) they are rewritten as one,
+and a segment whose rows are more than ``MAX_DELETED`` tombstones is
+rewritten alone. A merge copies only live rows, and each row is merged
+O(log n) times over its life.
+
+Readers never lock: ``search`` takes the current ``(segments, tombstones)``
+state - one immutable tuple replaced by reference on every update or merge -
+and scores it while writers build the next one. Merges run on a background
+thread (``start_merger``) or inline (``merge_pending``)::
+
+    index = SegmentedIndex.open()
+    index.update(chunk_source("Suhaila/e&_international_calls.json"))
+    index.search("سعر الدقيقة زون 3", k=5)
+"""
+
+import json
+import math
+import os
+import shutil
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .bm25 import BM25Index, CorpusStats
+from .chunker import Chunk
+from .dense import DenseIndex, top_k
+from .embcache import CachedEmbedder, chunk_key
+from .embeddings import load_embedder, np
+from .hybrid import CANDIDATES, RRF_K, reciprocal_rank_fusion
+from .packed import MappedBM25Index, pack_bm25
+
+DEFAULT_SEGMENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "segments")
+MERGE_FACTOR = 4
+MIN_SEGMENT_ROWS = 64
+MAX_DELETED = 0.3
+
+
+class Segment:
+    """One immutable directory of rows: a dense index and a BM25 index over the same rows."""
+
+    def __init__(self, name: str, dense: DenseIndex, lexical: MappedBM25Index):
+        self.name = name
+        self.dense = dense
+        self.lexical = lexical
+
+    def __len__(self) -> int:
+        return len(self.dense)
+
+    @classmethod
+    def build(cls, root: str, name: str, chunks: Sequence[Chunk], embedder: Any) -> "Segment":
+        path = os.path.join(root, name)
+        dense = DenseIndex.build(chunks, embedder, path)
+        lexical = BM25Index()
+        for chunk in chunks:
+            lexical.add(chunk.text)
+        pack_bm25(lexical, os.path.join(path, "lexical.pack"))
+        return cls(name, dense, MappedBM25Index(os.path.join(path, "lexical.pack")))
+
+    @classmethod
+    def open(cls, root: str, name: str, embedder: Any) -> "Segment":
+        path = os.path.join(root, name)
+        return cls(name, DenseIndex.open(path, embedder), MappedBM25Index(os.path.join(path, "lexical.pack")))
+
+    def tier(self, live: int) -> int:
+        return int(math.log(max(live, MIN_SEGMENT_ROWS) / MIN_SEGMENT_ROWS, MERGE_FACTOR))
+
+
+class SegmentedIndex:
+    """Segments plus tombstones, updated by source and merged in the background."""
+
+    def __init__(self, root: str, embedder: Any, segments: List[Segment],
+                 tombstones: Dict[str, frozenset], next_id: int):
+        self.root = root
+        self.embedder = embedder
+        # Replaced as a whole, never mutated: readers just take a reference
+        self.state: Tuple[Tuple[Segment, ...], Dict[str, frozenset]] = (tuple(segments), tombstones)
+        self.next_id = next_id
+        self._lock = threading.Lock()  # one writer (update or merge commit) at a time
+        self._merging = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self._merger: Optional[threading.Thread] = None
+        # chunk hash -> (segment name, row, source) of every live row, and the hashes each source owns
+        self._live: Dict[bytes, Tuple[str, int, str]] = {}
+        self._by_source: Dict[str, Set[bytes]] = {}
+        for segment in segments:
+            self._register(segment, tombstones.get(segment.name, frozenset()))
+
+    # -- opening and persistence ----------------------------------------------
+
+    @classmethod
+    def open(cls, root: str = DEFAULT_SEGMENTS_DIR, model: str = "hash") -> "SegmentedIndex":
+        """Open the segments listed in ``manifest.json`` (an empty index if there is none)."""
+        manifest_path = os.path.join(root, "manifest.json")
+        manifest = {"model_id": None, "next": 1, "segments": []}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        embedder = CachedEmbedder(load_embedder(manifest["model_id"] or model))
+        segments = [Segment.open(root, entry["name"], embedder) for entry in manifest["segments"]]
+        tombstones = {entry["name"]: frozenset(entry["deleted"]) for entry in manifest["segments"]}
+        return cls(root, embedder, segments, tombstones, manifest["next"])
+
+    def _save(self) -> None:
+        segments, tombstones = self.state
+        manifest = {
+            "model_id": self.embedder.model_id,
+            "next": self.next_id,
+            "segments": [{"name": s.name, "rows": len(s), "deleted": sorted(tombstones.get(s.name, ()))}
+                         for s in segments],
+        }
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, "manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, os.path.join(self.root, "manifest.json"))
+
+    def _register(self, segment: Segment, deleted: Iterable[int]) -> None:
+        deleted = set(deleted)
+        for row in range(len(segment)):
+            if row not in deleted:
+                doc = segment.dense.doc(row)
+                key = chunk_key(doc["text"])
+                self._live[key] = (segment.name, row, doc["source"])
+                self._by_source.setdefault(doc["source"], set()).add(key)
+
+    def _new_name(self) -> str:
+        name = f"seg_{self.next_id:06d}"
+        self.next_id += 1
+        return name
+
+    def __len__(self) -> int:
+        segments, tombstones = self.state
+        return sum(len(s) - len(tombstones.get(s.name, ())) for s in segments)
+
+    # -- updates --------------------------------------------------------------
+
+    def update(self, chunks: Iterable[Chunk], sources: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Make ``chunks`` the whole content of their sources (plus ``sources``, which may end up empty).
+
+        Chunks whose exact text is already live under another source are
+        left to that source. Returns counts of added, deleted and kept rows.
+        """
+        chunks = list(chunks)
+        replaced = set(sources or ()) | {chunk.source for chunk in chunks}
+        with self._lock:
+            old = set().union(*(self._by_source.get(source, set()) for source in replaced))
+            wanted: Dict[bytes, Chunk] = {}
+            for chunk in chunks:
+                key = chunk_key(chunk.text)
+                if key not in wanted and (key not in self._live or key in old):
+                    wanted[key] = chunk
+            kept = {key for key in old & wanted.keys() if self._live[key][2] == wanted[key].source}
+            gone = old - kept
+            added = [chunk for key, chunk in wanted.items() if key not in kept]
+
+            segments, tombstones = self.state
+            tombstones = dict(tombstones)
+            for key in gone:
+                name, row, source = self._live.pop(key)
+                self._by_source[source].discard(key)
+                tombstones[name] = tombstones.get(name, frozenset()) | {row}
+            if added:
+                segment = Segment.build(self.root, self._new_name(), added, self.embedder)
+                segments = segments + (segment,)
+                self._register(segment, ())
+            self.state = (segments, tombstones)
+            self._save()
+        self._wake.set()
+        return {"added": len(added), "deleted": len(gone), "kept": len(kept)}
+
+    # -- merging --------------------------------------------------------------
+
+    def pick_merge(self) -> List[str]:
+        """Names of the segments the policy would merge next (empty when none)."""
+        segments, tombstones = self.state
+        tiers: Dict[int, List[str]] = {}
+        for segment in segments:
+            deleted = len(tombstones.get(segment.name, ()))
+            if deleted > MAX_DELETED * len(segment):
+                return [segment.name]
+            tiers.setdefault(segment.tier(len(segment) - deleted), []).append(segment.name)
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= MERGE_FACTOR:
+                return tiers[tier][:MERGE_FACTOR]
+        return []
+
+    def merge(self, names: Sequence[str]) -> Optional[Segment]:
+        """Rewrite the live rows of ``names`` as one segment and swap it in.
+
+        The new segment is built without holding the writer lock; rows
+        tombstoned meanwhile are carried over when it is swapped in.
+        """
+        with self._merging:
+            segments, tombstones = self.state
+            chosen = [s for s in segments if s.name in names]
+            if len(chosen) != len(names):
+                return None  # picked from a state another merge already replaced
+            origin: List[Tuple[str, int]] = []
+            chunks: List[Chunk] = []
+            for segment in chosen:
+                deleted = tombstones.get(segment.name, frozenset())
+                for row in range(len(segment)):
+                    if row not in deleted:
+                        origin.append((segment.name, row))
+                        chunks.append(Chunk(**segment.dense.doc(row)))
+            with self._lock:
+                name = self._new_name()
+            merged = Segment.build(self.root, name, chunks, self.embedder) if chunks else None
+
+            with self._lock:
+                segments, tombstones = self.state
+                since = {(n, row) for n in names for row in tombstones.get(n, ())}
+                tombstones = {n: rows for n, rows in tombstones.items() if n not in names}
+                if merged is not None:
+                    deleted = frozenset(i for i, loc in enumerate(origin) if loc in since)
+                    if deleted:
+                        tombstones[merged.name] = deleted
+                    for i, (chunk, loc) in enumerate(zip(chunks, origin)):
+                        key = chunk_key(chunk.text)
+                        live = self._live.get(key)
+                        if live is not None and live[:2] == loc:
+                            self._live[key] = (merged.name, i, live[2])
+                kept = tuple(s for s in segments if s.name not in names)
+                self.state = (kept + ((merged,) if merged is not None else ()), tombstones)
+                self._save()
+        # Readers holding the old state keep their mapped files open; on POSIX the unlinked data stays readable
+        for segment in chosen:
+            shutil.rmtree(os.path.join(self.root, segment.name), ignore_errors=True)
+        return merged
+
+    def merge_pending(self) -> int:
+        """Run merges until the policy is satisfied; returns how many ran."""
+        count = 0
+        names = self.pick_merge()
+        while names:
+            self.merge(names)
+            count += 1
+            names = self.pick_merge()
+        return count
+
+    def start_merger(self) -> None:
+        """Merge on a daemon thread, woken after every update."""
+        if self._merger is not None:
+            return
+        self._stop = False
+
+        def run() -> None:
+            while not self._stop:
+                self._wake.wait()
+                self._wake.clear()
+                if not self._stop:
+                    self.merge_pending()
+
+        self._merger = threading.Thread(target=run, name="segment-merger", daemon=True)
+        self._merger.start()
+        self._wake.set()
+
+    def stop_merger(self) -> None:
+        if self._merger is None:
+            return
+        self._stop = True
+        self._wake.set()
+        self._merger.join()
+        self._merger = None
+
+    # -- search ---------------------------------------------------------------
+
+    def lexical_search(self, query: str, k: int = 10, state: Any = None) -> List[Dict[str, Any]]:
+        segments, tombstones = state or self.state
+        stats = CorpusStats(s.lexical for s in segments)
+        hits = []
+        for segment in segments:
+            for hit in segment.lexical.search(query, k, tombstones.get(segment.name, frozenset()), stats):
+                hits.append({"segment": segment.name, "row": hit["id"], "score": hit["score"]})
+        return sorted(hits, key=lambda hit: -hit["score"])[:k]
+
+    def dense_search(self, query: str, k: int = 10, state: Any = None) -> List[Dict[str, Any]]:
+        segments, tombstones = state or self.state
+        vector = self.embedder.embed([query])
+        hits = []
+        for segment in segments:
+            scores = segment.dense.scores(vector)
+            deleted = tombstones.get(segment.name)
+            if deleted:
+                scores[0, list(deleted)] = -np.inf
+            for row in top_k(scores, k)[0]:
+                if np.isfinite(scores[0, row]):
+                    hits.append({"segment": segment.name, "row": int(row), "score": round(float(scores[0, row]), 4)})
+        return sorted(hits, key=lambda hit: -hit["score"])[:k]
+
+    def search(self, query: str, k: int = 5, candidates: int = CANDIDATES) -> List[Dict[str, Any]]:
+        """BM25 and dense candidates over all live rows, merged by reciprocal-rank fusion."""
+        state = self.state
+        by_name = {segment.name: segment for segment in state[0]}
+        lexical = [(h["segment"], h["row"]) for h in self.lexical_search(query, candidates, state)]
+        dense = [(h["segment"], h["row"]) for h in self.dense_search(query, candidates, state)]
+        lexical_rank = {loc: rank + 1 for rank, loc in enumerate(lexical)}
+        dense_rank = {loc: rank + 1 for rank, loc in enumerate(dense)}
+        return [
+            dict(by_name[name].dense.doc(row), segment=name, row=row, fused=round(score, 5),
+                 lexical_rank=lexical_rank.get((name, row)), dense_rank=dense_rank.get((name, row)))
+            for (name, row), score in reciprocal_rank_fusion([lexical, dense], RRF_K)[:k]
+        ]
+
+    def info(self) -> List[Dict[str, Any]]:
+        segments, tombstones = self.state
+        return [{"name": s.name, "rows": len(s), "deleted": len(tombstones.get(s.name, ())),
+                 "tier": s.tier(len(s) - len(tombstones.get(s.name, ())))} for s in segments]
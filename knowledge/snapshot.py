@@ -0,0 +1,206 @@
+"""Versioned knowledge snapshots swapped into a running process.
+
+A snapshot is everything a request reads: the SQLite knowledge base, the
+plan and zone indexes loaded from it, and the dense + BM25 retrieval
+index. ``publish`` builds a new version next to the live ones::
+
+    knowledge/snapshots/
+        v000007/knowledge.db, v000007/vectors/, v000007/lexical.pack
+        v000008/...
+        CURRENT          <- "v000008", replaced atomically
+
+``SnapshotManager`` serves one version at a time. ``reload`` opens and
+warms the version named in ``CURRENT`` off to the side, then makes it
+current with a single reference swap. Requests hold the version they
+started with for their whole duration::
+
+    manager = SnapshotManager()
+    with manager.snapshot() as snap:
+        snap.zones.lookup("Germany")
+        snap.retriever.search("سوبر سلفني", k=3)
+
+Each version counts its in-flight requests. A replaced version is closed
+(SQLite connection and mapped files) when its last request releases it,
+so nothing is dropped mid-request and old versions do not pile up.
+``watch`` polls ``CURRENT`` on a daemon thread, so a ``publish`` from
+another process (the scraper's cron job) is picked up without a restart.
+"""
+
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from .chunker import iter_chunks
+from .dedupe import iter_deduplicate
+from .dense import DenseIndex
+from .embcache import CachedEmbedder
+from .embeddings import load_embedder
+from .hybrid import HybridRetriever, PairReranker
+from .packed import MappedBM25Index, pack_bm25
+from .query import PlanIndex
+from .store import KnowledgeBase, build
+from .zones import ZoneIndex
+
+DEFAULT_SNAPSHOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
+KEEP_VERSIONS = 3
+WATCH_INTERVAL = 2.0
+
+_VERSION = re.compile(r"^v(\d+)$")
+
+
+def versions(root: str = DEFAULT_SNAPSHOTS_DIR) -> List[str]:
+    """Complete versions on disk, oldest first."""
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root) if _VERSION.match(name))
+
+
+def current_version(root: str = DEFAULT_SNAPSHOTS_DIR) -> Optional[str]:
+    try:
+        with open(os.path.join(root, "CURRENT"), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def set_current(version: str, root: str = DEFAULT_SNAPSHOTS_DIR) -> None:
+    """Point ``CURRENT`` at ``version`` (also used to roll back)."""
+    if not os.path.isdir(os.path.join(root, version)):
+        raise FileNotFoundError(f"No snapshot {version} in {root}")
+    tmp = os.path.join(root, "CURRENT.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(root, "CURRENT"))
+
+
+def publish(root: str = DEFAULT_SNAPSHOTS_DIR, sources: Optional[Iterable[str]] = None,
+            model: str = "hash", keep: int = KEEP_VERSIONS) -> str:
+    """Build a new version from the scraped files, make it current and prune old ones.
+
+    The version is written under a ``.tmp`` name and renamed once complete,
+    so ``CURRENT`` never names a half-built snapshot. Versions that processes
+    may still have open are only unlinked; their open files stay readable.
+    """
+    sources = list(sources) if sources else None
+    existing = versions(root)
+    version = f"v{int(existing[-1][1:]) + 1 if existing else 1:06d}"
+    tmp = os.path.join(root, version + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    build(os.path.join(tmp, "knowledge.db"), sources)
+    dense = DenseIndex.build(iter_deduplicate(iter_chunks(sources)), CachedEmbedder(load_embedder(model)),
+                             os.path.join(tmp, "vectors"))
+    # BM25 over the dense rows, so both retrievers share row ids; packed for mapping
+    pack_bm25(HybridRetriever.from_dense(dense).lexical, os.path.join(tmp, "lexical.pack"))
+    dense.close()
+    os.replace(tmp, os.path.join(root, version))
+    set_current(version, root)
+    for old in versions(root)[:-keep]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return version
+
+
+class Snapshot:
+    """One open version: knowledge base, plan/zone indexes and the retriever."""
+
+    def __init__(self, version: str, path: str):
+        self.version = version
+        self.path = path
+        self.kb = self.dense = self.lexical = None
+        try:
+            self.kb = KnowledgeBase(os.path.join(path, "knowledge.db"))
+            self.plans = PlanIndex(self.kb.plans())
+            self.zones = ZoneIndex(self.kb.zones(), self.kb.zone_prices())
+            self.dense = DenseIndex.open(os.path.join(path, "vectors"))
+            self.lexical = MappedBM25Index(os.path.join(path, "lexical.pack"))
+            self.retriever = HybridRetriever(self.lexical, self.dense, reranker=PairReranker())
+            self.retriever.search("warm up", k=1)  # load the embedder before taking traffic
+        except Exception:
+            self.close()  # a reload retried by the watcher must not leak a connection per attempt
+            raise
+        self.refs = 0
+        self.retired = False
+
+    def close(self) -> None:
+        """Close whatever was opened (all of it, unless ``__init__`` failed part way)."""
+        for resource in (self.kb, self.dense, self.lexical):
+            if resource is not None:
+                resource.close()
+
+
+class SnapshotManager:
+    """The current snapshot, swapped by reference; replaced ones close when their last request ends."""
+
+    def __init__(self, root: str = DEFAULT_SNAPSHOTS_DIR, loader: Callable[[str, str], Any] = Snapshot):
+        self.root = root
+        self.loader = loader
+        self.current: Any = None
+        self._lock = threading.Lock()  # guards the reference counts and the swap
+        self._reloading = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        if not self.reload():
+            raise FileNotFoundError(f"No snapshot in {root}, run: python -m knowledge snapshot publish")
+
+    def acquire(self) -> Any:
+        with self._lock:
+            snapshot = self.current
+            snapshot.refs += 1
+            return snapshot
+
+    def release(self, snapshot: Any) -> None:
+        with self._lock:
+            snapshot.refs -= 1
+            done = snapshot.retired and snapshot.refs == 0
+        if done:
+            snapshot.close()
+
+    @contextmanager
+    def snapshot(self) -> Iterator[Any]:
+        """The current version, held until the ``with`` block ends."""
+        snapshot = self.acquire()
+        try:
+            yield snapshot
+        finally:
+            self.release(snapshot)
+
+    def reload(self) -> bool:
+        """Swap in the version named by ``CURRENT`` if it changed; True when a version was swapped in."""
+        with self._reloading:
+            version = current_version(self.root)
+            if version is None or (self.current is not None and self.current.version == version):
+                return False
+            fresh = self.loader(version, os.path.join(self.root, version))  # slow part, no lock held
+            with self._lock:
+                old, self.current = self.current, fresh
+                if old is not None:
+                    old.retired = True
+                done = old is not None and old.refs == 0
+            if done:
+                old.close()
+            return True
+
+    def watch(self, interval: float = WATCH_INTERVAL) -> None:
+        """Poll ``CURRENT`` every ``interval`` seconds on a daemon thread."""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.reload()
+                except Exception as error:  # keep serving the current version
+                    print(f"⚠️ snapshot reload failed: {error}")
+
+        self._watcher = threading.Thread(target=run, name="snapshot-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
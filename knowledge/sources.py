@@ -0,0 +1,340 @@
+"""Adapters that turn each scraped JSON file into typed knowledge records.
+
+Every scraper saved its page in its own shape (``plan_1..N`` keys, tab
+lists, nested "الانظمة" dictionaries...). Each adapter below reads one of
+those files and yields ``Plan``, ``Service``, ``Price`` and ``ZoneCountry``
+records with the display strings kept as they were scraped, and
+``annotate`` adds canonical numeric columns next to them (see
+``units.py``). Every string leaf of every file is also kept as a ``Text``
+record (with its JSON path), so nothing that is not modelled yet is lost.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .boilerplate import remove_boilerplate
+from .text import clean_text
+from .units import parse_count, parse_data_mb, parse_minutes, parse_money, parse_validity_days
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRAPPING_DIR = os.path.join(ROOT_DIR, "scrapping")
+
+
+@dataclass
+class Plan:
+    source: str
+    family: str
+    name: str
+    price: Optional[str] = None
+    data: Optional[str] = None
+    minutes: Optional[str] = None
+    units: Optional[str] = None
+    validity: Optional[str] = None
+    details: Dict[str, str] = field(default_factory=dict)
+    # Canonical numbers parsed from the strings above
+    price_egp: Optional[float] = None
+    data_mb: Optional[float] = None
+    minutes_count: Optional[float] = None
+    units_count: Optional[float] = None
+    validity_days: Optional[int] = None
+
+
+@dataclass
+class Service:
+    source: str
+    name: str
+    description: str = ""
+    url: str = ""
+
+
+@dataclass
+class Price:
+    source: str
+    item: str
+    price: str
+    unit: str = ""
+    price_egp: Optional[float] = None
+
+
+@dataclass
+class ZoneCountry:
+    source: str
+    zone: str
+    country: str
+
+
+@dataclass
+class ZonePrice:
+    source: str
+    zone: str
+    price_per_minute: float
+    currency: str = "EGP"
+
+
+@dataclass
+class Text:
+    source: str
+    path: str
+    text: str
+
+
+def _value(text: Any) -> str:
+    """Value part of a scraped "label :\\nvalue" string."""
+    text = str(text or "")
+    if ":" in text:
+        text = text.split(":", 1)[1]
+    value = clean_text(text)
+    return "" if value == "-" else value
+
+
+_NAME_PRICE = re.compile(r"(\d+(?:\.\d+)?)\s*$")
+
+
+def _price(amount: Any, currency: str = "جنيه") -> Optional[str]:
+    if amount in (None, ""):
+        return None
+    return clean_text(f"{amount} {currency}")
+
+
+# -- per-file adapters --------------------------------------------------------
+
+def demagh_tanya(data: Dict[str, Any], source: str) -> Iterator[Any]:
+    for key, plan in data.items():
+        name = clean_text(plan.get("name")) or key
+        # The page has no price row; plans are named after their monthly price ("دماغ تانية 40")
+        price = _NAME_PRICE.search(name)
+        yield Plan(source, "دماغ تانية", name,
+                   price=_price(price.group(1)) if price else None,
+                   data=clean_text(plan.get("data")) or None,
+                   units=clean_text(plan.get("units")) or None,
+                   validity="شهر",
+                   details={k: clean_text(plan.get(k)) for k in ("apps", "extra_services", "extra_subscriptions")
+                            if plan.get(k)})
+
+
+def hekaya(data: Dict[str, Any], source: str) -> Iterator[Any]:
+    family = clean_text(data.get("package_name")) or "حكاية"
+    seen = set()
+    for tab, validity in (("monthly_tab", "شهر"), ("weekly_tab", None), ("connect_tab", None),
+                          ("extra_tab", None)):
+        for card in data.get(tab, []):
+            name = clean_text(card.get("plan_name"))
+            key = json.dumps(card, sort_keys=True, ensure_ascii=False)
+            # Older Selenium runs saved the same card several times
+            if not name or key in seen:
+                continue
+            seen.add(key)
+            mixes = _value(card.get("included_mixes")) or _value(card.get("extra_mixes"))
+            details = {k: _value(v) for k, v in card.items()
+                       if k not in ("plan_name", "plan_price", "included_mixes", "extra_mixes",
+                                    "validity_period", "included_megabytes", "etisalat_minutes")
+                       and _value(v)}
+            details["tab"] = tab
+            yield Plan(source, family, name,
+                       price=clean_text(card.get("plan_price")) or None,
+                       data=clean_text(card.get("included_megabytes")) or None,
+                       minutes=_value(card.get("etisalat_minutes")) or None,
+                       units=(mixes + " ميكس" if mixes.isdigit() else mixes) or None,
+                       validity=_value(card.get("validity_period")) or validity,
+                       details=details)
+
+
+def emerald(data: Dict[str, Any], source: str) -> Iterator[Any]:
+    yield Service(source, clean_text(data.get("main_header")), clean_text(data.get("description")))
+    for name, lines in data.get("plan_features", {}).items():
+        details = {}
+        for line in lines:
+            label, _, value = clean_text(line).partition(" : ")
+            # A few lines were scraped right-to-left as "value : label"
+            if label[:1] in "0123456789%" and value[:1] not in "0123456789%":
+                label, value = value, label
+            details[label] = value
+        yield Plan(source, "Emerald", clean_text(name),
+                   price=details.pop("السعر", None),
+                   data=details.pop("موبيل انترنت", None),
+                   minutes=details.pop("دقائق محلية", None),
+                   validity="شهر",
+                   details={k: v for k, v in details.items() if v and v != "-"})
+
+
+def travel(data: Dict[str, Any], source: str) -> Iterator[Any]:
+    yield Service(source, clean_text(data.get("title")), url=data.get("url", ""))
+    for package in data.get("data_packages", {}).values():
+        yield Plan(source, "ترافلر", clean_text(package.get("name")),
+                   price=clean_text(package.get("price")) or None,
+                   data=clean_text(package.get("data")) or None,
+                   minutes=clean_text(package.get("local_minutes")) or None,
+                   details={k: clean_text(package[k]) for k in ("renewable", "international_calls")
+                            if package.get(k)})
+
+
+def prepaid_data(data: Dict[str, Any], source: str) -> Iterator[Any]:
+    info = data.get("page_info", {})
+    yield Service(source, clean_text(info.get("title")), clean_text(info.get("description")),
+                  info.get("url", ""))
+    for package in data.get("main_packages", []):
+        name = f"باقة داتا {package.get('price')}"
+        yield Plan(source, "باقات الداتا", name,
+                   price=_price(package.get("price"), package.get("currency", "جنيه")),
+                   data=clean_text(package.get("data_amount")) or None,
+                   validity=clean_text(package.get("validity")) or None,
+                   details={"offer": clean_text(package["offer_description"])}
+                   if package.get("offer_description") else {})
+    for package in data.get("additional_packages", []):
+        yield Plan(source, "باقات الداتا", clean_text(package.get("name")),
+                   price=_price(package.get("price"), package.get("currency", "جنيه")),
+                   data=clean_text(package.get("data_amount")) or None,
+                   validity=clean_text(package.get("validity")) or None,
+                   details={"activation_code": clean_text(package["activation_code"])}
+                   if package.get("activation_code") else {})
+
+
+def dsl(data: Dict[str, Any], source: str) -> Iterator[Any]:
+    yield Service(source, "eHome DSL", clean_text(data.get("service_features", {}).get("section_title")))
+    for package in data.get("packages", []):
+        size = clean_text(package.get("data_gb"))
+        yield Plan(source, "eHome DSL", clean_text(f"eHome DSL {size} {package.get('speed', '')}"),
+                   price=clean_text(package.get("price_egp")) or None,
+                   data=size or None,
+                   validity=clean_text(package.get("validity")) or None,
+                   details={k: clean_text(package[k]) for k in ("speed", "benefit")
+                            if package.get(k) and package[k] != "-"})
+    for group in data.get("favorite_packages", {}).values():
+        for item in group.get("items", []):
+            yield Plan(source, "eHome DSL", clean_text(item.get("name")),
+                       price=clean_text(item.get("price_egp")) or None,
+                       data=clean_text(item.get("data_gb")) or None,
+                       details={"category": clean_text(group.get("title"))})
+    for bundle in data.get("extra_bundles", []):
+        yield Plan(source, "eHome DSL", clean_text(bundle.get("package_name")),
+                   price=clean_text(bundle.get("price")) or None,
+                   data=clean_text(bundle.get("package_size")) or None)
+
+
+def elkart(data: Dict[str, Any], source: str) -> Iterator[Any]:
+    yield Service(source, clean_text(data.get("page_title")), clean_text(data.get("page_description")))
+    for tab, content in data.get("الانظمة", {}).items():
+        for offer in content.get("offers", []):
+            details = {clean_text(k).rstrip(":").strip(): clean_text(v)
+                       for k, v in offer.get("details", {}).items() if clean_text(v) not in ("", "-")}
+            price = clean_text(offer.get("price"))
+            name = clean_text(offer.get("plan_name")) or f"{clean_text(tab)} {price}"
+            yield Plan(source, clean_text(tab), name,
+                       price=price or None,
+                       # The main allowance is the one detail printed without a label
+                       units=details.pop("", None),
+                       validity=details.pop("صلاحية", None),
+                       details=details)
+
+
+def international_calls(data: Dict[str, Any], source: str) -> Iterator[Any]:
+    yield Service(source, clean_text(data.get("service_name")), clean_text(data.get("description")),
+                  data.get("page_url", ""))
+    for zone, countries in data.get("zones", {}).items():
+        for country in countries:
+            yield ZoneCountry(source, zone, clean_text(country))
+    for zone, pricing in data.get("pricing", {}).items():
+        yield ZonePrice(source, zone, float(pricing["price_per_minute"]), pricing.get("currency", "EGP"))
+    for name, service in data.get("satellite_services", {}).get("services", {}).items():
+        yield Price(source, clean_text(name), _price(service["price_per_minute"]), "دقيقة")
+    for service in data.get("other_international_services", {}).get("pricing_details", {}).values():
+        yield Price(source, service.get("service_type", ""), _price(service["price"]), "رسالة")
+    premium = data.get("premium_international_numbers", {})
+    if premium.get("price_per_minute"):
+        yield Price(source, clean_text(premium.get("service_name")), _price(premium["price_per_minute"]), "دقيقة")
+
+
+def page_service(data: Dict[str, Any], source: str) -> Iterator[Any]:
+    """Generic service page: a title/description plus optional plan rows."""
+    info = data.get("page_info", {})
+    name = clean_text(data.get("page_title") or data.get("service_name") or data.get("title")
+                      or info.get("title"))
+    description = clean_text(data.get("page_description") or data.get("service_description")
+                             or data.get("description") or info.get("description"))
+    url = data.get("page_url") or data.get("url") or info.get("url", "")
+    if name:
+        yield Service(source, name, description, url)
+    for row in data.get("plans", []):
+        for key, value in row.items():
+            if key != "name" and clean_text(value) and clean_text(value) != clean_text(row.get("name")):
+                yield Price(source, f"{name} - {key}", clean_text(value))
+    for row in data.get("service_costs", []):
+        yield Price(source, f"{name} - {clean_text(row.get('loan_amount'))}",
+                    clean_text(row.get("service_fee")), "رسوم")
+
+
+def scraped_pages(data: List[Dict[str, Any]], source: str) -> Iterator[Any]:
+    """Whole-page text dumps: one Text record per page, keyed by URL.
+
+    The menus and footer repeated on every page are removed first (see
+    ``boilerplate.py``); the remaining lines are kept one per line.
+    """
+    pages, _ = remove_boilerplate(data)
+    for page in pages:
+        text = page["content"]
+        if text:
+            yield Text(source, page.get("url", ""), text)
+
+
+# Scraped files (relative to scrapping/) and their adapter
+SOURCES: Dict[str, Callable[[Dict[str, Any], str], Iterator[Any]]] = {
+    "FayrouzMohamed/demagh_tanya.json": demagh_tanya,
+    "FayrouzMohamed/etisalat_scraped_data.json": scraped_pages,
+    "FayrouzMohamed/balance_transfer_data.json": page_service,
+    "FayrouzMohamed/call_filter.json": page_service,
+    "FayrouzMohamed/call_keeper.json": page_service,
+    "FayrouzMohamed/international_money_remittance.json": page_service,
+    "FayrouzMohamed/raseedy.json": page_service,
+    "FayrouzMohamed/video_call_data.json": page_service,
+    "Israa/DSL/full_ehome_dsl_data (1).json": dsl,
+    "Mayar/etisalat_hekaya.json": hekaya,
+    "Mohy/emerald_family.json": emerald,
+    "Rania/egypt_travel_data.json": travel,
+    "Soha/akwa_full_page.json": elkart,
+    "Suhaila/e&_7070_services.json": page_service,
+    "Suhaila/e&_international_calls.json": international_calls,
+    "Suhaila/e&_mokalmat_wifi.json": page_service,
+    "Suhaila/e&_prepaid_data_packages.json": prepaid_data,
+    "Suhaila/e&_super_salefny.json": page_service,
+}
+
+
+def annotate(record: Any) -> Any:
+    """Fill the numeric columns of a Plan or Price from its display strings."""
+    if isinstance(record, Plan):
+        record.price_egp = parse_money(record.price) if record.price else None
+        record.data_mb = parse_data_mb(record.data) if record.data else None
+        record.minutes_count = parse_minutes(record.minutes) if record.minutes else None
+        record.units_count = parse_count(record.units) if record.units else None
+        record.validity_days = parse_validity_days(record.validity) if record.validity else None
+    elif isinstance(record, Price):
+        record.price_egp = parse_money(record.price)
+    return record
+
+
+def iter_texts(data: Any, source: str, path: str = "") -> Iterator[Text]:
+    """Every non-empty string leaf of a JSON document with its path."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from iter_texts(value, source, f"{path}/{key}")
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            yield from iter_texts(value, source, f"{path}/{i}")
+    elif isinstance(data, str):
+        text = clean_text(data)
+        if text and text != "-":
+            yield Text(source, path or "/", text)
+
+
+def load_source(source: str) -> Tuple[Any, List[Any]]:
+    """Read one scraped file and return (raw JSON, records)."""
+    with open(os.path.join(SCRAPPING_DIR, source), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    adapter = SOURCES[source]
+    records = [annotate(record) for record in adapter(data, source)]
+    if adapter is not scraped_pages:
+        records.extend(iter_texts(data, source))
+    return data, records
@@ -0,0 +1,241 @@
+"""Compiled SQLite knowledge base built from every scraped JSON file.
+
+``build`` runs all adapters in ``sources.py`` and writes the records into
+one SQLite file with a table per record type and secondary indexes on the
+columns the chatbot looks things up by (plan name and family, service
+name, zone and country). ``KnowledgeBase`` answers those lookups with a
+single indexed query instead of loading and walking ~20 JSON files per
+request.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from .sources import SCRAPPING_DIR, SOURCES, Plan, Price, Service, Text, ZoneCountry, ZonePrice, load_source
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "knowledge.db")
+# Read the store through mmap: pages come from the shared OS page cache, not a per-connection copy
+MMAP_BYTES = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE sources (
+    source TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    records INTEGER NOT NULL
+);
+CREATE TABLE plans (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    family TEXT NOT NULL,
+    name TEXT NOT NULL,
+    price TEXT,
+    data TEXT,
+    minutes TEXT,
+    units TEXT,
+    validity TEXT,
+    details TEXT NOT NULL,
+    price_egp REAL,
+    data_mb REAL,
+    minutes_count REAL,
+    units_count REAL,
+    validity_days INTEGER
+);
+CREATE TABLE services (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    url TEXT NOT NULL
+);
+CREATE TABLE prices (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    item TEXT NOT NULL,
+    price TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    price_egp REAL
+);
+CREATE TABLE zone_countries (
+    source TEXT NOT NULL,
+    zone TEXT NOT NULL,
+    country TEXT NOT NULL
+);
+CREATE TABLE zone_prices (
+    source TEXT NOT NULL,
+    zone TEXT NOT NULL,
+    price_per_minute REAL NOT NULL,
+    currency TEXT NOT NULL,
+    PRIMARY KEY (source, zone)
+);
+CREATE TABLE texts (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    path TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX plans_family ON plans (family);
+CREATE INDEX plans_name ON plans (name);
+CREATE INDEX plans_price ON plans (price_egp);
+CREATE INDEX plans_data ON plans (data_mb);
+CREATE INDEX services_name ON services (name);
+CREATE INDEX prices_item ON prices (item);
+CREATE INDEX zone_countries_country ON zone_countries (country);
+CREATE INDEX zone_countries_zone ON zone_countries (zone);
+CREATE INDEX texts_source ON texts (source);
+"""
+
+# record type -> (table, columns)
+_TABLES = {
+    Plan: ("plans", ["source", "family", "name", "price", "data", "minutes", "units", "validity", "details",
+                     "price_egp", "data_mb", "minutes_count", "units_count", "validity_days"]),
+    Service: ("services", ["source", "name", "description", "url"]),
+    Price: ("prices", ["source", "item", "price", "unit", "price_egp"]),
+    ZoneCountry: ("zone_countries", ["source", "zone", "country"]),
+    ZonePrice: ("zone_prices", ["source", "zone", "price_per_minute", "currency"]),
+    Text: ("texts", ["source", "path", "text"]),
+}
+
+
+def _row(record: Any, columns: List[str]) -> List[Any]:
+    values = asdict(record)
+    return [json.dumps(values[c], ensure_ascii=False) if isinstance(values[c], dict) else values[c]
+            for c in columns]
+
+
+def build(db_path: str = DEFAULT_DB, sources: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Rebuild the knowledge base from the scraped files; returns rows per table.
+
+    The database is written to a temporary file and moved into place, so
+    readers never see a half-built store.
+    """
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    connection.executescript(SCHEMA)
+
+    counts = {table: 0 for table, _ in _TABLES.values()}
+    for source in sources or SOURCES:
+        path = os.path.join(SCRAPPING_DIR, source)
+        if not os.path.exists(path):
+            print(f"⚠️ {source} not found, skipped")
+            continue
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        _, records = load_source(source)
+
+        rows: Dict[type, List[List[Any]]] = {}
+        for record in records:
+            rows.setdefault(type(record), []).append(_row(record, _TABLES[type(record)][1]))
+        for kind, values in rows.items():
+            table, columns = _TABLES[kind]
+            verb = "INSERT OR REPLACE" if kind is ZonePrice else "INSERT"
+            connection.executemany(
+                f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                values,
+            )
+            counts[table] += len(values)
+        connection.execute("INSERT INTO sources VALUES (?, ?, ?)", (source, digest, len(records)))
+
+    connection.commit()
+    connection.execute("VACUUM")
+    connection.close()
+    os.replace(tmp_path, db_path)
+    return counts
+
+
+class KnowledgeBase:
+    """Read-only lookups over a built knowledge base."""
+
+    def __init__(self, db_path: str = DEFAULT_DB):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"{db_path} not found, run: python -m knowledge build")
+        self.db_path = db_path
+        self.connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(f"PRAGMA mmap_size = {MMAP_BYTES}")
+
+    def _all(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        rows = [dict(row) for row in self.connection.execute(sql, tuple(params))]
+        for row in rows:
+            if "details" in row:
+                row["details"] = json.loads(row["details"])
+        return rows
+
+    def plans(self, family: Optional[str] = None) -> List[Dict[str, Any]]:
+        if family is None:
+            return self._all("SELECT * FROM plans ORDER BY id")
+        return self._all("SELECT * FROM plans WHERE family = ? ORDER BY id", [family])
+
+    def plan(self, name: str) -> Optional[Dict[str, Any]]:
+        rows = self._all("SELECT * FROM plans WHERE name = ? LIMIT 1", [name])
+        return rows[0] if rows else None
+
+    def families(self) -> List[str]:
+        return [row["family"] for row in self._all("SELECT DISTINCT family FROM plans ORDER BY family")]
+
+    def services(self) -> List[Dict[str, Any]]:
+        return self._all("SELECT * FROM services ORDER BY id")
+
+    def service(self, name: str) -> Optional[Dict[str, Any]]:
+        rows = self._all("SELECT * FROM services WHERE name = ? LIMIT 1", [name])
+        return rows[0] if rows else None
+
+    def prices(self, item: Optional[str] = None) -> List[Dict[str, Any]]:
+        if item is None:
+            return self._all("SELECT * FROM prices ORDER BY id")
+        return self._all("SELECT * FROM prices WHERE item = ?", [item])
+
+    def zone_of(self, country: str) -> Optional[str]:
+        rows = self._all("SELECT zone FROM zone_countries WHERE country = ? LIMIT 1", [country])
+        return rows[0]["zone"] if rows else None
+
+    def _zone_price_rows(self, zone: Optional[str], source: Optional[str]) -> List[Dict[str, Any]]:
+        """Zone price rows, those whose source also lists the zone's countries first."""
+        conditions, params = [], []
+        for column, value in (("zone", zone), ("source", source)):
+            if value is not None:
+                conditions.append(f"p.{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._all(
+            f"SELECT p.* FROM zone_prices p {where} ORDER BY EXISTS ("
+            "SELECT 1 FROM zone_countries c WHERE c.source = p.source AND c.zone = p.zone) DESC, p.rowid",
+            params,
+        )
+
+    def zone_price(self, zone: str, source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Price of a zone; see ``zone_prices`` for which source wins."""
+        rows = self._zone_price_rows(zone, source)
+        return rows[0] if rows else None
+
+    def zones(self) -> Dict[str, List[str]]:
+        """Zone -> countries, in page order."""
+        zones: Dict[str, List[str]] = {}
+        for row in self._all("SELECT zone, country FROM zone_countries ORDER BY rowid"):
+            zones.setdefault(row["zone"], []).append(row["country"])
+        return zones
+
+    def zone_prices(self, source: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Zone -> price row, from ``source`` only if given.
+
+        Prices are stored per (source, zone). When several sources price the
+        same zone, the one that also lists the zone's countries wins, then
+        the first one built.
+        """
+        prices: Dict[str, Dict[str, Any]] = {}
+        for row in self._zone_price_rows(None, source):
+            prices.setdefault(row["zone"], row)
+        return prices
+
+    def texts(self, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        if source is None:
+            return self._all("SELECT * FROM texts ORDER BY id")
+        return self._all("SELECT * FROM texts WHERE source = ? ORDER BY id", [source])
+
+    def close(self) -> None:
+        self.connection.close()
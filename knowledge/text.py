@@ -0,0 +1,72 @@
+"""Arabic-aware text normalisation and tokenisation for search.
+
+``normalize_arabic`` folds the spelling variants the portal mixes freely
+(أ/إ/آ -> ا, ة -> ه, ى -> ي) and drops diacritics and tatweel.
+``tokenize`` splits normalised text into search terms, applying a light
+stemmer (in the style of Larkey's light10) that removes the common
+prefixes (و, ال, بال, لل...) and suffixes (ات, ين, ها, ية...) so "الباقات",
+"باقة" and "وباقتك" meet on the same stem.
+"""
+
+import re
+import unicodedata
+from typing import Any, List
+
+from .units import normalize_digits
+
+_DIACRITICS = re.compile(r"[ً-ْٰـ]")
+_ARABIC_FOLD = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ة": "ه", "ى": "ي", "ؤ": "و", "ئ": "ي"})
+_TOKEN = re.compile(r"[a-z0-9]+|[ء-ي]+")
+
+# Longest first; each is only removed if a stem of at least 3 letters remains
+_PREFIXES = ["وال", "بال", "كال", "فال", "لل", "ال"]
+_SUFFIXES = ["ها", "ان", "ات", "ون", "ين", "يه", "ه", "ي"]
+
+STOPWORDS = {
+    "في", "من", "علي", "الي", "عن", "مع", "او", "و", "ان", "هذا", "هذه", "ذلك", "التي", "الذي",
+    "كل", "ما", "لا", "لم", "لن", "قد", "هو", "هي", "ب", "ل", "ك", "به", "بها", "لك", "ليك",
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "with", "is", "are", "be",
+}
+
+
+def clean_text(text: Any) -> str:
+    """Fold presentation forms, collapse whitespace and strip the text."""
+    if text is None:
+        return ""
+    text = unicodedata.normalize("NFKC", str(text))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def normalize_arabic(text: str) -> str:
+    """Fold Arabic spelling variants and drop diacritics, tatweel and punctuation."""
+    text = unicodedata.normalize("NFKC", text)
+    text = _DIACRITICS.sub("", text).translate(_ARABIC_FOLD)
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+def light_stem(word: str) -> str:
+    """Strip one common Arabic prefix and one suffix, keeping a 3+ letter stem."""
+    if word.startswith("و") and len(word) > 4:
+        word = word[1:]
+    for prefix in _PREFIXES:
+        if word.startswith(prefix) and len(word) - len(prefix) >= 3:
+            word = word[len(prefix):]
+            break
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    return word
+
+
+def tokenize(text: str, stem: bool = True) -> List[str]:
+    """Search terms of a text: normalised, lower-cased, stemmed, without stopwords."""
+    text = normalize_arabic(normalize_digits(text)).lower()
+    terms = []
+    for token in _TOKEN.findall(text):
+        if token in STOPWORDS:
+            continue
+        if stem and not token.isascii():
+            token = light_stem(token)
+        terms.append(token)
+    return terms
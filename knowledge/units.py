@@ -0,0 +1,170 @@
+"""Ingest-time parsing of prices, data quotas, minutes and validity periods.
+
+The scraped values are display strings in Arabic or English ("200 جنيه",
+"7 جيجا بايت", "15 قرش", "٣ شهور", "2,500"). These parsers turn them into
+canonical numbers once, when the knowledge base is built:
+
+    money     -> EGP            (قرش / piasters are divided by 100)
+    data      -> MB             (1 GB = 1024 MB)
+    minutes   -> minutes
+    validity  -> days           (week = 7, month = 30, year = 365)
+
+Every parser returns ``None`` when the text has no recognisable quantity,
+so the numeric column stays empty rather than wrong.
+"""
+
+import re
+from typing import Any, Optional, Tuple
+
+_DIGITS = str.maketrans("٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹", "01234567890123456789")
+
+# 2,500 / 10,000 / ١٠١،٤٠٧ (thousands) and 1.5 / 1٫5 (decimals)
+_NUMBER = re.compile(r"\d+(?:[,،٬]\d{3})*(?:[.٫]\d+)?")
+
+_WORD_NUMBERS = {
+    "واحد": 1, "واحدة": 1, "اثنين": 2, "اتنين": 2, "ثلاث": 3, "ثلاثة": 3, "تلات": 3, "تلاتة": 3,
+    "اربع": 4, "أربع": 4, "اربعة": 4, "أربعة": 4, "خمس": 5, "خمسة": 5, "ست": 6, "ستة": 6, "سته": 6,
+    "سبع": 7, "سبعة": 7, "ثمان": 8, "ثمانية": 8, "تسع": 9, "تسعة": 9, "عشر": 10, "عشرة": 10,
+}
+
+
+
+def _unit(pattern: str) -> "re.Pattern":
+    """A unit that only matches as a whole word; digits may touch it ("15قرش", "30GB")."""
+    return re.compile(r"(?<![^\W\d_])(?:ال)?(?:" + pattern + r")(?![^\W\d_])", re.IGNORECASE)
+
+
+# Speeds ("30 Mbps", "100 Mb/s") are not quotas
+_PER_SECOND = r"(?!\s*/\s*(?:s|sec|ث)\b)"
+
+_CURRENCY = re.compile(r"جني[هة]|جنيها|جنيهات|ج\.?م|egp|\ble\b|pounds?", re.IGNORECASE)
+_PIASTERS = _unit(r"قرش|قروش|piasters?|pt")
+_GIGA = _unit(r"(?:جيجا|جيجابايت|جيجابايتس|جيجا بايت|gb|giga|gigabytes?)" + _PER_SECOND)
+_MEGA = _unit(r"(?:ميجا|ميجابايت|ميجا بايت|ميجابايتس|ميجابيتس|mb|mega|megabytes?)" + _PER_SECOND)
+_MINUTES = _unit(r"دقيق[ةه]|دقائق|دقايق|min|mins|minutes?")
+
+# unit word -> days, with the dual forms that already carry the count
+_PERIODS = [
+    (re.compile(r"يومين"), 2, True),
+    (re.compile(r"اسبوعين|أسبوعين"), 14, True),
+    (re.compile(r"شهرين"), 60, True),
+    (re.compile(r"سنتين"), 730, True),
+    (re.compile(r"يوم|ايام|أيام|days?\b", re.IGNORECASE), 1, False),
+    (re.compile(r"اسبوع|أسبوع|اسابيع|أسابيع|weeks?\b", re.IGNORECASE), 7, False),
+    (re.compile(r"شهر|شهور|أشهر|اشهر|months?\b|monthly", re.IGNORECASE), 30, False),
+    (re.compile(r"سنة|سنه|سنوات|years?\b|yearly", re.IGNORECASE), 365, False),
+]
+
+
+def normalize_digits(text: Any) -> str:
+    """Replace Arabic-Indic and Persian digits with ASCII ones."""
+    return str(text or "").translate(_DIGITS)
+
+
+def _to_float(number: str) -> float:
+    number = re.sub(r"[,،٬]", "", number).replace("٫", ".")
+    return float(number)
+
+
+def parse_number(text: Any) -> Optional[float]:
+    """First number in the text (digits or a spelled-out Arabic number)."""
+    text = normalize_digits(text)
+    match = _NUMBER.search(text)
+    if match:
+        return _to_float(match.group(0))
+    for word in re.findall(r"[؀-ۿ]+", text):
+        if word in _WORD_NUMBERS:
+            return float(_WORD_NUMBERS[word])
+    return None
+
+
+def _number_before(text: str, unit: "re.Pattern") -> Optional[Tuple[float, int]]:
+    """The number written just before (or after) the first match of ``unit``."""
+    match = unit.search(text)
+    if not match:
+        return None
+    before = list(_NUMBER.finditer(text, 0, match.start()))
+    if before:
+        return _to_float(before[-1].group(0)), match.start()
+    after = _NUMBER.search(text, match.end())
+    if after:
+        return _to_float(after.group(0)), match.start()
+    return None
+
+
+def parse_money(text: Any) -> Optional[float]:
+    """Amount in EGP: "200 جنيه" -> 200.0, "15قرش" -> 0.15, "64.29 جنية" -> 64.29."""
+    if isinstance(text, (int, float)):
+        return float(text)
+    text = normalize_digits(text)
+    pounds = _number_before(text, _CURRENCY)
+    piasters = _number_before(text, _PIASTERS)
+    if pounds and piasters:
+        # Whichever unit comes first is the price; "5 جنيه / 50 قرش" style
+        return pounds[0] if pounds[1] <= piasters[1] else piasters[0] / 100
+    if pounds:
+        return pounds[0]
+    if piasters:
+        return piasters[0] / 100
+    return None
+
+
+def parse_data_mb(text: Any) -> Optional[float]:
+    """Data quota in MB: "7 جيجا بايت" -> 7168.0, "1250 ميجابايتس" -> 1250.0."""
+    text = normalize_digits(text)
+    giga = _number_before(text, _GIGA)
+    mega = _number_before(text, _MEGA)
+    if giga and (not mega or giga[1] <= mega[1]):
+        return giga[0] * 1024
+    if mega:
+        return mega[0]
+    return None
+
+
+def parse_minutes(text: Any) -> Optional[float]:
+    """Minutes: "210 دقيقة" -> 210.0; a bare number ("2,500") counts as minutes."""
+    if isinstance(text, (int, float)):
+        return float(text)
+    text = normalize_digits(text)
+    found = _number_before(text, _MINUTES)
+    if found:
+        return found[0]
+    if re.fullmatch(r"\s*" + _NUMBER.pattern + r"\s*", text):
+        return _to_float(text.strip())
+    return None
+
+
+def parse_count(text: Any) -> Optional[float]:
+    """A plain count such as "1500 ميكس" or "300 وحدة"."""
+    if isinstance(text, (int, float)):
+        return float(text)
+    match = _NUMBER.search(normalize_digits(text))
+    return _to_float(match.group(0)) if match else None
+
+
+def _period_count(text: str, match: "re.Match") -> float:
+    """How many periods: the number right before the period word, or one spelled out next to it."""
+    before = re.search("(" + _NUMBER.pattern + r")\s*$", text[:match.start()])
+    if before:
+        return _to_float(before.group(1))
+    words = re.findall(r"[؀-ۿ]+", text[:match.start()])[-1:] + re.findall(r"[؀-ۿ]+", text[match.end():])[:1]
+    for word in words:
+        if word in _WORD_NUMBERS:
+            return float(_WORD_NUMBERS[word])
+    return 1.0
+
+
+def parse_validity_days(text: Any) -> Optional[int]:
+    """Validity in days: "6 أيام" -> 6, "شهر واحد" -> 30, "ثلاث شهور" -> 90, "يومين" -> 2.
+
+    Only a number next to the period word counts, so "باقة 140 جيجا لمدة شهر" is 30.
+    """
+    text = normalize_digits(text)
+    for pattern, days, counted in _PERIODS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        if counted:
+            return days
+        return int(round(_period_count(text, match) * days))
+    return None
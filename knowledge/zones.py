@@ -0,0 +1,187 @@
+"""Country -> zone -> price-per-minute lookup with fuzzy Arabic/English matching.
+
+``extract_zone_countries`` in ``international_calls_scraper.py`` gives zone
+-> country lists and ``extract_pricing_table`` gives zone -> price, but
+answering "how much is a call to Germany" meant scanning every list.
+``ZoneIndex`` inverts them once, when the scraper output is loaded, into a
+hash map from normalised names to (country, zone, price) entries.
+
+Each country is indexed under several keys:
+
+* its Arabic name with alef/taa-marbuta/yaa variants and diacritics
+  folded away ("المانيا" finds "ألمانيا"), with and without the "ال"
+  article, plus any word of the name no other country shares
+  ("السعودية" finds "المملكة العربية السعودية"),
+* its English names from ``country_names.py``,
+* a Latin transliteration of the Arabic name, so Franco-Arabic spellings
+  ("almanya", "el sa3odeya") land on the same key space.
+
+Exact keys are a single dict lookup. Misspellings fall back to a character
+trigram index, whose work depends on the query length, not on the number
+of countries.
+"""
+
+import json
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Set
+
+from .country_names import ENGLISH_NAMES
+from .store import DEFAULT_DB, KnowledgeBase
+from .text import normalize_arabic
+
+_ARABIC = re.compile(r"[؀-ۿ]")
+
+_TRANSLITERATION = {
+    "ا": "a", "ب": "b", "ت": "t", "ث": "s", "ج": "g", "ح": "h", "خ": "kh", "د": "d", "ذ": "z",
+    "ر": "r", "ز": "z", "س": "s", "ش": "sh", "ص": "s", "ض": "d", "ط": "t", "ظ": "z", "ع": "a",
+    "غ": "gh", "ف": "f", "ق": "k", "ك": "k", "ل": "l", "م": "m", "ن": "n", "ه": "a", "و": "o",
+    "ي": "i", "ء": "",
+}
+# Franco-Arabic digits and Latin spellings folded to one form
+_FRANCO_DIGITS = str.maketrans({"2": "a", "3": "a", "5": "kh", "6": "t", "7": "h", "8": "gh", "9": "s"})
+_LATIN_FOLD = [
+    (re.compile(r"ph"), "f"), (re.compile(r"th"), "t"), (re.compile(r"dh"), "z"),
+    (re.compile(r"[eiy]+"), "i"), (re.compile(r"[ouw]+"), "o"), (re.compile(r"[qc]"), "k"),
+    (re.compile(r"j"), "g"), (re.compile(r"v"), "f"), (re.compile(r"x"), "ks"),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+MIN_SIMILARITY = 0.5
+
+
+def strip_article(text: str) -> str:
+    """Drop the "ال" article from every word of a normalised Arabic name."""
+    return " ".join(w[2:] if w.startswith("ال") and len(w) > 4 else w for w in text.split())
+
+
+def fold_latin(text: str) -> str:
+    """Fold English / Franco-Arabic spellings to one key ("El Sa3odeya" ~ "saodia")."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c)).translate(_FRANCO_DIGITS)
+    text = re.sub(r"[^a-z\s]", " ", text)
+    words = [w[2:] if w in ("al", "el") else w for w in text.split()]
+    text = " ".join(w for w in words if w)
+    for pattern, replacement in _LATIN_FOLD:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def transliterate(arabic: str) -> str:
+    """Latin spelling of a normalised Arabic name, folded like user input."""
+    latin = "".join(_TRANSLITERATION.get(c, c if c == " " else "") for c in normalize_arabic(arabic))
+    return fold_latin(latin)
+
+
+def query_keys(text: str) -> List[str]:
+    """Keys to try for a user query, most literal first."""
+    if _ARABIC.search(text):
+        full = normalize_arabic(text)
+        return [full, strip_article(full)]
+    return [fold_latin(text)]
+
+
+def _name_keys(country: str) -> Set[str]:
+    full = normalize_arabic(country)
+    stripped = strip_article(full)
+    return {full, stripped, transliterate(full), transliterate(stripped)}
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ZoneIndex:
+    """Inverted country -> zone -> price index."""
+
+    def __init__(self, zones: Dict[str, List[str]], pricing: Dict[str, Dict[str, Any]]):
+        self.entries: List[Dict[str, Any]] = []
+        self.keys: Dict[str, List[int]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+
+        # Words that appear in only one country's name identify it on their own
+        word_owners: Dict[str, Set[str]] = {}
+        for countries in zones.values():
+            for country in countries:
+                for word in strip_article(normalize_arabic(country)).split():
+                    word_owners.setdefault(word, set()).add(country)
+
+        for zone, countries in zones.items():
+            price = pricing.get(zone, {})
+            for country in countries:
+                entry = {
+                    "country": country,
+                    "zone": zone,
+                    "price_per_minute": price.get("price_per_minute"),
+                    "currency": price.get("currency", "EGP"),
+                }
+                self.entries.append(entry)
+                entry_id = len(self.entries) - 1
+                keys = _name_keys(country)
+                words = strip_article(normalize_arabic(country)).split()
+                if len(words) > 1:
+                    for word in words:
+                        if len(word) >= 4 and len(word_owners[word]) == 1:
+                            keys.update(_name_keys(word))
+                keys.update(fold_latin(name) for name in ENGLISH_NAMES.get(country, []))
+                for key in keys:
+                    if key:
+                        self._add_key(key, entry_id)
+
+    def _add_key(self, key: str, entry_id: int) -> None:
+        ids = self.keys.setdefault(key, [])
+        if entry_id not in ids:
+            ids.append(entry_id)
+        for gram in _trigrams(key):
+            self.grams.setdefault(gram, set()).add(key)
+
+    @classmethod
+    def from_scraper_output(cls, data: Dict[str, Any]) -> "ZoneIndex":
+        """Build from the dict ``scrape_international_calls`` returns."""
+        return cls(data.get("zones", {}), data.get("pricing", {}))
+
+    @classmethod
+    def load_json(cls, path: str) -> "ZoneIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_scraper_output(json.load(f))
+
+    @classmethod
+    def load(cls, db_path: str = DEFAULT_DB) -> "ZoneIndex":
+        """Build from the compiled knowledge base."""
+        kb = KnowledgeBase(db_path)
+        return cls(kb.zones(), kb.zone_prices())
+
+    def _fuzzy_key(self, key: str) -> Optional[str]:
+        query = _trigrams(key)
+        overlaps: Dict[str, int] = {}
+        for gram in query:
+            for candidate in self.grams.get(gram, ()):
+                overlaps[candidate] = overlaps.get(candidate, 0) + 1
+        best, best_score = None, MIN_SIMILARITY
+        for candidate, overlap in overlaps.items():
+            score = 2 * overlap / (len(query) + len(_trigrams(candidate)))
+            if score > best_score:
+                best, best_score = candidate, score
+        return best
+
+    def lookup(self, name: str, fuzzy: bool = True) -> List[Dict[str, Any]]:
+        """All (country, zone, price) entries for a country name, best match first.
+
+        A country listed in two zones (e.g. Russia) returns both entries.
+        """
+        keys = [key for key in query_keys(name) if key]
+        for key in keys:
+            if key in self.keys:
+                return [dict(self.entries[i]) for i in self.keys[key]]
+        # Very short queries ("جزر") match too many names to guess from
+        if fuzzy and keys and len(keys[0]) >= 4:
+            match = self._fuzzy_key(keys[0])
+            if match:
+                return [dict(self.entries[i]) for i in self.keys[match]]
+        return []
+
+    def price(self, name: str) -> Optional[Dict[str, Any]]:
+        """The first zone entry for a country, or None if nothing matches."""
+        found = self.lookup(name)
+        return found[0] if found else None
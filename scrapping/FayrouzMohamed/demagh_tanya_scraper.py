@@ -10,52 +10,58 @@ Original file is located at
 from bs4 import BeautifulSoup
 import json
 
-# Load the HTML content
-with open("demagh_tanya.html", "r", encoding="utf-8") as f:
-    html = f.read()
-
-soup = BeautifulSoup(html, "html.parser")
-
-# Find the table with all the plan data
-table = soup.select_one("table.table")
-
-# Extract plan titles (they're in the first row)
-header_row = table.select_one("tr")
-plan_titles = [h5.get_text(strip=True) for h5 in header_row.find_all("h5")]
-
-# Define the row labels we'll map from (6 rows only)
-row_labels = [
-    "data",
-    "units",
-    "apps",
-    "extra_services",
-    "extra_subscriptions"
-]
-
-# Get the actual table rows (skip the header)
-rows = table.select("tr")[1:7]  # we only want the 6 feature rows
-
-# Prepare a column-wise structure: each column is a plan
-columns = list(zip(*[
-    [td.get_text(strip=True) for td in row.find_all("td")]
-    for row in rows
-]))
-
-# Create a dictionary with cleaned format
-plans_data = {}
-for i, title in enumerate(plan_titles):
-    plan_id = f"plan_{i+1}"
-    plans_data[plan_id] = {
-        "name": title,
-        "data": columns[i][0],
-        "units": columns[i][1],
-        "apps": columns[i][2],
-        "extra_services": columns[i][3],
-        "extra_subscriptions": columns[i][4],
-    }
-
-# Save to JSON
-with open("demagh_tanya.json", "w", encoding="utf-8") as f:
-    json.dump(plans_data, f, ensure_ascii=False, indent=2)
-
-print("✅ Data successfully saved to demagh_tanya.json")
\ No newline at end of file
+def extract_demagh_tanya(soup):
+    """Extract the Demagh Tanya plans table from the parsed page into a plan_1..N dictionary."""
+    # Find the table with all the plan data
+    table = soup.select_one("table.table")
+
+    # Extract plan titles (they're in the first row)
+    header_row = table.select_one("tr")
+    plan_titles = [h5.get_text(strip=True) for h5 in header_row.find_all("h5")]
+
+    # Define the row labels we'll map from (6 rows only)
+    row_labels = [
+        "data",
+        "units",
+        "apps",
+        "extra_services",
+        "extra_subscriptions"
+    ]
+
+    # Get the actual table rows (skip the header)
+    rows = table.select("tr")[1:7]  # we only want the 6 feature rows
+
+    # Prepare a column-wise structure: each column is a plan
+    columns = list(zip(*[
+        [td.get_text(strip=True) for td in row.find_all("td")]
+        for row in rows
+    ]))
+
+    # Create a dictionary with cleaned format
+    plans_data = {}
+    for i, title in enumerate(plan_titles):
+        plan_id = f"plan_{i+1}"
+        plans_data[plan_id] = {
+            "name": title,
+            "data": columns[i][0],
+            "units": columns[i][1],
+            "apps": columns[i][2],
+            "extra_services": columns[i][3],
+            "extra_subscriptions": columns[i][4],
+        }
+
+    return plans_data
+
+
+if __name__ == "__main__":
+    # Load the HTML content
+    with open("demagh_tanya.html", "r", encoding="utf-8") as f:
+        html = f.read()
+
+    plans_data = extract_demagh_tanya(BeautifulSoup(html, "html.parser"))
+
+    # Save to JSON
+    with open("demagh_tanya.json", "w", encoding="utf-8") as f:
+        json.dump(plans_data, f, ensure_ascii=False, indent=2)
+
+    print("✅ Data successfully saved to demagh_tanya.json")
@@ -421,9 +421,8 @@ def extract_card_view_data(soup: BeautifulSoup) -> Dict[str, Any]:
     
     return card_data
 
-def scrape_international_calls(html_content: str) -> Dict[str, Any]:
-    """Main scraping function to extract all international calls data."""
-    soup = BeautifulSoup(html_content, 'html.parser')
+def scrape_international_calls(soup: BeautifulSoup) -> Dict[str, Any]:
+    """Main scraping function to extract all international calls data from the parsed page."""
     
     # Extract page title and description
     title_section = soup.find('section', class_='page_title_test')
@@ -495,7 +494,7 @@ def main():
     
     if html_content:
         # Extract data
-        extracted_data = scrape_international_calls(html_content)
+        extracted_data = scrape_international_calls(BeautifulSoup(html_content, 'html.parser'))
         # Save to JSON
         save_to_json(extracted_data)
             
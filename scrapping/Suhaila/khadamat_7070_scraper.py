@@ -10,23 +10,8 @@ def clean_text(text):
     cleaned = re.sub(r'\s+', ' ', text.strip())
     return cleaned
 
-def scrape_7070_services():
-    """Scrape the HTML content and extract service information"""
-    
-    # Read HTML content from file
-    try:
-        with open('Khadamat 7070/page_content.txt', 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        print("Error: page_content.txt file not found. Please save the HTML content to page_content.txt")
-        return
-    except UnicodeDecodeError:
-        # Try with different encoding if UTF-8 fails
-        with open('Khadamat 7070/page_content.txt', 'r', encoding='latin-1') as file:
-            html_content = file.read()
-    
-    # Parse HTML with BeautifulSoup
-    soup = BeautifulSoup(html_content, 'html.parser')
+def extract_7070_services(soup):
+    """Extract service information from the parsed page (soup or shared Document)"""
     
     # Initialize the main data structure
     scraped_data = {
@@ -97,7 +82,25 @@ def scrape_7070_services():
     if app_section:
         app_info = {}
         
-        
+    return scraped_data
+
+def scrape_7070_services():
+    """Scrape the HTML content and extract service information"""
+    
+    # Read HTML content from file
+    try:
+        with open('Khadamat 7070/page_content.txt', 'r', encoding='utf-8') as file:
+            html_content = file.read()
+    except FileNotFoundError:
+        print("Error: page_content.txt file not found. Please save the HTML content to page_content.txt")
+        return
+    except UnicodeDecodeError:
+        # Try with different encoding if UTF-8 fails
+        with open('Khadamat 7070/page_content.txt', 'r', encoding='latin-1') as file:
+            html_content = file.read()
+    
+    scraped_data = extract_7070_services(BeautifulSoup(html_content, 'html.parser'))
+    
     # Save to JSON file
     output_filename = 'Khadamat 7070/e&_7070_services.json'
     try:
@@ -129,19 +129,8 @@ def extract_phone_compatibility(soup) -> Dict[str, Any]:
     
     return phone_compatibility
 
-def scrape_wifi_calling_page():
-    """Main scraping function that combines all data extraction"""
-    
-    # Read HTML file
-    try:
-        with open('Mokalmat Wifi/page_content.txt', 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        print("Error: file not found. Please make sure the file exists.")
-        return None
-    
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+def extract_wifi_calling_data(soup) -> Dict[str, Any]:
+    """Combine all data extraction for the parsed Wi-Fi calling page (soup or shared Document)"""
     
     # Extract page title
     title_h1 = soup.find('h1', class_='GESSTwoBold_font')
@@ -175,6 +164,19 @@ def scrape_wifi_calling_page():
     
     return extracted_data
 
+def scrape_wifi_calling_page():
+    """Main scraping function that combines all data extraction"""
+    
+    # Read HTML file
+    try:
+        with open('Mokalmat Wifi/page_content.txt', 'r', encoding='utf-8') as file:
+            html_content = file.read()
+    except FileNotFoundError:
+        print("Error: file not found. Please make sure the file exists.")
+        return None
+    
+    return extract_wifi_calling_data(BeautifulSoup(html_content, 'html.parser'))
+
 def save_to_json(data, filename):
     """Save extracted data to JSON file"""
     try:
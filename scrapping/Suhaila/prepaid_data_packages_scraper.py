@@ -2,25 +2,11 @@ import json
 from bs4 import BeautifulSoup
 import re
 
-def scrape_prepaid_data_packages():
+def extract_prepaid_data_packages(soup):
     """
-    Scrape prepaid data packages information from HTML file and save to JSON
+    Extract prepaid data packages information from the parsed page (soup or shared Document)
     """
     
-    # Read HTML content from file
-    try:
-        with open('Pre-Paid Data Packages/page_content.txt', 'r', encoding='utf-8') as file:
-            html_content = file.read()
-    except FileNotFoundError:
-        print("Error: page_content.txt file not found!")
-        return
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        return
-    
-    # Parse HTML with BeautifulSoup
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
     # Initialize data structure
     scraped_data = {
         "page_info": {
@@ -184,6 +170,27 @@ def scrape_prepaid_data_packages():
     scraped_data['additional_packages'] = extract_additional_packages()
     scraped_data['package_features'] = extract_package_features()
     
+    return scraped_data
+
+
+def scrape_prepaid_data_packages():
+    """
+    Scrape prepaid data packages information from HTML file and save to JSON
+    """
+    
+    # Read HTML content from file
+    try:
+        with open('Pre-Paid Data Packages/page_content.txt', 'r', encoding='utf-8') as file:
+            html_content = file.read()
+    except FileNotFoundError:
+        print("Error: page_content.txt file not found!")
+        return
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return
+    
+    scraped_data = extract_prepaid_data_packages(BeautifulSoup(html_content, 'html.parser'))
+    
     # Save to JSON file
     try:
         with open('Pre-Paid Data Packages/e&_prepaid_data_packages.json', 'w', encoding='utf-8') as json_file:
@@ -2,9 +2,8 @@ import json
 from bs4 import BeautifulSoup
 import re
 
-def extract_etisalat_data(html_content):
-    """Extract information from Etisalat HTML page using Beautiful Soup"""
-    soup = BeautifulSoup(html_content, 'html.parser')
+def extract_etisalat_data(soup):
+    """Extract information from the parsed Etisalat page (soup or shared Document)"""
     
     extracted_data = {
         "page_url": "https://www.eand.com.eg/StaticFiles/portal2/etisalat/pages/services/out_of_credit.html",
@@ -80,7 +79,7 @@ def main():
     if html_content is None:
         return
     
-    extracted_data = extract_etisalat_data(html_content)
+    extracted_data = extract_etisalat_data(BeautifulSoup(html_content, 'html.parser'))
     save_to_json(extracted_data)
     
     print("Extracted Data:")
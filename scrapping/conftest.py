@@ -0,0 +1,9 @@
+"""Lets the tests import ``pipeline`` and the top-level ``knowledge`` package
+whatever directory pytest runs from."""
+
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
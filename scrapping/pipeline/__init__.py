@@ -0,0 +1,51 @@
+"""Shared scraping pipeline for the e& portal extractors.
+
+Run every registered page extractor at once with::
+
+    cd scrapping
+    python -m pipeline
+"""
+
+from .archive import SnapshotArchive, replay
+from .carousel import carousel_cards, extract_elkart, extract_hekaya
+from .crawler import Crawler, crawl
+from .document import Document, get_document, load_document, parse_bytes
+from .dom_index import DomIndex
+from .http_cache import HttpCache
+from .parsers import available_parsers, default_parser, parse_html
+from .registry import PAGES, get_page, load_extractor, register_page
+from .runner import print_report, run_all, run_page
+from .specs import CompiledSpec, compile_spec, load_spec
+from .strip import iter_strip, strip_file, strip_markup
+
+__all__ = [
+    "SnapshotArchive",
+    "replay",
+    "carousel_cards",
+    "extract_elkart",
+    "extract_hekaya",
+    "Crawler",
+    "crawl",
+    "Document",
+    "DomIndex",
+    "HttpCache",
+    "get_document",
+    "load_document",
+    "parse_bytes",
+    "available_parsers",
+    "default_parser",
+    "parse_html",
+    "PAGES",
+    "get_page",
+    "load_extractor",
+    "register_page",
+    "print_report",
+    "run_all",
+    "run_page",
+    "CompiledSpec",
+    "compile_spec",
+    "load_spec",
+    "iter_strip",
+    "strip_file",
+    "strip_markup",
+]
@@ -0,0 +1,33 @@
+"""Command line entry point: ``python -m pipeline [page ...]``."""
+
+import argparse
+import os
+import sys
+import time
+
+from .registry import PAGES, resolve_path
+from .runner import print_report, run_all
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Refresh all e& page extractors in parallel")
+    parser.add_argument("pages", nargs="*", help="registry names to run (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    parser.add_argument("--no-save", action="store_true", help="do not write output JSON files")
+    parser.add_argument("--list", action="store_true", help="list registered pages and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, page in PAGES.items():
+            missing = "" if os.path.exists(resolve_path(page["snapshot"])) else "  (no snapshot)"
+            print(f"{name:<28} {page['url']}{missing}")
+        return 0
+
+    start = time.perf_counter()
+    results = run_all(args.pages, workers=args.workers, save=not args.no_save)
+    print_report(results, time.perf_counter() - start)
+    return 0 if all(r["ok"] or r["skipped"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
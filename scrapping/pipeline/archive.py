@@ -0,0 +1,213 @@
+"""Append-only, compressed archive of every fetched page snapshot.
+
+Raw pages used to live as loose text files that were read whole and
+overwritten on each refresh. The archive keeps every version instead:
+
+    snapshots.dat    zlib-compressed bodies, appended back to back
+    snapshots.idx    one JSON line per record: url, fetched_at, offset,
+                     length, size and sha256 of the raw body
+
+Records are only appended, so a crash can at worst leave a tail that the
+index does not point at, or half an index line, which is dropped on open. Reads go through an ``mmap`` of the data file and
+decompress just the requested record, which makes re-running extractors
+over months of history a matter of disk speed - no network, and no
+whole-file reads::
+
+    python -m pipeline.archive add "Mohy/Emerlad Family.txt" --url https://...
+    python -m pipeline.archive list
+    python -m pipeline.archive replay demagh_tanya --no-save
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+from .registry import PAGES, SCRAPPING_DIR, resolve_path
+
+DEFAULT_ARCHIVE = os.path.join(SCRAPPING_DIR, "archive", "snapshots")
+
+
+class SnapshotArchive:
+    """Compressed snapshots indexed by (url, fetch time)."""
+
+    def __init__(self, path: str = DEFAULT_ARCHIVE, level: int = 6):
+        self.data_path = path + ".dat"
+        self.index_path = path + ".idx"
+        self.level = level
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # url -> records sorted by fetch time
+        self.records: Dict[str, List[Dict[str, Any]]] = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+            complete = raw.rfind(b"\n") + 1
+            for line in raw[:complete].decode("utf-8").splitlines():
+                if line.strip():
+                    self._add_record(json.loads(line))
+            if complete < len(raw):
+                # A crash mid-write left half an index line; its data is orphaned
+                with open(self.index_path, "r+b") as f:
+                    f.truncate(complete)
+        self._map: Optional[mmap.mmap] = None
+        self._map_file = None
+
+    def _add_record(self, record: Dict[str, Any]) -> None:
+        history = self.records.setdefault(record["url"], [])
+        history.append(record)
+        if len(history) > 1 and history[-2]["fetched_at"] > record["fetched_at"]:
+            history.sort(key=lambda r: r["fetched_at"])
+
+    def append(self, url: str, body: bytes, fetched_at: Optional[float] = None) -> Dict[str, Any]:
+        """Store a snapshot; a body identical to the latest one is not stored twice."""
+        digest = hashlib.sha256(body).hexdigest()
+        history = self.records.get(url)
+        if history and history[-1]["sha256"] == digest:
+            return history[-1]
+
+        compressed = zlib.compress(body, self.level)
+        with open(self.data_path, "ab") as f:
+            offset = f.tell()
+            f.write(compressed)
+        record = {
+            "url": url,
+            "fetched_at": time.time() if fetched_at is None else fetched_at,
+            "offset": offset,
+            "length": len(compressed),
+            "size": len(body),
+            "sha256": digest,
+        }
+        # The index line is written after the data, so it never points past it
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._add_record(record)
+        return record
+
+    def _view(self, end: int) -> mmap.mmap:
+        """Read-only map of the data file, remapped once the file has grown."""
+        if self._map is None or len(self._map) < end:
+            self.close()
+            self._map_file = open(self.data_path, "rb")
+            self._map = mmap.mmap(self._map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def read(self, record: Dict[str, Any]) -> bytes:
+        """Decompress one record's body."""
+        start = record["offset"]
+        end = start + record["length"]
+        return zlib.decompress(self._view(end)[start:end])
+
+    def find(self, url: str, at: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Latest record of ``url`` fetched at or before ``at`` (default: latest)."""
+        chosen = None
+        for record in self.records.get(url, []):
+            if at is not None and record["fetched_at"] > at:
+                break
+            chosen = record
+        return chosen
+
+    def get(self, url: str, at: Optional[float] = None) -> Optional[bytes]:
+        record = self.find(url, at)
+        return self.read(record) if record else None
+
+    def history(self, url: str) -> List[Dict[str, Any]]:
+        return list(self.records.get(url, []))
+
+    def iter_records(self, url: Optional[str] = None, since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Records in fetch-time order, optionally for one URL or after ``since``."""
+        urls = [url] if url else list(self.records)
+        records = [r for u in urls for r in self.records.get(u, [])
+                   if since is None or r["fetched_at"] >= since]
+        return iter(sorted(records, key=lambda r: (r["fetched_at"], r["offset"])))
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._map_file is not None:
+            self._map_file.close()
+            self._map_file = None
+
+    def __enter__(self) -> "SnapshotArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def replay(archive: SnapshotArchive, names: Optional[List[str]] = None,
+           since: Optional[float] = None, save: bool = False) -> List[Dict[str, Any]]:
+    """Re-run extractors over every archived version of their pages.
+
+    ``save`` writes each result to the page's output file, so with several
+    versions the latest one wins.
+    """
+    from .runner import run_page
+
+    results = []
+    for name in names or list(PAGES):
+        page = PAGES[name]
+        for record in archive.iter_records(page["url"], since=since):
+            result = run_page(name, page, save=save, body=archive.read(record))
+            result["fetched_at"] = record["fetched_at"]
+            results.append(result)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the raw snapshot archive")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE, help="archive path without extension")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="archive saved snapshot files")
+    add.add_argument("files", nargs="*", help="snapshot files (default: every registered snapshot)")
+    add.add_argument("--url", default=None, help="URL of the page (default: looked up in the registry)")
+
+    commands.add_parser("list", help="show archived URLs and versions")
+
+    replay_cmd = commands.add_parser("replay", help="re-run extractors over archived versions")
+    replay_cmd.add_argument("pages", nargs="*", help="registry names (default: all)")
+    replay_cmd.add_argument("--since", type=float, default=None, help="only versions fetched after this unix time")
+    replay_cmd.add_argument("--no-save", action="store_true", help="do not write output JSON files")
+    args = parser.parse_args(argv)
+
+    with SnapshotArchive(args.archive) as archive:
+        if args.command == "add":
+            by_snapshot = {page["snapshot"]: page["url"] for page in PAGES.values()}
+            files = args.files or list(by_snapshot)
+            for path in files:
+                url = args.url or by_snapshot.get(path)
+                if not url:
+                    print(f"❌ {path}: not in the registry, pass --url")
+                    continue
+                try:
+                    with open(resolve_path(path), "rb") as f:
+                        body = f.read()
+                    fetched_at = os.path.getmtime(resolve_path(path))
+                except FileNotFoundError:
+                    print(f"❌ {path}: not found")
+                    continue
+                record = archive.append(url, body, fetched_at=fetched_at)
+                print(f"{path}: {record['size']:,} -> {record['length']:,} bytes")
+
+        elif args.command == "list":
+            for url, history in archive.records.items():
+                stored = sum(r["length"] for r in history)
+                print(f"{len(history):>4} versions {stored:>12,} bytes  {url}")
+
+        else:
+            from .runner import print_report
+            results = replay(archive, args.pages or None, since=args.since, save=not args.no_save)
+            print_report(results)
+            return 0 if all(r["ok"] for r in results) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Static extraction of slick-carousel plan cards from a saved page source.
+
+The Hekaya and El Kart notebooks drive Chrome and click ``slick-next`` once
+per card to reveal each plan, but a slick carousel already ships every card
+in the page source - plus ``slick-cloned`` copies used for infinite
+scrolling. ``carousel_cards`` reads all cards of a container in one pass,
+drops the clones and de-duplicates any remaining identical cards, so a
+plan refresh is a parse instead of minutes of browser time.
+
+``extract_hekaya`` and ``extract_elkart`` produce the same shapes as
+``Mayar/etisalat_hekaya.json`` and ``Soha/akwa_full_page.json``.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup, Tag
+
+CLONE_CLASS = "slick-cloned"
+
+# El Kart tab buttons (data-target) -> the container holding their cards
+ELKART_TABS = {
+    "akwa_tab": "Cards_tab",
+    "flat_tab": "Cards_tab2",
+    "daily_tab": "Cards_tab3",
+    "menu_tab": "Cards_tab4",
+}
+
+
+def _root(page: Any) -> Tag:
+    """Accept raw HTML, a BeautifulSoup tree or a pipeline Document."""
+    if isinstance(page, str):
+        return BeautifulSoup(page, "html.parser")
+    if isinstance(page, Tag):
+        return page
+    return page.soup
+
+
+def _text(element: Optional[Tag]) -> Optional[str]:
+    """Visible text of an element, one line per block, like Selenium's .text."""
+    if element is None:
+        return None
+    return element.get_text("\n", strip=True)
+
+
+def is_clone(card: Tag, stop: Optional[Tag] = None) -> bool:
+    """True if the card, or a slide wrapping it, is a slick clone."""
+    element = card
+    while element is not None and element is not stop:
+        if CLONE_CLASS in (element.get("class") or []):
+            return True
+        element = element.parent
+    return False
+
+
+def carousel_cards(container: Optional[Tag], selector: str = "div.card") -> List[Tag]:
+    """All cards inside ``container``, without slick clones or duplicates."""
+    if container is None:
+        return []
+    cards = []
+    seen = set()
+    for card in container.select(selector):
+        if is_clone(card, stop=container):
+            continue
+        # Pages saved before slick initialised have no clone markers, and
+        # some carousels repeat a card by hand - key on the visible text
+        signature = " ".join(card.stripped_strings)
+        if not signature or signature in seen:
+            continue
+        seen.add(signature)
+        cards.append(card)
+    return cards
+
+
+def _list_items(card: Tag) -> List[Tag]:
+    ul = card.select_one("ul.list-group-flush")
+    return ul.find_all("li", recursive=False) if ul else []
+
+
+def _positional(items: List[Tag], keys: List[str]) -> Dict[str, Optional[str]]:
+    return {key: _text(items[i]) if i < len(items) else None for i, key in enumerate(keys)}
+
+
+def extract_hekaya(page: Any) -> Dict[str, Any]:
+    """Extract every Hekaya plan tab from the saved hekaya.html source."""
+    soup = _root(page)
+
+    monthly_tab = []
+    for card in carousel_cards(soup.find(id="monthly_tab")):
+        record = {
+            "plan_name": _text(card.select_one("h5.plan-name")),
+            "plan_price": _text(card.select_one("h5.plan-price")),
+            "plan_hint": _text(card.select_one("span.plan-hint")),
+        }
+        record.update(_positional(_list_items(card), [
+            "included_mixes", "favorite_numbers", "renewal_reward", "included_apps",
+            "family_offer", "home_internet", "included_subscriptions", "activation_code",
+        ]))
+        if record["plan_name"]:
+            monthly_tab.append(record)
+
+    weekly_tab = []
+    for card in carousel_cards(soup.find(id="weekly_tab")):
+        record = {
+            "plan_name": _text(card.select_one("h5.plan-name")),
+            "plan_hint": _text(card.select_one("h5.plan-hint")),
+        }
+        record.update(_positional(_list_items(card), [
+            "included_mixes", "included_apps", "validity_period",
+            "recharge_code", "renewal_code", "social_megabytes",
+        ]))
+        if record["plan_name"]:
+            weekly_tab.append(record)
+
+    connect_tab = []
+    for card in carousel_cards(soup.select_one("div.tabsContainer-two")):
+        items = _list_items(card)
+        first = items[0] if items else None
+        connect_tab.append({
+            "plan_name": _text(card.select_one("h5.plan-name")),
+            "included_megabytes": _text(first.select_one("p.fs-16")) if first else None,
+            "plan_hint": _text(first.select_one("span.plan-hint")) if first else None,
+            "etisalat_minutes": _text(items[1]) if len(items) > 1 else None,
+            "plan_price": _text(items[2].select_one("h5.plan-price")) if len(items) > 2 else None,
+        })
+
+    extra_tab = []
+    for card in carousel_cards(soup.select_one("div.tabsContainersExtra")):
+        items = _list_items(card)
+        extra_tab.append({
+            "plan_name": _text(card.select_one("h5.plan-name")),
+            "plan_price": _text(card.select_one("h5.plan-price")),
+            "plan_hint": _text(card.select_one("span.plan-hint")),
+            "extra_mixes": _text(items[0].select_one("p.fs-16")) if items else None,
+            "activation_code": _text(items[1].select_one("p.dir-ltr")) if len(items) > 1 else None,
+        })
+
+    exchange_tab = []
+    for box in soup.select("section#for_textContainer div.text-container"):
+        rows = box.select("div.my-3.d-flex.justify-content-between")
+        exchange_tab.append({
+            "total_gb": _text(box.select_one("div.title > h5")),
+            "description": _text(box.select_one("div.title > p")),
+            "available_for": _text(box.select_one("div.my-3 > h6")),
+            "daytime_gb": _text(rows[0].find("h6")) if rows else None,
+            "daytime_note": _text(rows[0].find("p")) if rows else None,
+            "nighttime_gb": _text(rows[1].find("h6")) if len(rows) > 1 else None,
+            "nighttime_note": _text(rows[1].find("p")) if len(rows) > 1 else None,
+        })
+
+    codes_tab = [
+        {
+            "ussd_code": _text(code.find("h4")),
+            "description": _text(code.select_one("div[class*=ff-suissintl]")),
+        }
+        for code in soup.select("section#for_codes div[class*=code]")
+    ]
+
+    features_terms_tab = [
+        {"step_number": _text(item.find("span")), "text": _text(item.find("p"))}
+        for item in soup.select("section#for_features_and_terms div.d-flex")
+    ]
+
+    return {
+        "package_name": "حكاية",
+        "monthly_tab": monthly_tab,
+        "weekly_tab": weekly_tab,
+        "connect_tab": connect_tab,
+        "extra_tab": extra_tab,
+        "exchange_tab": exchange_tab,
+        "codes_tab": codes_tab,
+        "features_terms_tab": features_terms_tab,
+    }
+
+
+def extract_elkart(page: Any) -> Dict[str, Any]:
+    """Extract every El Kart tab's offers from the saved elkart_prepaid.html source.
+
+    The notebook re-read the terms after clicking each tab; in the static
+    source the terms block is shared, so it is reported once per tab.
+    """
+    soup = _root(page)
+
+    title = soup.select_one("h1.GESSTwoBold_font")
+    description = soup.select_one("p.fs-14.grey-color")
+
+    terms = []
+    terms_box = soup.select_one("#Terms .row.text-container.white-readAbout-sec.box-shadow")
+    if terms_box:
+        for block in terms_box.select("div.col-sm-12"):
+            text = block.select_one("p")
+            if text:
+                terms.append(text.get_text(strip=True))
+
+    tabs = {}
+    for button in soup.select("div.tabs-buttons button"):
+        container_id = ELKART_TABS.get(button.get("data-target"))
+        if not container_id:
+            continue
+
+        offers = []
+        for card in carousel_cards(soup.find(id=container_id), "div.item"):
+            name_tag = card.select_one("h5.plan-name")
+            price_tag = card.select_one("h5.plan-price")
+
+            details = {}
+            for li in card.select("li.list-group-item"):
+                label_tag = li.select_one("small")
+                value_tag = li.select_one("p.fs-16")
+                label = label_tag.get_text(strip=True).replace(" ", "") if label_tag else ""
+                value = value_tag.get_text(strip=True).replace(" ", "") if value_tag else ""
+                if label or value:
+                    details[label] = value
+
+            offers.append({
+                "price": price_tag.get_text(strip=True).replace(" ", "") if price_tag else "",
+                "plan_name": name_tag.get_text(strip=True) if name_tag else "",
+                "details": details,
+            })
+
+        tabs[button.get_text(strip=True)] = {
+            "offers": offers,
+            "الشروط والاحكام": terms,
+        }
+
+    return {
+        "page_title": title.get_text(strip=True) if title else "",
+        "page_description": description.get_text(strip=True) if description else "",
+        "الانظمة": tabs,
+    }
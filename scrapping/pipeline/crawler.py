@@ -0,0 +1,269 @@
+"""Concurrent crawler for a full refresh of the e& portal.
+
+``FayrouzMohamed/etisalat_scraped_data.json`` was collected one page at a
+time, so a refresh cost one round trip per page back to back. ``Crawler``
+starts from the portal index instead and keeps ``concurrency`` requests in
+flight over a pooled keep-alive ``aiohttp`` session (at most ``per_host``
+connections per host). A de-duplicated frontier makes sure each URL is
+fetched once, and every fetched page that is in the registry is handed
+straight to its extractor in a process pool while the crawl goes on.
+
+Crawl the live portal, or a local static mirror of the saved pages::
+
+    python -m pipeline.crawler
+    python -m http.server 8000 --directory tests/mirror/ &
+    python -m pipeline.crawler http://127.0.0.1:8000/index.html --no-save
+
+Pages are matched to the registry by their path below the crawl root, so a
+mirror laid out like the portal (``pages/plans/demagh_tanya.html``) runs
+the same extractors as the live site.
+
+With an ``HttpCache`` (the default from the command line) requests are
+conditional, and pages that come back ``304`` or with an unchanged body
+are not extracted again. A registry page only enters the cache once its
+extractor succeeded and the output was saved, so a crawl with
+``--no-save``/``--no-extract`` or a failed extraction does not stop the
+next crawl from extracting it. With a ``SnapshotArchive`` every changed body is
+also appended to the archive under its portal URL.
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+try:
+    import aiohttp
+except ImportError:  # only needed when actually crawling
+    aiohttp = None
+
+from .archive import SnapshotArchive
+from .http_cache import HttpCache
+from .registry import PAGES, PORTAL_URL
+from .runner import print_report, run_page
+
+START_URL = PORTAL_URL + "index.html"
+
+# Links are pulled from the raw bytes; building a tree just for hrefs
+# would cost more than the extraction itself
+_HREF = re.compile(rb"""<a\b[^>]*?\bhref\s*=\s*["']([^"'<>\s]+)["']""", re.IGNORECASE)
+_PAGE_SUFFIXES = (".html", ".htm", "/")
+
+
+def normalise_url(url: str) -> str:
+    """Canonical form used for de-duplication: no fragment, lower-case host."""
+    url, _ = urldefrag(url.strip())
+    parts = urlsplit(url)
+    netloc = parts.netloc.lower()
+    return parts._replace(scheme=parts.scheme.lower(), netloc=netloc).geturl()
+
+
+def extract_links(body: bytes, base_url: str) -> List[str]:
+    """Absolute URLs of every ``<a href>`` in a page body."""
+    links = []
+    for match in _HREF.finditer(body):
+        href = match.group(1).decode("utf-8", errors="ignore")
+        if href.startswith(("#", "javascript:", "mailto:", "tel:")):
+            continue
+        links.append(normalise_url(urljoin(base_url, href)))
+    return links
+
+
+class Crawler:
+    """Breadth-first crawl of everything below ``root`` with bounded concurrency."""
+
+    def __init__(self, start_url: str = START_URL, root: Optional[str] = None,
+                 max_pages: int = 500, concurrency: int = 16, per_host: int = 4,
+                 timeout: float = 30.0, extract: bool = True, save: bool = True,
+                 workers: Optional[int] = None, cache: Optional[HttpCache] = None,
+                 archive: Optional[SnapshotArchive] = None):
+        self.start_url = normalise_url(start_url)
+        self.root = root or self.start_url.rsplit("/", 1)[0] + "/"
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.extract = extract
+        self.save = save
+        self.workers = workers
+        self.cache = cache
+        self.archive = archive
+
+        # Registry pages keyed by their path below the portal root
+        self.registry_paths = {
+            page["url"][len(PORTAL_URL):]: name
+            for name, page in PAGES.items() if page["url"].startswith(PORTAL_URL)
+        }
+        self.seen = set()
+        self.fetched: List[Dict[str, Any]] = []
+        self.extracted: List[Dict[str, Any]] = []
+
+    def in_scope(self, url: str) -> bool:
+        if not url.startswith(self.root):
+            return False
+        path = url[len(self.root):].split("?")[0]
+        return path == "" or path.endswith(_PAGE_SUFFIXES)
+
+    def registry_name(self, url: str) -> Optional[str]:
+        if not url.startswith(self.root):
+            return None
+        return self.registry_paths.get(url[len(self.root):].split("?")[0])
+
+    def portal_url(self, url: str) -> str:
+        """The live portal URL of a page, also when crawling a mirror."""
+        if url.startswith(self.root):
+            return PORTAL_URL + url[len(self.root):]
+        return url
+
+    def _enqueue(self, queue: asyncio.Queue, url: str) -> None:
+        if url in self.seen or len(self.seen) >= self.max_pages or not self.in_scope(url):
+            return
+        self.seen.add(url)
+        queue.put_nowait(url)
+
+    async def fetch(self, session: Any, url: str) -> Tuple[int, bytes, Dict[str, str]]:
+        """GET one URL (conditionally, if cached) and return (status, body, headers).
+
+        Header names are lower-cased, as HTTP/2 servers send them, so plain
+        dict lookups work whatever case the server used.
+        """
+        headers = self.cache.conditional_headers(url) if self.cache is not None else None
+        async with session.get(url, headers=headers) as response:
+            body = await response.read()
+            return response.status, body, {name.lower(): value for name, value in response.headers.items()}
+
+    async def _extract(self, pool: ProcessPoolExecutor, name: str, url: str, body: bytes,
+                       digest: Optional[str], headers: Dict[str, str]) -> Dict[str, Any]:
+        """Run a registry page's extractor; cache the response only once the output is saved."""
+        result = await asyncio.get_running_loop().run_in_executor(
+            pool, run_page, name, PAGES[name], self.save, body)
+        if self.cache is not None and digest is not None and result["ok"] and self.save:
+            self.cache.record(url, digest, headers)
+        return result
+
+    async def _worker(self, session: Any, queue: asyncio.Queue,
+                      pool: Optional[ProcessPoolExecutor], pending: List[asyncio.Future]) -> None:
+        while True:
+            url = await queue.get()
+            record = {"url": url, "status": 0, "bytes": 0, "seconds": 0.0, "page": None,
+                      "unchanged": False, "error": ""}
+            start = time.perf_counter()
+            try:
+                status, body, headers = await self.fetch(session, url)
+                record["status"] = status
+                record["bytes"] = len(body)
+                changed = True
+                digest = None
+                if self.cache is not None:
+                    if status == 304:
+                        # Not modified: crawl on from the cached copy
+                        body = self.cache.body(url) or b""
+                        self.cache.touch(url, headers)
+                        changed = False
+                    elif status == 200:
+                        digest = self.cache.store_body(body)
+                        changed = self.cache.changed(url, digest)
+                record["unchanged"] = not changed
+                if self.archive is not None and status == 200 and changed:
+                    self.archive.append(self.portal_url(url), body)
+                name = None
+                if status in (200, 304) and "html" in headers.get("content-type", "text/html"):
+                    for link in extract_links(body, url):
+                        self._enqueue(queue, link)
+                    name = self.registry_name(url)
+                    record["page"] = name
+                if name and pool is not None and changed:
+                    pending.append(asyncio.ensure_future(
+                        self._extract(pool, name, url, body, digest, headers)))
+                elif digest is not None and (not name or not changed):
+                    self.cache.record(url, digest, headers)
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {e}"
+            record["seconds"] = time.perf_counter() - start
+            self.fetched.append(record)
+            queue.task_done()
+
+    async def run(self) -> List[Dict[str, Any]]:
+        """Crawl until the frontier is empty; returns one record per fetched URL."""
+        if aiohttp is None:
+            raise ImportError("The crawler needs aiohttp: pip install aiohttp")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        self._enqueue(queue, self.start_url)
+        pending: List[asyncio.Future] = []
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.extract else None
+        try:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                tasks = [asyncio.create_task(self._worker(session, queue, pool, pending))
+                         for _ in range(self.concurrency)]
+                await queue.join()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            self.extracted = list(await asyncio.gather(*pending))
+        finally:
+            if self.cache is not None:
+                self.cache.save()
+            if pool is not None:
+                pool.shutdown()
+        return self.fetched
+
+
+def crawl(start_url: str = START_URL, **options) -> Crawler:
+    """Run a crawl to completion and return the finished Crawler."""
+    crawler = Crawler(start_url, **options)
+    asyncio.run(crawler.run())
+    return crawler
+
+
+def print_crawl_report(crawler: Crawler, total_seconds: float) -> None:
+    """Print fetch totals and throughput, then the extractor report."""
+    failed = [r for r in crawler.fetched if r["error"] or r["status"] not in (200, 304)]
+    unchanged = sum(1 for r in crawler.fetched if r["unchanged"])
+    total_bytes = sum(r["bytes"] for r in crawler.fetched)
+    print(f"fetched {len(crawler.fetched)} urls, {total_bytes / 1e6:.2f} MB "
+          f"in {total_seconds:.2f}s ({total_bytes / 1e6 / max(total_seconds, 1e-9):.2f} MB/s), "
+          f"{unchanged} unchanged")
+    for r in failed:
+        print(f"❌ {r['url']}: {r['error'] or r['status']}")
+    if crawler.extracted:
+        print()
+        print_report(sorted(crawler.extracted, key=lambda r: r["seconds"], reverse=True))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Crawl the e& portal and refresh every registered page")
+    parser.add_argument("start_url", nargs="?", default=START_URL, help="page to start from")
+    parser.add_argument("--root", default=None, help="only follow links below this URL")
+    parser.add_argument("--max-pages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight")
+    parser.add_argument("--per-host", type=int, default=4, help="connections per host")
+    parser.add_argument("--no-extract", action="store_true", help="only fetch, do not run extractors")
+    parser.add_argument("--no-save", action="store_true", help="do not write output JSON files")
+    parser.add_argument("--cache-dir", default=None, help="HTTP cache directory (default: scrapping/.http_cache)")
+    parser.add_argument("--no-cache", action="store_true", help="always download and extract every page")
+    parser.add_argument("--archive", default=None, help="append changed pages to this snapshot archive")
+    args = parser.parse_args(argv)
+
+    cache = None
+    if not args.no_cache:
+        cache = HttpCache(args.cache_dir) if args.cache_dir else HttpCache()
+
+    start = time.perf_counter()
+    crawler = crawl(args.start_url, root=args.root, max_pages=args.max_pages,
+                    concurrency=args.concurrency, per_host=args.per_host,
+                    extract=not args.no_extract, save=not args.no_save, cache=cache,
+                    archive=SnapshotArchive(args.archive) if args.archive else None)
+    print_crawl_report(crawler, time.perf_counter() - start)
+    return 0 if all(r["ok"] for r in crawler.extracted) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
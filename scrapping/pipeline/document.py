@@ -0,0 +1,170 @@
+"""Parse-once page documents shared by every extractor of a snapshot.
+
+A ``Document`` wraps one saved page. The HTML is parsed the first time any
+extractor asks for it and the tree is reused afterwards, and repeated
+top-level lookups such as ``find_all('section', id='for_features_and_terms')``
+are memoised. Simple id/class/tag lookups are answered from a ``DomIndex``
+built in one walk of the tree. Documents are cached by the SHA-256 of their
+content, so the same snapshot costs one parse no matter how many extractors
+read it.
+
+A Document can be built with a specific parser backend and, in targeted
+mode, only for the subtrees its extractors declare (see ``parsers``).
+
+``Document`` mirrors the ``find``/``find_all``/``select``/``select_one``
+methods of ``BeautifulSoup`` so it can be passed anywhere a soup is expected.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from .dom_index import DomIndex
+from .parsers import parse_html
+from .strip import strip_markup
+
+# How many parsed snapshots to keep alive per process
+MAX_CACHED_DOCUMENTS = 16
+
+_cache: "OrderedDict[str, Document]" = OrderedDict()
+
+
+def content_hash(html: str) -> str:
+    """SHA-256 of the page text, used as the cache key."""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def _lookup_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[Tuple]:
+    """Build a hashable memo key, or None when the query is not cacheable."""
+    try:
+        key = (args, tuple(sorted(
+            (k, tuple(sorted(v.items())) if isinstance(v, dict) else v)
+            for k, v in kwargs.items()
+        )))
+        hash(key)
+        return key
+    except TypeError:
+        # Lists, callables etc. - just run the query every time
+        return None
+
+
+class Document:
+    """A page snapshot parsed once and shared by all of its extractors."""
+
+    def __init__(self, html: str, url: str = "", digest: Optional[str] = None,
+                 parser: Optional[str] = None, targets: Optional[Iterable[str]] = None):
+        self.html = html
+        self.url = url
+        self.digest = digest or content_hash(html)
+        self.parser = parser
+        self.targets = tuple(targets) if targets else ()
+        self._soup: Optional[BeautifulSoup] = None
+        self._index: Optional[DomIndex] = None
+        self._memo: Dict[Tuple[str, Tuple], Any] = {}
+        self.parse_count = 0
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = parse_html(self.html, self.parser, self.targets)
+            self.parse_count += 1
+        return self._soup
+
+    @property
+    def index(self) -> DomIndex:
+        if self._index is None:
+            self._index = DomIndex(self.soup)
+        return self._index
+
+    def _memoised(self, method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        key = _lookup_key(args, kwargs)
+        if key is None:
+            return getattr(self.soup, method)(*args, **kwargs)
+        memo_key = (method, key)
+        if memo_key not in self._memo:
+            self._memo[memo_key] = getattr(self.soup, method)(*args, **kwargs)
+        return self._memo[memo_key]
+
+    def find_all(self, *args, **kwargs) -> List[Any]:
+        matches = self.index.lookup(*args, **kwargs)
+        if matches is not None:
+            return matches
+        return self._memoised("find_all", args, kwargs)
+
+    def find(self, *args, **kwargs) -> Any:
+        matches = self.index.lookup(*args, limit=1, **kwargs) if "limit" not in kwargs else None
+        if matches is not None:
+            return matches[0] if matches else None
+        return self._memoised("find", args, kwargs)
+
+    def select(self, *args, **kwargs) -> List[Any]:
+        return self._memoised("select", args, kwargs)
+
+    def select_one(self, *args, **kwargs) -> Any:
+        return self._memoised("select_one", args, kwargs)
+
+    def get_text(self, *args, **kwargs) -> str:
+        return self.soup.get_text(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<Document {self.url or '(no url)'} {self.digest[:12]}>"
+
+
+def get_document(html: str, url: str = "", parser: Optional[str] = None,
+                 targets: Optional[Iterable[str]] = None) -> Document:
+    """Return the cached Document for this content, parsing it at most once.
+
+    A targeted Document only holds part of the page, so the cache key also
+    includes the parser and the target selectors.
+    """
+    digest = content_hash(html)
+    targets = tuple(targets) if targets else ()
+    key = f"{digest}|{parser or ''}|{','.join(targets)}"
+    document = _cache.get(key)
+    if document is not None:
+        _cache.move_to_end(key)
+        if url and not document.url:
+            document.url = url
+        return document
+
+    document = Document(html, url=url, digest=digest, parser=parser, targets=targets)
+    _cache[key] = document
+    while len(_cache) > MAX_CACHED_DOCUMENTS:
+        _cache.popitem(last=False)
+    return document
+
+
+def load_document(path: str, url: str = "", parser: Optional[str] = None,
+                  targets: Optional[Iterable[str]] = None, slim: bool = True,
+                  strip_layout: bool = False) -> Document:
+    """Read a saved snapshot and return its shared Document.
+
+    Unless ``slim`` is False, scripts, styles and other markup no extractor
+    reads are stripped from the bytes before anything is parsed; inline
+    styles and whitespace runs only with ``strip_layout``.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return parse_bytes(data, url=url, parser=parser, targets=targets, slim=slim,
+                       strip_layout=strip_layout)
+
+
+def parse_bytes(data: bytes, url: str = "", parser: Optional[str] = None,
+                targets: Optional[Iterable[str]] = None, slim: bool = True,
+                strip_layout: bool = False) -> Document:
+    """Return the shared Document for a page body fetched or read as bytes.
+
+    Line endings are normalised the way a text-mode ``open`` does, so
+    extractors see the same text as when a scraper reads its file itself.
+    """
+    if slim:
+        data = strip_markup(data, strip_layout)
+    html = data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+    return get_document(html, url=url, parser=parser, targets=targets)
+
+
+def clear_cache() -> None:
+    """Drop every cached Document."""
+    _cache.clear()
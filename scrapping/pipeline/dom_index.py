@@ -0,0 +1,121 @@
+"""Id / class / tag index over a parsed page.
+
+``DomIndex`` walks the tree once and records every element under its tag
+name, each of its class tokens and its id, in document order. Simple
+selector lookups - ``find_all('div', class_='tab-pane')``,
+``find('section', {'id': 'for_table'})``, ``find_all(['h5', 'h6'])`` - are
+then answered from those lists instead of re-walking the whole tree.
+
+Queries the index cannot answer exactly (regex or callable filters, text
+matches, non-recursive searches, other attributes) return ``None`` from
+``lookup`` so the caller can fall back to BeautifulSoup.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from bs4 import Tag
+
+_SUPPORTED_KWARGS = {"class_", "id"}
+
+
+class DomIndex:
+    """Element lists keyed by id, class token and tag name."""
+
+    def __init__(self, root: Tag):
+        self.by_id: Dict[str, List[Tag]] = {}
+        self.by_class: Dict[str, List[Tag]] = {}
+        self.by_tag: Dict[str, List[Tag]] = {}
+        self.order: Dict[int, int] = {}
+
+        # One walk over the tree fills every index
+        for position, element in enumerate(root.descendants):
+            if not isinstance(element, Tag):
+                continue
+            self.order[id(element)] = position
+            self.by_tag.setdefault(element.name, []).append(element)
+            element_id = element.get("id")
+            if element_id:
+                self.by_id.setdefault(element_id, []).append(element)
+            for token in _class_tokens(element):
+                self.by_class.setdefault(token, []).append(element)
+
+    def ids(self, element_id: str) -> List[Tag]:
+        return self.by_id.get(element_id, [])
+
+    def classes(self, token: str) -> List[Tag]:
+        return self.by_class.get(token, [])
+
+    def tags(self, name: str) -> List[Tag]:
+        return self.by_tag.get(name, [])
+
+    def lookup(self, name: Any = None, attrs: Any = None, recursive: bool = True,
+               string: Any = None, limit: Optional[int] = None,
+               **kwargs: Any) -> Optional[List[Tag]]:
+        """Answer a ``find_all``-style query, or return None if unsupported."""
+        if not recursive or string is not None or kwargs.keys() - _SUPPORTED_KWARGS:
+            return None
+
+        wanted_id = kwargs.get("id")
+        wanted_class = kwargs.get("class_")
+        if attrs:
+            if not isinstance(attrs, dict) or attrs.keys() - {"id", "class"}:
+                return None
+            wanted_id = attrs.get("id", wanted_id)
+            wanted_class = attrs.get("class", wanted_class)
+
+        if isinstance(name, str):
+            names = [name]
+        elif isinstance(name, (list, tuple)) and all(isinstance(n, str) for n in name):
+            names = list(name)
+        elif name is None:
+            names = None
+        else:
+            return None
+        for value in (wanted_id, wanted_class):
+            if value is not None and not isinstance(value, str):
+                return None
+
+        # Start from the smallest candidate list and filter the rest
+        if wanted_id is not None:
+            candidates = self.ids(wanted_id)
+        elif wanted_class is not None:
+            candidates = self.classes(wanted_class.split()[0]) if wanted_class.strip() else []
+        elif names is not None:
+            candidates = self._tags_in_order(names)
+        else:
+            return None
+
+        matches = []
+        for element in candidates:
+            if names is not None and element.name not in names:
+                continue
+            if wanted_class is not None and not _class_matches(element, wanted_class):
+                continue
+            matches.append(element)
+            if limit and len(matches) >= limit:
+                break
+        return matches
+
+    def _tags_in_order(self, names: List[str]) -> List[Tag]:
+        if len(names) == 1:
+            return self.tags(names[0])
+        merged = [element for n in set(names) for element in self.tags(n)]
+        merged.sort(key=lambda element: self.order[id(element)])
+        return merged
+
+
+def _class_tokens(element: Tag) -> List[str]:
+    value = element.get("class")
+    if not value:
+        return []
+    if isinstance(value, str):
+        return value.split()
+    return list(value)
+
+
+def _class_matches(element: Tag, wanted: str) -> bool:
+    """Mirror BeautifulSoup's class_ matching: one token, or the full class string."""
+    tokens = _class_tokens(element)
+    if " " in wanted:
+        return " ".join(tokens) == wanted
+    return wanted in tokens
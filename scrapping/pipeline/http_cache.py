@@ -0,0 +1,110 @@
+"""On-disk HTTP cache with conditional requests for cheap periodic refreshes.
+
+For every URL the cache keeps the ``ETag`` and ``Last-Modified`` validators
+and a sha256 of the last body, with the body itself stored once per hash
+under ``bodies/``. The next fetch sends ``If-None-Match`` /
+``If-Modified-Since``; a ``304 Not Modified`` (or a 200 whose body hashes
+the same as last time) means the page has not changed, and the crawler
+skips extraction for it. When the portal is stable a full refresh costs a
+round of tiny 304 responses and no parsing at all.
+
+A URL's entry is only recorded once the page is done: straight away for
+pages nothing is extracted from, and for registry pages only after their
+extraction succeeded and its output was written. A page fetched with
+extraction or saving turned off, or whose extractor failed, keeps being
+downloaded and extracted until that happens.
+
+Layout of the cache directory::
+
+    index.json           url -> {etag, last_modified, sha256, fetched_at}
+    bodies/<sha256>      raw response body
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 ".http_cache")
+
+
+class HttpCache:
+    """Validators and bodies of previously fetched URLs."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+        self.bodies_dir = os.path.join(directory, "bodies")
+        self.index_path = os.path.join(directory, "index.json")
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that let the server answer 304 for ``url``."""
+        entry = self.entries.get(url)
+        if not entry or not os.path.exists(self._body_path(entry["sha256"])):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.bodies_dir, digest)
+
+    def body(self, url: str) -> Optional[bytes]:
+        """Cached body of ``url``, if any."""
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        try:
+            with open(self._body_path(entry["sha256"]), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def store_body(self, body: bytes) -> str:
+        """Keep a 200 response body (once per content) and return its sha256."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._body_path(digest)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(body)
+        return digest
+
+    def changed(self, url: str, digest: str) -> bool:
+        """True unless ``digest`` is the body last recorded for ``url``."""
+        entry = self.entries.get(url)
+        return entry is None or entry["sha256"] != digest
+
+    def record(self, url: str, digest: str, headers: Dict[str, str]) -> None:
+        """Record the validators of a 200 response whose body has been dealt with.
+
+        ``headers`` are the response headers with lower-case names.
+        """
+        self.entries[url] = {
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "sha256": digest,
+            "fetched_at": time.time(),
+        }
+
+    def touch(self, url: str, headers: Dict[str, str]) -> None:
+        """Record a 304 response, keeping any refreshed validators."""
+        entry = self.entries[url]
+        entry["etag"] = headers.get("etag") or entry.get("etag")
+        entry["last_modified"] = headers.get("last-modified") or entry.get("last_modified")
+        entry["fetched_at"] = time.time()
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
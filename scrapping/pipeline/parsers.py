@@ -0,0 +1,116 @@
+"""Pluggable HTML parser backends with an optional targeted (partial) parse.
+
+``parse_html`` picks the fastest tree builder that is installed - lxml's C
+parser when available, otherwise Python's built-in ``html.parser`` - unless
+a backend is named explicitly or through the ``SCRAPER_PARSER`` environment
+variable.
+
+Passing ``targets`` switches to targeted mode: only the subtrees matching
+the declared selectors are built, in the style of ``SoupStrainer``. Targets
+are simple selectors such as ``"section#for_table"``, ``"div.tab-pane"``,
+``"#Terms"`` or ``"h1"``; an element matching any of them is kept together
+with everything inside it, and the rest of the page is skipped while
+parsing.
+"""
+
+import importlib.util
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Fastest first; html5lib is correct but much slower and cannot do partial parses
+PARSER_PREFERENCE = ["lxml", "html.parser"]
+
+_BACKEND_MODULES = {
+    "lxml": "lxml",
+    "html5lib": "html5lib",
+    "html.parser": None,
+}
+
+
+def available_parsers() -> List[str]:
+    """Return the installed parser backends, fastest first."""
+    found = []
+    for name in PARSER_PREFERENCE + ["html5lib"]:
+        module = _BACKEND_MODULES[name]
+        if module is None or importlib.util.find_spec(module) is not None:
+            found.append(name)
+    return found
+
+
+def default_parser() -> str:
+    """Backend to use when none is requested."""
+    requested = os.environ.get("SCRAPER_PARSER")
+    if requested:
+        return requested
+    return available_parsers()[0]
+
+
+def _parse_target(selector: str) -> Tuple[Optional[str], Optional[str], List[str]]:
+    """Split ``tag#id.class1.class2`` into its parts."""
+    tag, element_id, classes = selector, None, []
+    if "." in tag:
+        tag, *classes = tag.split(".")
+    if "#" in tag:
+        tag, element_id = tag.split("#", 1)
+    return tag or None, element_id or None, classes
+
+
+def compile_targets(targets: Iterable[str]) -> Callable[[str, Dict[str, Any]], bool]:
+    """Turn simple selectors into a predicate on a tag's (name, attrs)."""
+    parsed = [_parse_target(t.strip()) for t in targets if t.strip()]
+
+    def matches(name: str, attrs: Dict[str, Any]) -> bool:
+        for tag, element_id, classes in parsed:
+            if tag and name != tag:
+                continue
+            if element_id and attrs.get("id") != element_id:
+                continue
+            if classes:
+                value = attrs.get("class") or ""
+                tokens = value.split() if isinstance(value, str) else list(value)
+                if not all(c in tokens for c in classes):
+                    continue
+            return True
+        return False
+
+    return matches
+
+
+class _TargetStrainer(SoupStrainer):
+    """SoupStrainer driven by a (name, attrs) predicate.
+
+    Overrides both the bs4 >= 4.13 hooks (``allow_tag_creation``) and the
+    older ``search_tag`` so targeted parsing works on either API.
+    """
+
+    def __init__(self, predicate: Callable[[str, Dict[str, Any]], bool]):
+        super().__init__()
+        self.predicate = predicate
+
+    @property
+    def excludes_everything(self) -> bool:
+        return False
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self.predicate(name, attrs or {})
+
+    def allow_string_creation(self, string) -> bool:
+        # Top-level text outside every target is dropped
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        attrs = markup_attrs if isinstance(markup_attrs, dict) else dict(markup_attrs or [])
+        return markup_name if self.predicate(markup_name, attrs) else None
+
+
+def parse_html(html: str, parser: Optional[str] = None,
+               targets: Optional[Iterable[str]] = None) -> BeautifulSoup:
+    """Parse ``html`` with the chosen backend, optionally only the ``targets``."""
+    parser = parser or default_parser()
+    if not targets:
+        return BeautifulSoup(html, parser)
+    if parser == "html5lib":
+        raise ValueError("html5lib does not support targeted parsing")
+    return BeautifulSoup(html, parser, parse_only=_TargetStrainer(compile_targets(targets)))
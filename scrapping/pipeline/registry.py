@@ -0,0 +1,158 @@
+"""Registry mapping each e& portal page to its saved snapshot and extractor."""
+
+import importlib.util
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+# All registry paths are relative to the scrapping/ folder
+SCRAPPING_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PORTAL_URL = "https://www.eand.com.eg/StaticFiles/portal2/etisalat/"
+
+# name -> {url, snapshot, extractor, output}. The extractor is either
+# "path/to/file.py:function" or "spec:path/to/spec.json" (see specs.py).
+# Optional keys: "parser" (backend name, see parsers.py) and "targets", the
+# only subtrees the extractor reads - the rest of the page is never built.
+# "strip_layout": True also drops inline styles and whitespace runs before
+# parsing; only set it for extractors that never look at either (strip.py).
+PAGES: Dict[str, Dict[str, Any]] = {
+    "international_calls": {
+        "url": PORTAL_URL + "pages/services/international_calls.html",
+        "snapshot": "Suhaila/International Calls/page_content.txt",
+        "extractor": "Suhaila/international_calls_scraper.py:scrape_international_calls",
+        "output": "Suhaila/e&_international_calls.json",
+        "targets": [
+            "section.page_title_test",
+            "section#for_table",
+            "section#for_textContainer",
+            "section#for_features_and_terms",
+            "div.tab-pane",
+            "div.card",
+        ],
+    },
+    "prepaid_data_packages": {
+        "url": PORTAL_URL + "pages/super_connect_home/prepaid_bundles.html",
+        "snapshot": "Suhaila/Pre-Paid Data Packages/page_content.txt",
+        "extractor": "spec:pipeline/specs/prepaid_data_packages.json",
+        "output": "Suhaila/e&_prepaid_data_packages.json",
+    },
+    "khadamat_7070": {
+        "url": PORTAL_URL + "pages/services/etisalat_directory_7070.html",
+        "snapshot": "Suhaila/Khadamat 7070/page_content.txt",
+        "extractor": "Suhaila/khadamat_7070_scraper.py:extract_7070_services",
+        "output": "Suhaila/e&_7070_services.json",
+    },
+    "super_salefny": {
+        "url": PORTAL_URL + "pages/services/out_of_credit.html",
+        "snapshot": "Suhaila/Super Salefny/page_content.txt",
+        "extractor": "Suhaila/super_salefny_scraper.py:extract_etisalat_data",
+        "output": "Suhaila/e&_super_salefny.json",
+    },
+    "mokalmat_wifi": {
+        "url": PORTAL_URL + "pages/services/wifi_calling.html",
+        "snapshot": "Suhaila/Mokalmat Wifi/page_content.txt",
+        "extractor": "Suhaila/mokalmat_wifi_scraper.py:extract_wifi_calling_data",
+        "output": "Suhaila/e&_mokalmat_wifi.json",
+    },
+    "demagh_tanya": {
+        "url": PORTAL_URL + "pages/plans/demagh_tanya.html",
+        "snapshot": "FayrouzMohamed/demagh_tanya.html",
+        "extractor": "FayrouzMohamed/demagh_tanya_scraper.py:extract_demagh_tanya",
+        "output": "FayrouzMohamed/demagh_tanya.json",
+    },
+    "hekaya": {
+        "url": PORTAL_URL + "pages/plans/hekaya.html",
+        "snapshot": "Mayar/hekaya.html",
+        "extractor": "pipeline/carousel.py:extract_hekaya",
+        "output": "Mayar/etisalat_hekaya.json",
+    },
+    "elkart": {
+        "url": PORTAL_URL + "pages/plans/elkart_prepaid.html",
+        "snapshot": "Soha/elkart_prepaid.html",
+        "extractor": "pipeline/carousel.py:extract_elkart",
+        "output": "Soha/akwa_full_page.json",
+    },
+    "ehome_dsl": {
+        "url": PORTAL_URL + "pages/super_connect_home/eHome_DSL.html",
+        "snapshot": "Israa/DSL/DSL.txt",
+        "extractor": "Israa/DSL/dsl_scraper.py:extract_dsl_data",
+        "output": "Israa/DSL/full_ehome_dsl_data (1).json",
+        "parser": "html.parser",
+    },
+    "emerald_family": {
+        "url": PORTAL_URL + "pages/plans/emerald_family.html",
+        "snapshot": "Mohy/Emerlad Family.txt",
+        "extractor": "Mohy/emerald_scraper.py:extract_emerald_family",
+        "output": "Mohy/emerald_family.json",
+        "parser": "html.parser",
+    },
+}
+
+_extractor_cache: Dict[str, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def register_page(name: str, url: str, snapshot: str, extractor: str,
+                  output: Optional[str] = None, parser: Optional[str] = None,
+                  targets: Optional[List[str]] = None) -> None:
+    """Add (or replace) a page in the registry."""
+    page: Dict[str, Any] = {
+        "url": url,
+        "snapshot": snapshot,
+        "extractor": extractor,
+        "output": output or "",
+    }
+    if parser:
+        page["parser"] = parser
+    if targets:
+        page["targets"] = list(targets)
+    PAGES[name] = page
+
+
+def get_page(key: str) -> Optional[Dict[str, Any]]:
+    """Look a page up by registry name, URL or snapshot path."""
+    if key in PAGES:
+        return PAGES[key]
+    for page in PAGES.values():
+        if key in (page["url"], page["snapshot"]):
+            return page
+    return None
+
+
+def resolve_path(path: str) -> str:
+    """Turn a registry path into an absolute path under scrapping/."""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(SCRAPPING_DIR, path)
+
+
+def load_extractor(spec: str) -> Callable[[Any], Dict[str, Any]]:
+    """Import the extractor named by a "path/to/file.py:function" spec.
+
+    The scraper folders are not packages, so the module is loaded straight
+    from its file. A "spec:path/to/spec.json" extractor is a declarative
+    spec compiled by ``pipeline.specs``. Loaded extractors are cached per
+    process.
+    """
+    if spec in _extractor_cache:
+        return _extractor_cache[spec]
+
+    if spec.startswith("spec:"):
+        # Declarative JSON spec, no Python needed for the page
+        from .specs import load_spec
+        extractor = load_spec(resolve_path(spec[len("spec:"):]))
+        _extractor_cache[spec] = extractor
+        return extractor
+
+    file_path, _, func_name = spec.partition(":")
+    full_path = resolve_path(file_path)
+    module_name = "_scraper_" + os.path.splitext(os.path.basename(full_path))[0]
+
+    module_spec = importlib.util.spec_from_file_location(module_name, full_path)
+    if module_spec is None or module_spec.loader is None:
+        raise ImportError(f"Cannot load extractor module {full_path}")
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+
+    extractor = getattr(module, func_name)
+    _extractor_cache[spec] = extractor
+    return extractor
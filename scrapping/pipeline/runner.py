@@ -0,0 +1,119 @@
+"""Run registered page extractors in parallel and report per-page timings."""
+
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .document import load_document, parse_bytes
+from .registry import PAGES, load_extractor, resolve_path
+
+
+def run_page(name: str, page: Dict[str, Any], save: bool = True,
+             body: Optional[bytes] = None) -> Dict[str, Any]:
+    """Run one page's extractor against its snapshot (or a fetched ``body``).
+
+    The page is read through the shared Document cache, so extractors
+    registered on the same snapshot reuse a single parse. Never raises:
+    failures are captured in the returned result so a single broken page
+    does not take the whole refresh down. A page whose snapshot has not been
+    saved yet is marked ``skipped`` rather than failed.
+    """
+    result = {
+        "name": name,
+        "url": page["url"],
+        "ok": False,
+        "skipped": False,
+        "seconds": 0.0,
+        "error": "",
+    }
+    if body is None and not os.path.exists(resolve_path(page["snapshot"])):
+        result["skipped"] = True
+        result["error"] = f"no snapshot saved at {page['snapshot']}"
+        return result
+    start = time.perf_counter()
+    try:
+        if body is not None:
+            document = parse_bytes(body, url=page["url"], parser=page.get("parser"),
+                                   targets=page.get("targets"),
+                                   strip_layout=page.get("strip_layout", False))
+        else:
+            document = load_document(resolve_path(page["snapshot"]), url=page["url"],
+                                     parser=page.get("parser"), targets=page.get("targets"),
+                                     strip_layout=page.get("strip_layout", False))
+
+        extractor = load_extractor(page["extractor"])
+        data = extractor(document)
+        if not data:
+            raise ValueError("extractor returned no data")
+
+        if save and page.get("output"):
+            with open(resolve_path(page["output"]), "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        result["ok"] = True
+    except FileNotFoundError as e:
+        result["error"] = f"snapshot not found: {e.filename}"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_snapshot(pages: List[Tuple[str, Dict[str, Any]]], save: bool = True) -> List[Dict[str, Any]]:
+    """Run every extractor registered on one snapshot in the same process."""
+    return [run_page(name, page, save) for name, page in pages]
+
+
+def run_all(names: Optional[Iterable[str]] = None, workers: Optional[int] = None,
+            save: bool = True) -> List[Dict[str, Any]]:
+    """Run every registered page (or just ``names``) across a process pool.
+
+    Pages are grouped by snapshot so each snapshot is parsed once, and the
+    groups run in parallel. Wall time for the whole refresh is roughly the
+    slowest snapshot rather than the sum of all of them.
+    """
+    selected = list(names) if names else list(PAGES)
+    unknown = [name for name in selected if name not in PAGES]
+    if unknown:
+        raise KeyError(f"Unknown pages: {', '.join(unknown)}")
+
+    groups: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+    for name in selected:
+        groups.setdefault(PAGES[name]["snapshot"], []).append((name, PAGES[name]))
+
+    workers = workers or min(len(groups), os.cpu_count() or 1)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_snapshot, group, save) for group in groups.values()]
+        for future in as_completed(futures):
+            results.extend(future.result())
+
+    results.sort(key=lambda r: r["seconds"], reverse=True)
+    return results
+
+
+def print_report(results: List[Dict[str, Any]], total_seconds: Optional[float] = None) -> None:
+    """Print per-page wall time and failures."""
+    print(f"{'page':<28} {'status':<8} {'seconds':>8}")
+    print("-" * 46)
+    for r in results:
+        status = "ok" if r["ok"] else "skipped" if r.get("skipped") else "FAILED"
+        print(f"{r['name']:<28} {status:<8} {r['seconds']:>8.3f}")
+
+    skipped = [r for r in results if r.get("skipped")]
+    for r in skipped:
+        print(f"\n⚠️ {r['name']} skipped: {r['error']}")
+    failures = [r for r in results if not r["ok"] and not r.get("skipped")]
+    for r in failures:
+        print(f"\n❌ {r['name']} ({r['url']}): {r['error']}")
+
+    print("-" * 46)
+    summed = sum(r["seconds"] for r in results)
+    ran = len(results) - len(skipped)
+    print(f"{ran - len(failures)}/{ran} pages ok, {len(skipped)} skipped (no snapshot), "
+          f"sum of page times {summed:.3f}s")
+    if total_seconds is not None:
+        print(f"wall time {total_seconds:.3f}s")
@@ -0,0 +1,354 @@
+"""Declarative extraction specs compiled into a single tree walk.
+
+A spec is a JSON file (see ``pipeline/specs/``) describing what to pull out
+of a page instead of hand-written ``find``/``find_all`` code::
+
+    {
+      "constants": {"page_info": {"title": "..."}},
+      "fields": {
+        "title": {"select": ["section.page_title_test h1", "h1"]}
+      },
+      "lists": {
+        "main_packages": {
+          "item": ["div.card.border-radius-RTB",
+                   {"select": "tr td", "require": ["name", "price"]}],
+          "fields": {
+            "name":  {"select": "h5.plan-name"},
+            "price": {"select": "h5.plan-price", "regex": "(\\\\d+)", "type": "int"},
+            "currency": {"value": "جنية", "if": "price"},
+            "mixes": {"select": "li.list-group-item", "index": 0}
+          }
+        }
+      }
+    }
+
+Field options:
+
+``select``
+    One selector or a list of fallbacks; the first one that yields a value
+    wins (this replaces the "Method 1/2/3" chains). Selectors are
+    descendant chains of ``tag#id.class[attr=value]`` parts, with ``>`` for
+    direct children. ``[class="a b"]`` matches the whole class attribute,
+    like BeautifulSoup's ``class_="a b"``, where ``.a.b`` accepts extra
+    classes in any order.
+``index`` / ``many``
+    Take the n-th match (default: the first) or a list of all matches.
+``attr``
+    Read an attribute instead of the element text.
+``regex`` / ``type``
+    Keep group 1 (or the whole match) of the pattern and convert it to
+    ``int``/``float``. A selector whose text does not match falls through
+    to the next fallback.
+``value`` / ``if``
+    A constant, optionally only when another field was found.
+``keep_empty``
+    Keep an element's empty text as ``""`` instead of treating the field
+    as not found.
+
+List ``item`` selectors are fallbacks too: the first one that produces at
+least one kept record is used, and an alternative written as a dict may
+bring its own ``fields``. A record is kept when an element was found for
+every ``require`` field (even if no value came out of it), or by default
+when any field has a value; ``"keep_empty": true`` on a list keeps
+records with no fields at all.
+
+``compile_spec`` turns every selector of every field and list into a small
+state machine, and ``CompiledSpec.extract`` evaluates all of them during
+one depth-first walk of the tree, so adding fields does not add walks.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+_PART = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*|\*)?"
+    r"(?P<rest>(?:[#.][\w-]+|\[[\w-]+(?:=[^\]]*)?\])*)$"
+)
+_PIECE = re.compile(r"#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:=([^\]]*))?\]")
+# ">" or one compound selector; attribute values in brackets may contain spaces
+_TOKEN = re.compile(r">|(?:\[[^\]]*\]|[^\s>\[])+")
+
+
+# chain id -> matched elements, and (list name, item alternative)
+_Matches = Dict[int, List[Tag]]
+_Scope = Tuple[str, int]
+
+
+class SpecError(ValueError):
+    """Raised for malformed specs or selectors."""
+
+
+class _Part:
+    """One simple selector: tag, id, classes and attribute tests."""
+
+    __slots__ = ("tag", "element_id", "classes", "attrs")
+
+    def __init__(self, text: str):
+        match = _PART.match(text)
+        if not match:
+            raise SpecError(f"Unsupported selector part: {text!r}")
+        tag = match.group("tag")
+        self.tag = None if tag in (None, "*") else tag.lower()
+        self.element_id = None
+        self.classes: List[str] = []
+        self.attrs: List[Tuple[str, Optional[str]]] = []
+        for element_id, cls, attr, value in _PIECE.findall(match.group("rest")):
+            if element_id:
+                self.element_id = element_id
+            elif cls:
+                self.classes.append(cls)
+            else:
+                self.attrs.append((attr, value.strip("\"'") if value else None))
+
+    def matches(self, element: Tag) -> bool:
+        if self.tag and element.name != self.tag:
+            return False
+        if self.element_id and element.get("id") != self.element_id:
+            return False
+        if self.classes:
+            tokens = element.get("class") or []
+            if isinstance(tokens, str):
+                tokens = tokens.split()
+            for cls in self.classes:
+                if cls not in tokens:
+                    return False
+        for attr, value in self.attrs:
+            actual = element.get(attr)
+            if actual is None:
+                return False
+            if value is not None:
+                if isinstance(actual, list):
+                    actual = " ".join(actual)
+                if actual != value:
+                    return False
+        return True
+
+
+class _Chain:
+    """A selector compiled to parts plus the combinator before each part."""
+
+    __slots__ = ("parts", "child_only")
+
+    def __init__(self, selector: str):
+        tokens = _TOKEN.findall(selector)
+        self.parts: List[_Part] = []
+        self.child_only: List[bool] = []
+        pending_child = False
+        for token in tokens:
+            if token == ">":
+                pending_child = True
+                continue
+            self.parts.append(_Part(token))
+            self.child_only.append(pending_child)
+            pending_child = False
+        if not self.parts:
+            raise SpecError(f"Empty selector: {selector!r}")
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _item_fields(list_spec: Dict[str, Any], item: Any) -> Dict[str, Any]:
+    """Fields of one item alternative: its own, or the list's."""
+    if isinstance(item, dict) and "fields" in item:
+        return item["fields"]
+    return list_spec.get("fields", {})
+
+
+class CompiledSpec:
+    """All selectors of a spec, evaluated together in one walk."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.chains: List[_Chain] = []
+        # chain id -> (list name, item alternative) for item selectors
+        self.item_chains: Dict[int, _Scope] = {}
+        # (list name, item alternative) -> chain ids evaluated inside each item
+        self.scoped: Dict[_Scope, List[int]] = {}
+        # (scope, field name) -> chain ids, one per fallback selector
+        self.field_chains: Dict[Tuple[Optional[_Scope], str], List[int]] = {}
+        self.global_chains: List[int] = []
+
+        for name, field in spec.get("fields", {}).items():
+            self.field_chains[(None, name)] = [
+                self._add_chain(sel, self.global_chains) for sel in _as_list(field.get("select"))
+            ]
+
+        for list_name, list_spec in spec.get("lists", {}).items():
+            for alt, item in enumerate(_as_list(list_spec.get("item"))):
+                selector = item["select"] if isinstance(item, dict) else item
+                chain_id = self._add_chain(selector, self.global_chains)
+                scope = (list_name, alt)
+                self.item_chains[chain_id] = scope
+                self.scoped[scope] = []
+                for name, field in _item_fields(list_spec, item).items():
+                    self.field_chains[(scope, name)] = [
+                        self._add_chain(sel, self.scoped[scope])
+                        for sel in _as_list(field.get("select"))
+                    ]
+
+    def _add_chain(self, selector: str, bucket: List[int]) -> int:
+        self.chains.append(_Chain(selector))
+        chain_id = len(self.chains) - 1
+        bucket.append(chain_id)
+        return chain_id
+
+    # -- the walk -----------------------------------------------------------
+
+    def _walk(self, root: Tag) -> Tuple[_Matches, Dict[_Scope, List[Tuple[Tag, _Matches]]]]:
+        """Depth-first walk collecting matches for every chain at once."""
+        global_matches: _Matches = {c: [] for c in self.global_chains}
+        items: Dict[_Scope, List[Tuple[Tag, _Matches]]] = {scope: [] for scope in self.scoped}
+
+        # A state is (chain id, next part, bucket the matches go to)
+        start: Set[Tuple[int, int, int]] = set()
+        buckets: List[_Matches] = [global_matches]
+        for chain_id in self.global_chains:
+            start.add((chain_id, 0, 0))
+
+        stack: List[Tuple[Tag, frozenset, frozenset]] = [
+            (child, frozenset(s for s in start if not self.chains[s[0]].child_only[0]),
+             frozenset(s for s in start if self.chains[s[0]].child_only[0]))
+            for child in reversed(list(root.children)) if isinstance(child, Tag)
+        ]
+        while stack:
+            element, inherited, direct = stack.pop()
+            descendants = set(inherited)
+            children_only = set()
+            for chain_id, k, bucket in inherited | direct:
+                chain = self.chains[chain_id]
+                if not chain.parts[k].matches(element):
+                    continue
+                if k + 1 < len(chain.parts):
+                    state = (chain_id, k + 1, bucket)
+                    (children_only if chain.child_only[k + 1] else descendants).add(state)
+                    continue
+                buckets[bucket][chain_id].append(element)
+                scope = self.item_chains.get(chain_id)
+                if scope is not None:
+                    item_bucket: _Matches = {c: [] for c in self.scoped[scope]}
+                    buckets.append(item_bucket)
+                    items[scope].append((element, item_bucket))
+                    for sub in self.scoped[scope]:
+                        state = (sub, 0, len(buckets) - 1)
+                        (children_only if self.chains[sub].child_only[0] else descendants).add(state)
+
+            if descendants or children_only:
+                inherited_next = frozenset(descendants)
+                direct_next = frozenset(children_only)
+                for child in reversed(list(element.children)):
+                    if isinstance(child, Tag):
+                        stack.append((child, inherited_next, direct_next))
+        return global_matches, items
+
+    # -- values -------------------------------------------------------------
+
+    @staticmethod
+    def _value(element: Tag, field: Dict[str, Any]) -> Any:
+        if field.get("attr"):
+            raw = element.get(field["attr"])
+            if isinstance(raw, list):
+                raw = " ".join(raw)
+        else:
+            raw = element.get_text(field.get("separator", ""), strip=True)
+        if raw is None:
+            return None
+        if field.get("regex"):
+            match = re.search(field["regex"], raw)
+            if not match:
+                return None
+            raw = match.group(1) if match.groups() else match.group(0)
+        kind = field.get("type")
+        try:
+            if kind == "int":
+                return int(raw)
+            if kind == "float":
+                return float(raw)
+        except ValueError:
+            return None
+        return raw if raw != "" or field.get("keep_empty") else None
+
+    def _resolve(self, fields: Dict[str, Any], scope: Optional[_Scope],
+                 matches: _Matches) -> Tuple[Dict[str, Any], Set[str]]:
+        """The record, and the names of the fields some element was found for."""
+        record: Dict[str, Any] = {}
+        located: Set[str] = set()
+        constants = []
+        for name, field in fields.items():
+            if "value" in field:
+                constants.append((name, field))
+                continue
+            for chain_id in self.field_chains[(scope, name)]:
+                found = matches.get(chain_id, [])
+                if found:
+                    located.add(name)
+                if field.get("many"):
+                    values = [v for v in (self._value(e, field) for e in found) if v is not None]
+                    if values:
+                        record[name] = values
+                        break
+                    continue
+                index = field.get("index", 0)
+                if index < len(found):
+                    value = self._value(found[index], field)
+                    if value is not None:
+                        record[name] = value
+                        break
+        for name, field in constants:
+            if not field.get("if") or field["if"] in record:
+                record[name] = field["value"]
+        # Keep the key order of the spec
+        return {name: record[name] for name in fields if name in record}, located
+
+    def extract(self, page: Any) -> Dict[str, Any]:
+        """Run the spec over raw HTML, a BeautifulSoup tree or a Document."""
+        if isinstance(page, str):
+            root = BeautifulSoup(page, "html.parser")
+        elif isinstance(page, Tag):
+            root = page
+        else:
+            root = page.soup
+        global_matches, items = self._walk(root)
+
+        result: Dict[str, Any] = json.loads(json.dumps(self.spec.get("constants", {})))
+        result.update(self._resolve(self.spec.get("fields", {}), None, global_matches)[0])
+
+        for list_name, list_spec in self.spec.get("lists", {}).items():
+            records: List[Dict[str, Any]] = []
+            for alt, item in enumerate(_as_list(list_spec.get("item"))):
+                require = item.get("require", list_spec.get("require")) if isinstance(item, dict) \
+                    else list_spec.get("require")
+                for _, item_matches in items[(list_name, alt)]:
+                    record, located = self._resolve(_item_fields(list_spec, item), (list_name, alt), item_matches)
+                    if require:
+                        if all(name in located for name in require):
+                            records.append(record)
+                    elif record or list_spec.get("keep_empty"):
+                        records.append(record)
+                if records:
+                    break
+            result[list_name] = records
+        return result
+
+    __call__ = extract
+
+
+_compiled: Dict[str, CompiledSpec] = {}
+
+
+def compile_spec(spec: Dict[str, Any]) -> CompiledSpec:
+    return CompiledSpec(spec)
+
+
+def load_spec(path: str) -> CompiledSpec:
+    """Load and compile a JSON spec file (compiled once per process)."""
+    if path not in _compiled:
+        with open(path, "r", encoding="utf-8") as f:
+            _compiled[path] = CompiledSpec(json.load(f))
+    return _compiled[path]
@@ -0,0 +1,189 @@
+"""Byte-level pre-pass that slims saved pages before they are parsed.
+
+None of the extractors read ``<script>``/``<style>``/``<svg>`` blocks, HTML
+comments, ``<link>``/``<meta>`` tags, ``on*`` event handlers or tracking
+pixels, yet the parser still has to build nodes for all of it.
+``strip_markup`` removes those regions with compiled byte regexes - no tree
+is built - so parse time and memory follow the content that is actually
+used.
+
+Layout - inline ``style`` attributes and the deep indentation of the saved
+portal pages - is kept by default: some extractors select on styles (the
+DSL page finds its emerald offers by ``style="height: ..."``) and most keep
+the whitespace inside the text they return. Pages whose extractor ignores
+both opt in with ``"strip_layout": True`` in the registry.
+
+``iter_strip`` does the same over a stream of chunks, holding back only an
+unfinished block or tag at each chunk boundary, so arbitrarily large
+snapshots are slimmed in bounded memory.
+
+Slim the snapshot of a registered page in place with::
+
+    python -m pipeline.strip demagh_tanya ...
+
+The snapshot is only rewritten when the page's extractor returns exactly
+the same JSON for the slimmed bytes as for the original ones.
+"""
+
+import json
+import re
+import sys
+from typing import Any, Dict, Iterable, Iterator, List
+
+# Whole elements whose content no extractor reads
+_BLOCK_TAGS = rb"script|style|svg|noscript|iframe|template"
+
+_BLOCKS = re.compile(
+    rb"<(" + _BLOCK_TAGS + rb")\b[^>]*>.*?</\1\s*>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+_BLOCK_START = re.compile(rb"<(?:" + _BLOCK_TAGS + rb")\b|<!--", re.IGNORECASE)
+
+# Void tags and tracking pixels (facebook.com/tr, analytics beacons)
+_VOID_TAGS = re.compile(
+    rb"<(?:link|meta|base)\b[^>]*>"
+    rb"|<img\b[^>]*\bsrc=[\"'][^\"']*(?:facebook\.com/tr|google-analytics|doubleclick)[^>]*>",
+    re.IGNORECASE,
+)
+# Event-handler attributes, and inline styles for pages that strip layout
+_HANDLERS = re.compile(
+    rb"\s(?:on[a-z]+)\s*=\s*(?:\"[^\"]*\"|'[^']*')",
+    re.IGNORECASE,
+)
+_HANDLERS_AND_STYLES = re.compile(
+    rb"\s(?:style|on[a-z]+)\s*=\s*(?:\"[^\"]*\"|'[^']*')",
+    re.IGNORECASE,
+)
+_NEWLINE_RUNS = re.compile(rb"[ \t\r]*\n\s*")
+_SPACE_RUNS = re.compile(rb"[ \t]{2,}")
+
+
+def _slim(data: bytes, layout: bool = False) -> bytes:
+    data = _BLOCKS.sub(b"", data)
+    data = _VOID_TAGS.sub(b"", data)
+    if not layout:
+        return _HANDLERS.sub(b"", data)
+    data = _HANDLERS_AND_STYLES.sub(b"", data)
+    data = _NEWLINE_RUNS.sub(b"\n", data)
+    return _SPACE_RUNS.sub(b" ", data)
+
+
+def strip_markup(data: bytes, layout: bool = False) -> bytes:
+    """Return ``data`` without scripts, styles, SVG and tracking markup.
+
+    Inline ``style`` attributes and whitespace runs go too when ``layout``
+    is True.
+    """
+    return _slim(data, layout)
+
+
+def _safe_end(buffer: bytes) -> int:
+    """Length of the prefix of ``buffer`` that can be slimmed right now."""
+    end = len(buffer)
+
+    # Hold back the first block that has started but not closed yet
+    position = 0
+    while True:
+        start = _BLOCK_START.search(buffer, position)
+        if start is None:
+            break
+        block = _BLOCKS.match(buffer, start.start())
+        if block is None:
+            end = start.start()
+            break
+        position = block.end()
+
+    # ... and any tag that is cut in half
+    last_open = buffer.rfind(b"<", 0, end)
+    if last_open != -1 and buffer.find(b">", last_open, end) == -1:
+        end = last_open
+
+    # ... and trailing whitespace, which may continue in the next chunk
+    while end > 0 and buffer[end - 1:end].isspace():
+        end -= 1
+    return end
+
+
+def iter_strip(chunks: Iterable[bytes], layout: bool = False) -> Iterator[bytes]:
+    """Slim a stream of byte chunks, yielding slimmed output as it becomes safe."""
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        end = _safe_end(buffer)
+        if end:
+            slimmed = _slim(buffer[:end], layout)
+            # Whitespace left at the end may merge with the next chunk's
+            kept = slimmed.rstrip()
+            if kept:
+                yield kept
+            buffer = slimmed[len(kept):] + buffer[end:]
+    if buffer:
+        yield _slim(buffer, layout)
+
+
+def strip_file(src: str, dst: str = None, chunk_size: int = 1 << 16, layout: bool = False) -> List[int]:
+    """Slim a snapshot file (in place when ``dst`` is omitted).
+
+    Returns ``[bytes_before, bytes_after]``.
+    """
+    with open(src, "rb") as f:
+        parts = list(iter_strip(iter(lambda: f.read(chunk_size), b""), layout))
+        before = f.tell()
+    slimmed = b"".join(parts)
+    with open(dst or src, "wb") as f:
+        f.write(slimmed)
+    return [before, len(slimmed)]
+
+
+def _extract(page: Dict[str, Any], data: bytes) -> str:
+    """The page's extractor output for ``data``, as the JSON the runner would save."""
+    from .document import parse_bytes
+    from .registry import load_extractor
+
+    document = parse_bytes(data, url=page["url"], parser=page.get("parser"),
+                           targets=page.get("targets"), slim=False)
+    return json.dumps(load_extractor(page["extractor"])(document), ensure_ascii=False, indent=2)
+
+
+def strip_page(name: str) -> List[int]:
+    """Slim a registered page's snapshot in place if its extraction is unchanged.
+
+    Raises ``ValueError`` (and leaves the file alone) when the extractor
+    returns different JSON for the slimmed snapshot.
+    """
+    from .registry import get_page, resolve_path
+
+    page = get_page(name)
+    if page is None:
+        raise KeyError(f"Unknown page: {name}")
+    path = resolve_path(page["snapshot"])
+    with open(path, "rb") as f:
+        original = f.read()
+    slimmed = strip_markup(original, page.get("strip_layout", False))
+    if _extract(page, slimmed) != _extract(page, original):
+        raise ValueError(f"{name}: extractor output changes on the slimmed snapshot")
+    with open(path, "wb") as f:
+        f.write(slimmed)
+    return [len(original), len(slimmed)]
+
+
+def main(argv=None) -> int:
+    names = sys.argv[1:] if argv is None else argv
+    if not names:
+        print("usage: python -m pipeline.strip PAGE [PAGE ...]")
+        return 2
+    failed = 0
+    for name in names:
+        try:
+            before, after = strip_page(name)
+        except (KeyError, ValueError, OSError) as e:
+            print(f"❌ {e}")
+            failed += 1
+            continue
+        saved = 100 * (1 - after / before) if before else 0
+        print(f"{name}: {before:,} -> {after:,} bytes ({saved:.1f}% smaller)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""The snapshot archive: append, reopen, mmap reads and a crash mid-append."""
+
+import os
+
+import pytest
+
+from pipeline.archive import SnapshotArchive
+
+URL = "https://example.com/bundles.html"
+OTHER = "https://example.com/other.html"
+V1 = "<html><body>باقة 200 جنيه</body></html>".encode("utf-8")
+V2 = "<html><body>باقة 250 جنيه</body></html>".encode("utf-8") * 50
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "archive" / "snapshots")
+
+
+def test_round_trip_across_reopen(path):
+    with SnapshotArchive(path) as archive:
+        first = archive.append(URL, V1, fetched_at=100.0)
+        assert archive.append(URL, V1, fetched_at=150.0) == first  # same body is not stored twice
+        archive.append(OTHER, b"other", fetched_at=120.0)
+        second = archive.append(URL, V2, fetched_at=200.0)
+        assert second["length"] < second["size"]
+        assert archive.get(URL) == V2  # read after the data file grew under the map
+
+    with SnapshotArchive(path) as archive:
+        assert [r["fetched_at"] for r in archive.history(URL)] == [100.0, 200.0]
+        assert archive.get(URL) == V2
+        assert archive.get(URL, at=199.0) == V1
+        assert archive.get(URL, at=99.0) is None
+        assert archive.get(OTHER) == b"other"
+        assert [r["url"] for r in archive.iter_records()] == [URL, OTHER, URL]
+        assert [r["fetched_at"] for r in archive.iter_records(URL, since=150.0)] == [200.0]
+
+
+def test_out_of_order_appends_are_sorted(path):
+    with SnapshotArchive(path) as archive:
+        archive.append(URL, V2, fetched_at=200.0)
+        archive.append(URL, V1, fetched_at=100.0)
+    with SnapshotArchive(path) as archive:
+        assert archive.get(URL) == V2
+        assert archive.get(URL, at=150.0) == V1
+        assert archive.get(URL, at=99.0) is None
+
+
+def test_truncated_tail_is_dropped(path):
+    with SnapshotArchive(path) as archive:
+        archive.append(URL, V1, fetched_at=100.0)
+        archive.append(URL, V2, fetched_at=200.0)
+    # Crash while appending a third version: data written, index line cut short
+    with open(path + ".dat", "ab") as f:
+        f.write(b"\x78\x9c half a body")
+    with open(path + ".idx", "rb") as f:
+        last = f.readlines()[-1]
+    with open(path + ".idx", "ab") as f:
+        f.write(last[: len(last) // 2])
+
+    with SnapshotArchive(path) as archive:
+        assert [r["fetched_at"] for r in archive.history(URL)] == [100.0, 200.0]
+        assert archive.get(URL) == V2
+        third = archive.append(URL, b"third", fetched_at=300.0)
+        assert third["offset"] + third["length"] == os.path.getsize(path + ".dat")
+        assert archive.get(URL) == b"third"
+
+    with SnapshotArchive(path) as archive:
+        assert [archive.read(r) for r in archive.history(URL)] == [V1, V2, b"third"]
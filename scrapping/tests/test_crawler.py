@@ -0,0 +1,166 @@
+"""Crawler tests against the static mirror in ``tests/mirror``.
+
+The mirror is served by ``http.server`` on a free local port. Its layout
+follows the portal, so ``pages/plans/demagh_tanya.html`` is matched to the
+``demagh_tanya`` registry page.
+"""
+
+import functools
+import json
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from pipeline.crawler import crawl, extract_links, normalise_url
+from pipeline.http_cache import HttpCache
+from pipeline.registry import PAGES
+
+MIRROR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mirror")
+
+PLANS = {
+    "plan_1": {
+        "name": "دماغ تانية 40",
+        "data": "3 جيجا",
+        "units": "1000 وحدة",
+        "apps": "واتساب",
+        "extra_services": "-",
+        "extra_subscriptions": "-",
+    },
+    "plan_2": {
+        "name": "دماغ تانية 70",
+        "data": "6 جيجا",
+        "units": "2000 وحدة",
+        "apps": "واتساب وفيسبوك",
+        "extra_services": "كول كيبر",
+        "extra_subscriptions": "شاهد",
+    },
+}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class LowerCaseHandler(QuietHandler):
+    """Sends header names in lower case, as HTTP/2 front-ends do."""
+
+    def send_header(self, keyword, value):
+        super().send_header(keyword.lower(), value)
+
+
+def serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(handler, directory=MIRROR_DIR))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture(scope="module")
+def mirror():
+    """Base URL of the mirror; the handler answers If-Modified-Since with 304."""
+    server = serve(QuietHandler)
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="module")
+def lower_case_mirror():
+    server = serve(LowerCaseHandler)
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def output(tmp_path, monkeypatch):
+    """Write the demagh_tanya output to a temporary file instead of the repo."""
+    path = tmp_path / "demagh_tanya.json"
+    monkeypatch.setitem(PAGES["demagh_tanya"], "output", str(path))
+    return path
+
+
+def test_extract_links_normalises_and_drops_non_pages(mirror):
+    with open(os.path.join(MIRROR_DIR, "index.html"), "rb") as f:
+        links = extract_links(f.read(), mirror + "index.html")
+    assert links.count(mirror + "pages/plans/demagh_tanya.html") == 3
+    assert not any("#" in link or link.startswith("mailto:") for link in links)
+    assert normalise_url("HTTP://Example.COM/a.html#x") == "http://example.com/a.html"
+
+
+def test_frontier_fetches_each_in_scope_page_once(mirror):
+    crawler = crawl(mirror + "index.html", extract=False, save=False, concurrency=4)
+    urls = [r["url"] for r in crawler.fetched]
+    assert sorted(urls) == [
+        mirror + "index.html",
+        mirror + "pages/plans/demagh_tanya.html",
+        mirror + "pages/services/call_keeper.html",
+    ]
+    assert all(r["status"] == 200 and not r["error"] for r in crawler.fetched)
+    # css/main.css and the other host are linked but out of scope
+    assert not any(url.endswith(".css") or "example.com" in url for url in crawler.seen)
+    assert crawler.extracted == []
+
+
+def test_registry_pages_are_dispatched_to_their_extractor(mirror, output):
+    crawler = crawl(mirror + "index.html", workers=1)
+    pages = {r["url"]: r["page"] for r in crawler.fetched}
+    assert pages[mirror + "pages/plans/demagh_tanya.html"] == "demagh_tanya"
+    assert pages[mirror + "pages/services/call_keeper.html"] is None
+
+    assert [(r["name"], r["ok"]) for r in crawler.extracted] == [("demagh_tanya", True)]
+    with open(output, "r", encoding="utf-8") as f:
+        assert json.load(f) == PLANS
+
+
+def test_conditional_fetch_skips_only_pages_already_extracted(mirror, output, tmp_path):
+    cache_dir = str(tmp_path / "http_cache")
+    page = mirror + "pages/plans/demagh_tanya.html"
+
+    # Without saving, the page is extracted but not cached: the next crawl extracts it again
+    for _ in range(2):
+        crawler = crawl(mirror + "index.html", save=False, workers=1, cache=HttpCache(cache_dir))
+        assert [r["name"] for r in crawler.extracted] == ["demagh_tanya"]
+        assert page not in HttpCache(cache_dir).entries
+    assert not output.exists()
+
+    crawler = crawl(mirror + "index.html", workers=1, cache=HttpCache(cache_dir))
+    assert [r["name"] for r in crawler.extracted] == ["demagh_tanya"]
+    assert page in HttpCache(cache_dir).entries
+    assert output.exists()
+
+    # Everything is cached now: the server answers 304 and nothing is extracted
+    crawler = crawl(mirror + "index.html", workers=1, cache=HttpCache(cache_dir))
+    assert {r["status"] for r in crawler.fetched} == {304}
+    assert all(r["unchanged"] for r in crawler.fetched)
+    assert len(crawler.fetched) == 3
+    assert crawler.extracted == []
+
+
+def test_validators_are_found_whatever_the_header_case(lower_case_mirror, output, tmp_path):
+    cache_dir = str(tmp_path / "http_cache")
+    crawl(lower_case_mirror + "index.html", workers=1, cache=HttpCache(cache_dir))
+    entry = HttpCache(cache_dir).entries[lower_case_mirror + "pages/plans/demagh_tanya.html"]
+    assert entry["last_modified"]
+
+    crawler = crawl(lower_case_mirror + "index.html", workers=1, cache=HttpCache(cache_dir))
+    assert {r["status"] for r in crawler.fetched} == {304}
+    assert crawler.extracted == []
+
+
+def test_cache_reads_lower_case_validators(tmp_path):
+    cache = HttpCache(str(tmp_path / "http_cache"))
+    url = "http://127.0.0.1/pages/plans/demagh_tanya.html"
+    cache.record(url, cache.store_body(b"<html></html>"),
+                 {"etag": '"v1"', "last-modified": "Sat, 17 Oct 2026 00:00:00 GMT"})
+    assert cache.conditional_headers(url) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Sat, 17 Oct 2026 00:00:00 GMT",
+    }
+    cache.touch(url, {"etag": '"v2"'})
+    assert cache.conditional_headers(url)["If-None-Match"] == '"v2"'
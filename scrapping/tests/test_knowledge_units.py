@@ -0,0 +1,106 @@
+"""Parsing of scraped display strings and the exact plan/zone lookups.
+
+The parsers decide the numeric columns every price and quota answer is
+computed from, so the cases here are the shapes found in the scraped
+files: Arabic and English units, digits glued to units, Arabic-Indic
+digits and spelled-out numbers.
+"""
+
+import pytest
+
+from knowledge.query import PlanIndex
+from knowledge.units import parse_data_mb, parse_minutes, parse_money, parse_validity_days
+from knowledge.zones import ZoneIndex
+
+
+@pytest.mark.parametrize("text, egp", [
+    ("200 جنيه", 200.0),
+    ("15قرش", 0.15),
+    ("64.29 جنية", 64.29),
+    ("١٥٠ جنيه", 150.0),
+    ("5 جنيه / 50 قرش", 5.0),
+    ("قريبا", None),
+])
+def test_parse_money(text, egp):
+    assert parse_money(text) == egp
+
+
+@pytest.mark.parametrize("text, mb", [
+    ("7 جيجا بايت", 7168.0),
+    ("30GB", 30720.0),
+    ("1250 ميجابايتس", 1250.0),
+    ("30 Mbps", None),
+    ("100 Mb/s", None),
+    ("المجانية", None),
+])
+def test_parse_data_mb(text, mb):
+    assert parse_data_mb(text) == mb
+
+
+@pytest.mark.parametrize("text, days", [
+    ("٣ شهور", 90),
+    ("ثلاث شهور", 90),
+    ("شهر واحد", 30),
+    ("يومين", 2),
+    ("6 أيام", 6),
+    ("باقة 140 جيجا لمدة شهر", 30),
+    ("بدون", None),
+])
+def test_parse_validity_days(text, days):
+    assert parse_validity_days(text) == days
+
+
+def test_parse_minutes():
+    assert parse_minutes("210 دقيقة") == 210.0
+    assert parse_minutes("2,500") == 2500.0
+    assert parse_minutes("دقائق محلية") is None
+
+
+@pytest.fixture
+def zones():
+    return ZoneIndex(
+        {"Zone 1": ["ألمانيا", "فرنسا"], "Zone 2": ["المملكة العربية السعودية", "روسيا"], "Zone 3": ["روسيا"]},
+        {"Zone 1": {"price_per_minute": 4.5, "currency": "EGP"}, "Zone 2": {"price_per_minute": 6.0}},
+    )
+
+
+@pytest.mark.parametrize("name", ["Germany", "ألمانيا", "المانيا", "almanya", "Germny"])
+def test_zone_lookup_spellings(zones, name):
+    assert [(e["country"], e["zone"], e["price_per_minute"]) for e in zones.lookup(name)] == [
+        ("ألمانيا", "Zone 1", 4.5)
+    ]
+
+
+def test_zone_lookup_partial_names_and_misses(zones):
+    assert zones.price("السعودية")["zone"] == "Zone 2"
+    assert zones.price("el sa3odeya")["zone"] == "Zone 2"
+    assert [e["zone"] for e in zones.lookup("روسيا")] == ["Zone 2", "Zone 3"]
+    assert zones.lookup("Narnia") == []
+    assert zones.lookup("جزر") == []
+
+
+@pytest.fixture
+def plans():
+    return PlanIndex([
+        {"family": "حكاية", "name": "حكاية 45", "price_egp": 45.0, "data_mb": 3072.0, "minutes_count": None,
+         "units_count": 900.0, "validity_days": 30},
+        {"family": "حكاية", "name": "حكاية 100", "price_egp": 100.0, "data_mb": 10240.0, "minutes_count": None,
+         "units_count": 2000.0, "validity_days": 30},
+        {"family": "Emerald", "name": "Emerald 375", "price_egp": 375.0, "data_mb": 12288.0,
+         "minutes_count": 2500.0, "units_count": None, "validity_days": 30},
+    ])
+
+
+def test_filter_and_top_k(plans):
+    assert [p["name"] for p in plans.filter(data_mb=(10 * 1024, None))] == ["حكاية 100", "Emerald 375"]
+    assert [p["name"] for p in plans.filter("Hekaya", price_egp=(None, 50))] == ["حكاية 45"]
+    assert [p["name"] for p in plans.top_k("price_per_gb", 2)] == ["حكاية 100", "حكاية 45"]
+
+
+def test_unknown_columns_are_rejected(plans):
+    with pytest.raises(KeyError, match="price"):
+        plans.filter(price=(None, 100))
+    with pytest.raises(KeyError, match="speed"):
+        plans.top_k("speed", 3)
+    with pytest.raises(KeyError, match="gb"):
+        plans.top_k("price_egp", 3, gb=(10, None))
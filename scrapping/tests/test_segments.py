@@ -0,0 +1,119 @@
+"""Segments, tombstones and merges, and the packed BM25 format they store.
+
+Indexes are built in ``tmp_path`` with the hashing embedder and an
+embedding cache of their own, so nothing under ``knowledge/`` is touched.
+"""
+
+import itertools
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from knowledge import segments as segments_module
+from knowledge.bm25 import BM25Index
+from knowledge.chunker import Chunk
+from knowledge.embcache import CachedEmbedder
+from knowledge.embeddings import load_embedder
+from knowledge.packed import MappedBM25Index, pack_bm25
+from knowledge.segments import MERGE_FACTOR, SegmentedIndex
+
+
+def chunks(source, rows):
+    return [Chunk(source, f"https://example.com/{source}", f"/{i}", f"{source} باقة {i} كلمة{source}{i}", 4)
+            for i in rows]
+
+
+def live_texts(index):
+    segments, tombstones = index.state
+    return {segment.dense.doc(row)["text"]
+            for segment in segments for row in range(len(segment))
+            if row not in tombstones.get(segment.name, ())}
+
+
+@pytest.fixture
+def index(tmp_path):
+    embedder = CachedEmbedder(load_embedder("hash"), str(tmp_path / "embcache"))
+    return SegmentedIndex(str(tmp_path / "segments"), embedder, [], {}, 1)
+
+
+def test_deleted_rows_never_come_back_after_merges(index, tmp_path, monkeypatch):
+    sources = [f"s{n}" for n in range(MERGE_FACTOR)]
+    for source in sources:
+        index.update(chunks(source, range(5)))
+    assert index.update(chunks("s0", [0, 1])) == {"added": 0, "deleted": 3, "kept": 2}
+
+    assert index.merge_pending() >= 1
+    expected = {c.text for c in chunks("s0", [0, 1])} | {c.text for s in sources[1:] for c in chunks(s, range(5))}
+    assert live_texts(index) == expected
+    assert len(index) == len(expected)
+    assert not any("كلمةs02" in hit["text"] for hit in index.search("كلمةs02", k=10))
+
+    monkeypatch.setattr(segments_module, "CachedEmbedder",
+                        lambda embedder: CachedEmbedder(embedder, str(tmp_path / "embcache")))
+    reopened = SegmentedIndex.open(index.root)
+    assert live_texts(reopened) == expected
+    assert reopened.merge_pending() == 0
+
+
+def test_rows_deleted_during_a_merge_stay_deleted(index, monkeypatch):
+    sources = [f"s{n}" for n in range(MERGE_FACTOR)]
+    for source in sources:
+        index.update(chunks(source, range(5)))
+    build = segments_module.Segment.build
+
+    def build_while_deleting(root, name, rows, embedder):
+        # An update lands after the merge read its rows but before it swaps the new segment in
+        monkeypatch.setattr(segments_module.Segment, "build", build)
+        index.update(chunks("s1", [4]))
+        return build(root, name, rows, embedder)
+
+    monkeypatch.setattr(segments_module.Segment, "build", staticmethod(build_while_deleting))
+    merged = index.merge(index.pick_merge())
+
+    assert merged is not None
+    assert [s.name for s in index.state[0]] == [merged.name]
+    assert {c.text for c in chunks("s1", range(4))}.isdisjoint(live_texts(index))
+    assert chunks("s1", [4])[0].text in live_texts(index)
+    assert len(index) == 5 * (MERGE_FACTOR - 1) + 1
+
+
+CORPUS = [
+    "باقة سوبر سلفني 10 جنيه",
+    "سوبر سلفني رصيد طوارئ",
+    "باقة 200 جنيه شهرية",
+    "باقة 200 جنيه شهرية",  # an exact tie
+    "wifi calling مكالمات واي فاي",
+    "international calls zone 3 سعر الدقيقة",
+]
+# Every ordered triple of a few words: hundreds of rows sharing each score
+TIES = [" ".join(words) for words in itertools.product(["باقة", "جنيه", "200", "سلفني", "wifi"], repeat=3)] * 2
+
+
+def mapped(tmp_path, texts):
+    index = BM25Index()
+    for text in texts:
+        index.add(text)
+    pack_bm25(index, str(tmp_path / "lexical.pack"))
+    return index, MappedBM25Index(str(tmp_path / "lexical.pack"))
+
+
+@pytest.mark.parametrize("texts", [CORPUS, TIES, CORPUS[:1], []], ids=["corpus", "ties", "single", "empty"])
+def test_mapped_bm25_returns_the_same_hits(tmp_path, texts):
+    memory, packed = mapped(tmp_path, texts)
+    assert len(packed) == len(memory)
+    for query in ["سوبر سلفني", "باقة 200 جنيه", "wifi", "zone 3", "غير موجود", ""]:
+        for k in (1, 2, 10, 50):
+            expected = [(hit["id"], hit["score"]) for hit in memory.search(query, k)]
+            assert [(hit["id"], hit["score"]) for hit in packed.search(query, k)] == expected
+    for term in ["سلفني", "200", "غير"]:
+        assert packed.df(term) == memory.df(term)
+    packed.close()
+
+
+def test_mapped_bm25_breaks_ties_by_id(tmp_path):
+    _, packed = mapped(tmp_path, CORPUS)
+    assert [hit["id"] for hit in packed.search("200 جنيه شهرية", k=1)] == [2]
+    assert [hit["id"] for hit in packed.search("200", k=3)][:2] == [2, 3]
+    assert [hit["id"] for hit in packed.search("سلفني", k=5, exclude={0})] == [1]
+    packed.close()
@@ -0,0 +1,45 @@
+"""The prepaid data spec against the Python extractor it replaced.
+
+Both run through ``run_page`` on the same fixture bodies, so they see the
+same slimmed Document the pipeline gives them.
+"""
+
+import json
+import os
+
+import pytest
+
+from pipeline.registry import PAGES
+from pipeline.runner import run_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PYTHON_EXTRACTOR = "Suhaila/prepaid_data_packages_scraper.py:extract_prepaid_data_packages"
+
+
+def extract(extractor, body, path):
+    page = dict(PAGES["prepaid_data_packages"], extractor=extractor, output=str(path))
+    result = run_page("prepaid_data_packages", page, body=body)
+    assert result["ok"], result["error"]
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("fixture", ["prepaid_bundles.html", "prepaid_bundles_table.html"])
+def test_spec_matches_python_extractor(fixture, tmp_path):
+    with open(os.path.join(FIXTURES_DIR, fixture), "rb") as f:
+        body = f.read()
+    assert PAGES["prepaid_data_packages"]["extractor"].startswith("spec:")
+    spec = extract(PAGES["prepaid_data_packages"]["extractor"], body, tmp_path / "spec.json")
+    python = extract(PYTHON_EXTRACTOR, body, tmp_path / "python.json")
+    assert spec == python
+    assert spec["main_packages"]
+
+
+def test_empty_rows_are_kept(tmp_path):
+    with open(os.path.join(FIXTURES_DIR, "prepaid_bundles.html"), "rb") as f:
+        body = f.read()
+    data = extract(PAGES["prepaid_data_packages"]["extractor"], body, tmp_path / "spec.json")
+    assert data["package_features"][1] == {}
+    assert data["package_features"][2]["number"] == ""
+    # cards with extra classes do not match the Python extractor's class_="a b" either
+    assert [p.get("name") for p in data["main_packages"]] == ["ميجا 50", "", None]